@@ -0,0 +1,6 @@
+"""
+Frontend project tools: the project validator, environment setup, image
+optimizer and source map report, run through ``python -m pyutils <command>``.
+Submodules are deliberately not imported here so that each command loads
+only what it uses.
+"""
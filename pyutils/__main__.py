@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+pyutils Command Line
+
+Single entry point for the frontend project tools:
+
+    python -m pyutils <command> [options]
+
+Only the module behind the selected command is imported, and its own heavy
+dependencies load when they are first used, so short invocations such as a
+pre-commit hook running ``python -m pyutils check --format ndjson`` or any
+``--help`` start quickly. Check the startup cost with:
+
+    python -X importtime -m pyutils check --help
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+# command -> (module, summary)
+COMMANDS = {
+    'setup': ('setup_frontend_project', "Check the project and create the environment files"),
+    'check': ('check_frontend_project', "Validate dependencies, configuration, assets and build output"),
+    'env': ('setup_env_config', "Create the .env files and ENV_VARIABLES.md"),
+    'optimize-images': ('optimize_images', "Generate resized WebP/AVIF/JPEG variants of public/ images"),
+    'sourcemaps': ('sourcemap_report', "Attribute built chunk bytes to sources and packages"),
+    'cache-policy': ('cache_policy', "Check and generate the vercel.json Cache-Control headers"),
+    'serve': ('preview_server', "Serve dist/ with the vercel.json rewrites, headers and precompression"),
+    'loadtest': ('load_test', "Measure p50/p99 latency and throughput of the navigation routes"),
+    'compress': ('precompress', "Write gzip/brotli siblings of dist/ files, skipping unchanged ones"),
+    'verify': ('toolchain', "Run tsc -b, eslint . and vite build concurrently with timing and peak RSS"),
+    'tsc-profile': ('tsc_diagnostics', "Rank slow files and type instantiations from a tsc trace"),
+}
+
+def print_usage(file=sys.stdout) -> None:
+    """Print the list of commands."""
+    print("usage: python -m pyutils <command> [options]\n\ncommands:", file=file)
+    for name, (_module, summary) in COMMANDS.items():
+        print(f"  {name:<17} {summary}", file=file)
+    print("\nRun 'python -m pyutils <command> --help' for the options of a command.", file=file)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Dispatch to the selected command's main()."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"pyutils: unknown command '{command}'\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        sys.exit(2)
+    # argparse takes the usage line's program name from argv[0]
+    sys.argv[0] = f"python -m pyutils {command}"
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__ or 'pyutils')
+    module.main(rest)
+
+if __name__ == "__main__":
+    main()
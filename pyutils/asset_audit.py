@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Static Asset Audit
+
+Reads image headers (never the pixel data) to find the format, dimensions
+and encoding of every asset under public/ and src/assets, compares them
+against byte and pixel budgets and finds the source files that reference
+each asset. Headers are read and sources are scanned on a thread pool.
+"""
+
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import file_snapshot
+from .budgets import DEFAULT_MAX_BYTES, DEFAULT_MAX_PIXELS, DEFAULT_MAX_SVG_BYTES
+from .profiling import carry, span
+
+ASSET_DIRS = ('public', os.path.join('src', 'assets'))
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg', '.ico')
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.css', '.html')
+
+# How much of a file is read when looking for the image header
+HEADER_BYTES = 64 * 1024
+
+_ASSET_REFERENCE = re.compile(
+    r'''["'(`]\s*([^"'()`\s]+?\.(?:jpe?g|png|gif|webp|avif|svg|ico))(?:[?#][^"'()`\s]*)?\s*["')`]''',
+    re.IGNORECASE)
+
+class ImageInfo:
+    """Format, dimensions and encoding read from an image header."""
+
+    def __init__(self, image_format: str, width: Optional[int] = None,
+                 height: Optional[int] = None, encoding: Optional[str] = None) -> None:
+        self.format = image_format
+        self.width = width
+        self.height = height
+        self.encoding = encoding
+
+    @property
+    def pixels(self) -> Optional[int]:
+        if self.width is None or self.height is None:
+            return None
+        return self.width * self.height
+
+def _jpeg_info(file: Any) -> Optional[ImageInfo]:
+    """Walk JPEG markers up to the first start-of-frame segment."""
+    file.seek(2)
+    while True:
+        byte = file.read(1)
+        while byte and byte != b'\xff':
+            byte = file.read(1)
+        while byte == b'\xff':
+            byte = file.read(1)
+        if not byte:
+            return ImageInfo('jpeg')
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return ImageInfo('jpeg')
+        length = struct.unpack('>H', length_bytes)[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            data = file.read(5)
+            if len(data) < 5:
+                return ImageInfo('jpeg')
+            height, width = struct.unpack('>HH', data[1:5])
+            progressive = marker in (0xC2, 0xC6, 0xCA, 0xCE)
+            return ImageInfo('jpeg', width, height, 'progressive' if progressive else 'baseline')
+        file.seek(length - 2, os.SEEK_CUR)
+
+def _svg_info(head: bytes) -> ImageInfo:
+    """Pull width/height (or the viewBox) out of the root <svg> element."""
+    text = head.decode('utf-8', 'ignore')
+    match = re.search(r'<svg\b[^>]*>', text, re.DOTALL)
+    if not match:
+        return ImageInfo('svg', encoding='vector')
+    tag = match.group(0)
+
+    def number(attribute: str) -> Optional[int]:
+        found = re.search(rf'\s{attribute}\s*=\s*["\']\s*([\d.]+)(px)?\s*["\']', tag)
+        return int(float(found.group(1))) if found else None
+
+    width, height = number('width'), number('height')
+    view_box = re.search(r'viewBox\s*=\s*["\']\s*[-\d.]+[\s,]+[-\d.]+[\s,]+([\d.]+)[\s,]+([\d.]+)', tag)
+    if (width is None or height is None) and view_box:
+        width, height = int(float(view_box.group(1))), int(float(view_box.group(2)))
+    return ImageInfo('svg', width, height, 'vector')
+
+def read_image_info(path: str) -> Optional[ImageInfo]:
+    """Identify an image from its header bytes without decoding it."""
+    try:
+        with open(path, 'rb') as file:
+            head = file.read(32)
+            if head.startswith(b'\xff\xd8'):
+                return _jpeg_info(file)
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                width, height = struct.unpack('>II', head[16:24])
+                file.seek(28)
+                interlace = file.read(1)
+                return ImageInfo('png', width, height,
+                                 'interlaced' if interlace == b'\x01' else 'non-interlaced')
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                width, height = struct.unpack('<HH', head[6:10])
+                return ImageInfo('gif', width, height)
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                chunk = head[12:16]
+                if chunk == b'VP8X':
+                    width = 1 + int.from_bytes(head[24:27], 'little')
+                    height = 1 + int.from_bytes(head[27:30], 'little')
+                    return ImageInfo('webp', width, height, 'extended')
+                body = head + file.read(8)
+                if chunk == b'VP8 ':
+                    width, height = struct.unpack('<HH', body[26:30])
+                    return ImageInfo('webp', width & 0x3FFF, height & 0x3FFF, 'lossy')
+                if chunk == b'VP8L':
+                    bits = int.from_bytes(body[21:25], 'little')
+                    return ImageInfo('webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1,
+                                     'lossless')
+                return ImageInfo('webp')
+            if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+                return ImageInfo('avif')
+            if head[:4] == b'\x00\x00\x01\x00':
+                return ImageInfo('ico', head[6] or 256, head[7] or 256)
+            if path.lower().endswith('.svg'):
+                return _svg_info(head + file.read(HEADER_BYTES))
+    except OSError:
+        return None
+    return None
+
+def find_assets(project_dir: str) -> List[str]:
+    """Return project-relative paths of every image under the asset directories."""
+    assets = []
+    for asset_dir in ASSET_DIRS:
+        stack = [os.path.join(project_dir, asset_dir)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            assets.append(os.path.relpath(entry.path, project_dir))
+            except OSError:
+                continue
+    return sorted(assets)
+
+def find_sources(project_dir: str) -> List[str]:
+    """Return project-relative paths of source files that may reference assets."""
+    sources = ['index.html'] if file_snapshot.is_file(os.path.join(project_dir, 'index.html')) else []
+    stack = [os.path.join(project_dir, 'src')]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(SOURCE_EXTENSIONS):
+                        sources.append(os.path.relpath(entry.path, project_dir))
+        except OSError:
+            continue
+    return sorted(sources)
+
+def resolve_reference(source: str, reference: str) -> str:
+    """Map an asset reference in a source file to a project-relative path."""
+    reference = reference.replace('\\', '/')
+    if reference.startswith('@/'):
+        return os.path.normpath(os.path.join('src', reference[2:]))
+    if reference.startswith('/'):
+        return os.path.normpath(os.path.join('public', reference[1:]))
+    if reference.startswith('.'):
+        return os.path.normpath(os.path.join(os.path.dirname(source), reference))
+    return os.path.normpath(reference)
+
+def _scan_source(project_dir: str, source: str) -> List[Tuple[str, str]]:
+    """Return (reference, source) pairs for every asset-looking string in a file."""
+    try:
+        with span(f"read {source}", 'io'):
+            text = file_snapshot.read_text(os.path.join(project_dir, source), errors='ignore')
+    except OSError:
+        return []
+    with span(f"scan {source}", 'parse'):
+        return [(match.group(1), source) for match in _ASSET_REFERENCE.finditer(text)
+                if '://' not in match.group(1)]
+
+def _read_info(project_dir: str, asset: str) -> Optional[ImageInfo]:
+    with span(f"read header {asset}", 'io'):
+        return read_image_info(os.path.join(project_dir, asset))
+
+def find_references(project_dir: str, assets: List[str], sources: List[str],
+                    executor: ThreadPoolExecutor) -> Dict[str, List[str]]:
+    """Map each asset to the source files that reference it."""
+    references: Dict[str, List[str]] = {asset: [] for asset in assets}
+    by_name: Dict[str, List[str]] = {}
+    for asset in assets:
+        by_name.setdefault(os.path.basename(asset), []).append(asset)
+
+    for found in executor.map(carry(lambda source: _scan_source(project_dir, source)), sources):
+        for reference, source in found:
+            target = resolve_reference(source, reference)
+            if target in references:
+                matches = [target]
+            else:
+                # Bare names, e.g. strings assembled at runtime: fall back to the file name
+                matches = by_name.get(os.path.basename(target), [])
+            for asset in matches:
+                if source not in references[asset]:
+                    references[asset].append(source)
+    return references
+
+def audit_assets(project_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_svg_bytes: int = DEFAULT_MAX_SVG_BYTES,
+                 max_pixels: int = DEFAULT_MAX_PIXELS, jobs: int = 8) -> List[Dict[str, Any]]:
+    """Audit every asset and return one JSON-serializable record per asset."""
+    assets = find_assets(project_dir)
+    sources = find_sources(project_dir)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        infos = list(executor.map(carry(lambda asset: _read_info(project_dir, asset)), assets))
+        references = find_references(project_dir, assets, sources, executor)
+
+    records = []
+    for asset, info in zip(assets, infos):
+        stat = file_snapshot.stat(os.path.join(project_dir, asset))
+        size = stat.st_size if stat is not None else 0
+        budget = max_svg_bytes if info is not None and info.format == 'svg' else max_bytes
+        problems = []
+        if size > budget:
+            problems.append(f"{size - budget} bytes over the {budget} byte budget")
+        if info is not None and info.format != 'svg' and info.pixels and info.pixels > max_pixels:
+            problems.append(f"{info.width}x{info.height} exceeds the {max_pixels} pixel budget")
+        if info is not None and info.format == 'jpeg' and info.encoding == 'baseline' and size > 10 * 1024:
+            problems.append("baseline JPEG; progressive encoding renders sooner")
+        records.append({
+            'path': asset,
+            'bytes': size,
+            'format': info.format if info else None,
+            'width': info.width if info else None,
+            'height': info.height if info else None,
+            'encoding': info.encoding if info else None,
+            'references': sorted(references[asset]),
+            'problems': problems,
+        })
+    return records
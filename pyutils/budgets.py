@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Budget Defaults
+
+Default size budgets for the asset and build output checks. They live apart
+from the analyzers so the command line can offer them as option defaults
+without importing the analysis modules.
+"""
+
+# Per-asset budgets; SVGs are text and get a smaller byte budget
+DEFAULT_MAX_BYTES = 250 * 1024
+DEFAULT_MAX_SVG_BYTES = 50 * 1024
+DEFAULT_MAX_PIXELS = 2560 * 1440
+
+# Vite's own default for build.chunkSizeWarningLimit, in KB of minified output
+DEFAULT_CHUNK_BUDGET_KB = 500
+
+# Estimated time for Tailwind's JIT scanner to read every file its content globs match
+DEFAULT_CONTENT_SCAN_MS = 250
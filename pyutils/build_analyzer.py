@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Build Output Analyzer
+
+Measures the chunks Vite emitted into dist/assets: raw, gzip and brotli size
+per file (brotli only when the optional brotli package is installed), which
+chunks load on the initial page view according to the Vite manifest, and
+which node_modules packages ended up in each chunk. Package attribution uses
+a rollup-plugin-visualizer raw-data stats file when one exists and falls back
+to the "sources" list of each chunk's source map.
+"""
+
+import gzip
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from . import file_snapshot
+from .budgets import DEFAULT_CHUNK_BUDGET_KB
+from .js_config import lookup, parse_config
+from .profiling import carry, span
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_PATHS = (os.path.join('.vite', 'manifest.json'), 'manifest.json')
+STATS_PATHS = ('stats.json', os.path.join('dist', 'stats.json'))
+CHUNK_EXTENSIONS = ('.js', '.mjs', '.css')
+
+def package_from_path(module_path: str) -> Optional[str]:
+    """Return the package a bundled module path belongs to, if it is in node_modules."""
+    module_path = module_path.replace('\\', '/').split('?', 1)[0].lstrip('\0')
+    if 'node_modules/' not in module_path:
+        return None
+    rest = module_path.rsplit('node_modules/', 1)[1]
+    parts = rest.split('/')
+    if parts[0].startswith('@') and len(parts) > 1:
+        return f"{parts[0]}/{parts[1]}"
+    return parts[0]
+
+def compressed_sizes(path: str) -> Dict[str, Optional[int]]:
+    """Return raw, gzip (level 9) and brotli (quality 11) sizes of a file."""
+    with span(f"read {os.path.basename(path)}", 'io'):
+        with open(path, 'rb') as file:
+            data = file.read()
+    with span(f"compress {os.path.basename(path)}", 'compress'):
+        return {
+            'raw': len(data),
+            'gzip': len(gzip.compress(data, compresslevel=9, mtime=0)),
+            'brotli': len(brotli.compress(data, quality=11)) if brotli is not None else None,
+        }
+
+def load_vite_manifest(dist_dir: str) -> Dict[str, Any]:
+    """Load the Vite build manifest (build.manifest: true), if present."""
+    for rel in MANIFEST_PATHS:
+        try:
+            with open(os.path.join(dist_dir, rel), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            continue
+    return {}
+
+def initial_chunks(manifest: Dict[str, Any]) -> Set[str]:
+    """Files loaded on the first page view: entries and their static imports."""
+    files: Set[str] = set()
+    stack = [key for key, chunk in manifest.items() if chunk.get('isEntry')]
+    seen: Set[str] = set()
+    while stack:
+        key = stack.pop()
+        if key in seen or key not in manifest:
+            continue
+        seen.add(key)
+        chunk = manifest[key]
+        files.add(chunk['file'])
+        files.update(chunk.get('css', []))
+        stack.extend(chunk.get('imports', []))
+    return files
+
+def html_chunks(dist_dir: str) -> Set[str]:
+    """Files index.html loads directly: entry scripts, modulepreloads and stylesheets."""
+    try:
+        with open(os.path.join(dist_dir, 'index.html'), 'r', encoding='utf-8') as file:
+            content = file.read()
+    except OSError:
+        return set()
+    return set(re.findall(r'''(?:src|href)=["'][^"']*?(assets/[^"'?#]+)''', content))
+
+def packages_from_stats(project_dir: str) -> Optional[Dict[str, Dict[str, int]]]:
+    """
+    Read rollup-plugin-visualizer raw-data output (template: 'raw-data') and
+    return chunk file -> package -> rendered bytes.
+    """
+    for rel in STATS_PATHS:
+        try:
+            with open(os.path.join(project_dir, rel), 'r', encoding='utf-8') as file:
+                stats = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if 'nodeMetas' not in stats or 'nodeParts' not in stats:
+            continue
+        chunks: Dict[str, Dict[str, int]] = {}
+        for meta in stats['nodeMetas'].values():
+            package = package_from_path(meta.get('id', ''))
+            if package is None:
+                continue
+            for bundle_file, part_uid in meta.get('moduleParts', {}).items():
+                part = stats['nodeParts'].get(part_uid, {})
+                packages = chunks.setdefault(os.path.basename(bundle_file), {})
+                packages[package] = packages.get(package, 0) + part.get('renderedLength', 0)
+        return chunks
+    return None
+
+def packages_from_sourcemap(chunk_path: str) -> Optional[Dict[str, int]]:
+    """Return package -> number of bundled modules, from the chunk's source map."""
+    try:
+        with open(chunk_path + '.map', 'r', encoding='utf-8') as file:
+            source_map = json.load(file)
+    except (OSError, ValueError):
+        return None
+    packages: Dict[str, int] = {}
+    for source in source_map.get('sources', []):
+        package = package_from_path(source or '')
+        if package is not None:
+            packages[package] = packages.get(package, 0) + 1
+    return packages
+
+VITE_CONFIG_NAMES = ('vite.config.ts', 'vite.config.js', 'vite.config.mts', 'vite.config.mjs')
+
+def find_vite_config(project_dir: str) -> Optional[str]:
+    """Return the name of the project's Vite config file, if any."""
+    for name in VITE_CONFIG_NAMES:
+        if file_snapshot.is_file(os.path.join(project_dir, name)):
+            return name
+    return None
+
+def read_chunk_size_limit(project_dir: str) -> Optional[int]:
+    """Return build.chunkSizeWarningLimit from the Vite config, if set."""
+    name = find_vite_config(project_dir)
+    if name is None:
+        return None
+    try:
+        content = file_snapshot.read_text(os.path.join(project_dir, name))
+    except OSError:
+        return None
+    limit = lookup(parse_config(content).value, 'build', 'chunkSizeWarningLimit')
+    return int(limit) if isinstance(limit, (int, float)) and not isinstance(limit, bool) else None
+
+def analyze_build(project_dir: str, budget_kb: int = DEFAULT_CHUNK_BUDGET_KB,
+                  jobs: int = 8) -> Optional[Dict[str, Any]]:
+    """
+    Analyze dist/assets and return a JSON-serializable report, or None when
+    the project has not been built.
+    """
+    dist_dir = os.path.join(project_dir, 'dist')
+    assets_dir = os.path.join(dist_dir, 'assets')
+    if not os.path.isdir(assets_dir):
+        return None
+
+    names = sorted(name for name in os.listdir(assets_dir) if name.endswith(CHUNK_EXTENSIONS))
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        sizes = list(executor.map(
+            carry(lambda name: compressed_sizes(os.path.join(assets_dir, name))), names))
+
+    manifest = load_vite_manifest(dist_dir)
+    # The manifest follows static imports; without one, index.html lists the
+    # entry and the modulepreloads Vite injected for it
+    initial = {os.path.basename(path)
+               for path in (initial_chunks(manifest) if manifest else html_chunks(dist_dir))}
+    stats = packages_from_stats(project_dir)
+    sources = {chunk.get('file', '').split('/')[-1]: key for key, chunk in manifest.items()}
+
+    chunks = []
+    for name, size in zip(names, sizes):
+        if stats is not None:
+            packages = stats.get(name, {})
+            attribution = 'bytes'
+        else:
+            packages = packages_from_sourcemap(os.path.join(assets_dir, name)) or {}
+            attribution = 'modules'
+        chunks.append({
+            'file': name,
+            'source': sources.get(name),
+            'initial': name in initial,
+            'sizes': size,
+            'over_budget': size['raw'] > budget_kb * 1024,
+            'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+            'attribution': attribution,
+        })
+
+    return {
+        'budget_kb': budget_kb,
+        'chunk_size_warning_limit': read_chunk_size_limit(project_dir),
+        'config_file': find_vite_config(project_dir),
+        'has_manifest': bool(manifest),
+        'has_stats': stats is not None,
+        'brotli': brotli is not None,
+        'chunks': chunks,
+    }
+
+def misplaced_packages(report: Dict[str, Any],
+                       route_packages: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Return, per initial chunk, the packages that only lazy routes import.
+    These load on every page view, typically because a manualChunks rule
+    grouped them with the framework into a shared vendor chunk.
+    """
+    route_only = set(route_packages)
+    misplaced: Dict[str, List[str]] = {}
+    for chunk in report['chunks']:
+        if chunk['initial']:
+            found = sorted(package for package in chunk['packages'] if package in route_only)
+            if found:
+                misplaced[chunk['file']] = found
+    return misplaced
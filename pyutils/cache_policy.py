@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Hosting Cache Policy
+
+Reads the Cache-Control rules in vercel.json together with the built dist/
+tree and works out the policy every deployed file is actually served with.
+Files are classified as content-hashed (safe to cache forever), HTML (must be
+revalidated so new deploys show up) or mutable assets (public/ files whose
+URL does not change when their content does), and each file's effective
+browser and CDN lifetimes are compared with the target for its class. Bytes
+served with a shorter lifetime than their class allows are reported as
+cache-miss exposure, and an optimized ``headers`` block can be printed or
+written back to vercel.json.
+
+Vercel matches ``source`` patterns with path-to-regexp syntax and, when
+several rules set the same header, the last matching rule wins; both are
+modelled here.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from . import file_snapshot
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+
+HOSTING_CONFIG = 'vercel.json'
+
+# Target Cache-Control per class of file
+IMMUTABLE_POLICY = 'public, max-age=31536000, immutable'
+HTML_POLICY = 'public, max-age=0, must-revalidate'
+MUTABLE_POLICY = 'public, max-age=3600, stale-while-revalidate=86400'
+
+# Browser lifetimes (seconds) below which a file counts as exposed to cache misses
+TARGET_TTL = {'hashed': 31536000, 'html': 0, 'mutable': 3600}
+
+# Vite's build.assetsDir and its [name]-[hash].[ext] file names (8+ base64url characters)
+ASSETS_DIR = 'assets'
+_HASHED_NAME = re.compile(r'[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+_PARAM = re.compile(r':([A-Za-z_]\w*)(\([^)]*\))?([*+?])?')
+
+def source_to_regex(source: str) -> 're.Pattern[str]':
+    """
+    Translate a Vercel path-to-regexp ``source`` such as '/assets/(.*)' or
+    '/:path*'. Parameters become named groups and raw groups stay capturing.
+    """
+    out = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if char == '(':
+            # Raw regex group: copy up to the balancing parenthesis
+            depth = 0
+            end = index
+            while end < len(source):
+                if source[end] == '\\':
+                    end += 2
+                    continue
+                if source[end] == '(':
+                    depth += 1
+                elif source[end] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end += 1
+            # Kept capturing so destinations can refer to it as $1, $2, ...
+            out.append(source[index:end + 1])
+            index = end + 1
+            if index < len(source) and source[index] in '*+?':
+                out.append(source[index])
+                index += 1
+            continue
+        if char == ':':
+            match = _PARAM.match(source, index)
+            if match:
+                body = match.group(2)[1:-1] if match.group(2) else '[^/]+'
+                modifier = match.group(3)
+                if modifier in ('*', '+'):
+                    body = f'{body}(?:/{body})*'
+                group = f'(?P<{match.group(1)}>{body})'
+                # A parameter made optional also swallows its leading slash
+                if modifier in ('*', '?') and out and out[-1] == '/':
+                    out[-1] = f'(?:/{group})?'
+                else:
+                    out.append(group + ('?' if modifier in ('*', '?') else ''))
+                index = match.end()
+                continue
+        if char == '\\' and index + 1 < len(source):
+            out.append(re.escape(source[index + 1]))
+            index += 2
+            continue
+        out.append('/' if char == '/' else re.escape(char))
+        index += 1
+    # Like path-to-regexp's non-strict mode, a trailing slash is optional
+    return re.compile('^' + ''.join(out).rstrip('/') + '/?$')
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Split a Cache-Control value into lower-case directives."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+def _seconds(directives: Dict[str, Optional[str]], name: str) -> Optional[int]:
+    try:
+        return int(directives[name]) if directives.get(name) is not None else None
+    except ValueError:
+        return None
+
+def format_duration(seconds: int) -> str:
+    """Format a lifetime in seconds for display (90 -> '90s', 31536000 -> '365d')."""
+    for unit, size in (('d', 86400), ('h', 3600), ('min', 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+def lifetimes(value: Optional[str]) -> Tuple[int, int]:
+    """
+    Return the (browser, CDN) freshness lifetimes in seconds of a
+    Cache-Control value. Without max-age browsers revalidate every time;
+    Vercel's own CDN honours s-maxage before max-age.
+    """
+    directives = parse_cache_control(value)
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0, 0
+    browser = _seconds(directives, 'max-age') or 0
+    cdn = _seconds(directives, 's-maxage')
+    return browser, browser if cdn is None else cdn
+
+def load_hosting_config(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Return the parsed vercel.json, or None if the project has none; raises ValueError."""
+    try:
+        config = json.loads(file_snapshot.read_text(os.path.join(project_dir, HOSTING_CONFIG)))
+    except OSError:
+        return None
+    return config if isinstance(config, dict) else {}
+
+def header_rules(config: Dict[str, Any]) -> List[Tuple[str, 're.Pattern[str]', Optional[str]]]:
+    """Return (source, regex, Cache-Control value) for every headers rule."""
+    rules = []
+    for rule in config.get('headers', []):
+        if not isinstance(rule, dict) or not isinstance(rule.get('source'), str):
+            continue
+        value = None
+        for header in rule.get('headers', []):
+            if isinstance(header, dict) and str(header.get('key', '')).lower() == 'cache-control':
+                value = header.get('value')
+        try:
+            regex = source_to_regex(rule['source'])
+        except re.error:
+            continue
+        rules.append((rule['source'], regex, value))
+    return rules
+
+def fallback_rewrite(config: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the source of a rewrite that serves an HTML page for missing files
+    under /assets/. A chunk deleted by a new deploy is then answered with
+    index.html under the assets' immutable policy, and cached that way.
+    """
+    probe = f'/{ASSETS_DIR}/index-0000000a.js'
+    for rewrite in config.get('rewrites', []):
+        if not isinstance(rewrite, dict) or not isinstance(rewrite.get('source'), str):
+            continue
+        if not str(rewrite.get('destination', '')).endswith('.html'):
+            continue
+        try:
+            if source_to_regex(rewrite['source']).match(probe):
+                return rewrite['source']
+        except re.error:
+            continue
+    return None
+
+def hashed_files(dist_dir: str) -> Optional[Set[str]]:
+    """Return the dist-relative files listed in Vite's manifest, when build.manifest is on."""
+    for name in (os.path.join('.vite', 'manifest.json'), 'manifest.json'):
+        try:
+            manifest = json.loads(file_snapshot.read_text(os.path.join(dist_dir, name)))
+        except (OSError, ValueError):
+            continue
+        files = set()
+        for entry in manifest.values() if isinstance(manifest, dict) else []:
+            if not isinstance(entry, dict):
+                continue
+            if isinstance(entry.get('file'), str):
+                files.add(entry['file'])
+            for key in ('css', 'assets'):
+                files.update(item for item in entry.get(key, []) if isinstance(item, str))
+        return files
+    return None
+
+def classify(rel: str, manifest_files: Optional[Set[str]]) -> str:
+    """Classify a dist-relative path as 'html', 'hashed' or 'mutable'."""
+    if rel.endswith(('.html', '.htm')):
+        return 'html'
+    if manifest_files is not None and rel in manifest_files:
+        return 'hashed'
+    if rel.startswith(ASSETS_DIR + '/') and _HASHED_NAME.search(rel):
+        return 'hashed'
+    return 'mutable'
+
+def list_dist(dist_dir: str) -> List[Tuple[str, int]]:
+    """Return (dist-relative path, size) for every deployed file, skipping precompressed siblings."""
+    files = []
+    for current, subdirs, names in os.walk(dist_dir):
+        subdirs[:] = sorted(name for name in subdirs if name != '.vite')
+        for name in sorted(names):
+            if name.endswith(('.gz', '.br', '.map')):
+                continue
+            path = os.path.join(current, name)
+            rel = os.path.relpath(path, dist_dir).replace(os.sep, '/')
+            try:
+                files.append((rel, os.path.getsize(path)))
+            except OSError:
+                continue
+    return files
+
+def analyze_cache_policy(project_dir: str, dist: str = 'dist') -> Optional[Dict[str, Any]]:
+    """
+    Return a JSON-serializable report of the policy each dist/ file is served
+    with, or None when the project has not been built.
+    """
+    dist_dir = os.path.join(project_dir, dist)
+    if not os.path.isdir(dist_dir):
+        return None
+    config = load_hosting_config(project_dir)
+    rules = header_rules(config) if config is not None else []
+    manifest_files = hashed_files(dist_dir)
+
+    files = []
+    classes: Dict[str, Dict[str, int]] = {}
+    for rel, size in list_dist(dist_dir):
+        kind = classify(rel, manifest_files)
+        url = '/' + rel
+        value = None
+        rule_source = None
+        for source, regex, rule_value in rules:
+            if rule_value is not None and regex.match(url):
+                # The last matching rule that sets Cache-Control wins
+                value, rule_source = rule_value, source
+        browser, cdn = lifetimes(value)
+        target = TARGET_TTL[kind]
+        problems = []
+        if kind == 'html':
+            if browser > 0:
+                problems.append(f"browsers keep stale HTML for {format_duration(browser)} "
+                                "after a deploy")
+        elif browser < target:
+            problems.append(f"browser lifetime {format_duration(browser)} (CDN "
+                            f"{format_duration(cdn)}) is below the {format_duration(target)} "
+                            "this file allows")
+        if kind == 'hashed' and browser >= target and 'immutable' not in parse_cache_control(value):
+            problems.append("missing 'immutable', so reloads still revalidate it")
+        exposed = kind != 'html' and browser < target
+        files.append({
+            'path': rel,
+            'bytes': size,
+            'class': kind,
+            'cache_control': value,
+            'rule': rule_source,
+            'browser_ttl': browser,
+            'cdn_ttl': cdn,
+            'exposed': exposed,
+            'problems': problems,
+        })
+        totals = classes.setdefault(kind, {'files': 0, 'bytes': 0, 'exposed_bytes': 0})
+        totals['files'] += 1
+        totals['bytes'] += size
+        if exposed:
+            totals['exposed_bytes'] += size
+
+    total_bytes = sum(record['bytes'] for record in files)
+    exposed_bytes = sum(record['bytes'] for record in files if record['exposed'])
+    return {
+        'config': HOSTING_CONFIG if config is not None else None,
+        'fallback_rewrite': fallback_rewrite(config) if config is not None else None,
+        'manifest': manifest_files is not None,
+        'files': files,
+        'classes': classes,
+        'bytes': total_bytes,
+        'exposed_bytes': exposed_bytes,
+        'exposure': exposed_bytes / total_bytes if total_bytes else 0.0,
+    }
+
+def optimized_headers(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build a vercel.json ``headers`` block giving every class its target
+    policy. Rules are ordered general to specific because the last match wins.
+    """
+    def rule(source: str, value: str) -> Dict[str, Any]:
+        return {'source': source, 'headers': [{'key': 'Cache-Control', 'value': value}]}
+
+    rules = [rule('/(.*)', HTML_POLICY)]
+    extensions = sorted({os.path.splitext(record['path'])[1][1:].lower() for record in report['files']
+                         if record['class'] == 'mutable' and os.path.splitext(record['path'])[1]})
+    if extensions:
+        rules.append(rule(f"/(.*)\\.({'|'.join(extensions)})", MUTABLE_POLICY))
+    hashed_dirs = sorted({record['path'].split('/')[0] for record in report['files']
+                          if record['class'] == 'hashed' and '/' in record['path']})
+    mixed = {record['path'].split('/')[0] for record in report['files']
+             if record['class'] != 'hashed' and '/' in record['path']}
+    for directory in hashed_dirs:
+        if directory in mixed:
+            # Unhashed files share the directory; list the hashed ones individually
+            for record in report['files']:
+                if record['class'] == 'hashed' and record['path'].startswith(directory + '/'):
+                    rules.append(rule('/' + re.sub(r'([.()])', r'\\\1', record['path']),
+                                      IMMUTABLE_POLICY))
+        else:
+            rules.append(rule(f'/{directory}/(.*)', IMMUTABLE_POLICY))
+    return rules
+
+def write_headers(project_dir: str, headers: List[Dict[str, Any]]) -> str:
+    """
+    Install the optimized Cache-Control rules in vercel.json. Existing rules
+    keep their other headers; only their Cache-Control entries are dropped.
+    """
+    path = os.path.join(project_dir, HOSTING_CONFIG)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+    except FileNotFoundError:
+        config = {'version': 2}
+    kept = []
+    for rule in config.get('headers', []):
+        others = [header for header in rule.get('headers', [])
+                  if str(header.get('key', '')).lower() != 'cache-control']
+        if others:
+            kept.append(dict(rule, headers=others))
+    config['headers'] = kept + headers
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(config, file, indent=2)
+        file.write('\n')
+    return path
+
+def print_report(report: Dict[str, Any], verbose: bool = False) -> None:
+    """Print the per-class summary and the files served with a weaker policy than they allow."""
+    if report['config'] is None:
+        print_warning(f"No {HOSTING_CONFIG}; files are served with the host's default caching",
+                      file=HOSTING_CONFIG)
+    labels = {'hashed': "content-hashed", 'html': "HTML", 'mutable': "mutable assets"}
+    for kind in ('hashed', 'html', 'mutable'):
+        totals = report['classes'].get(kind)
+        if not totals:
+            continue
+        print_info(f"{labels[kind]}: {totals['files']} files, {format_size(totals['bytes'])}"
+                   + (f", {format_size(totals['exposed_bytes'])} exposed" if totals['exposed_bytes'] else ""))
+
+    flagged = [record for record in report['files'] if record['problems']]
+    shown = flagged if verbose else sorted(flagged, key=lambda record: record['bytes'], reverse=True)[:10]
+    for record in shown:
+        policy = record['cache_control'] or "no Cache-Control"
+        print_warning(f"{record['path']} ({format_size(record['bytes'])}, {record['class']}): {policy}",
+                      file=HOSTING_CONFIG)
+        for problem in record['problems']:
+            print(f"    - {problem}")
+    if len(shown) < len(flagged):
+        print(f"    ... and {len(flagged) - len(shown)} more")
+
+    share = report['exposure'] * 100
+    summary = (f"Cache-miss exposure: {format_size(report['exposed_bytes'])} of "
+               f"{format_size(report['bytes'])} ({share:.0f}%) is served with a shorter "
+               "lifetime than its class allows")
+    if report['exposed_bytes']:
+        print_warning(summary, file=HOSTING_CONFIG)
+    elif not flagged:
+        print_success("Every file in dist/ is served with the cache policy its class allows",
+                      file=HOSTING_CONFIG)
+
+    if report['fallback_rewrite']:
+        print_warning(f"The rewrite '{report['fallback_rewrite']}' also answers missing /{ASSETS_DIR}/ "
+                      "files with HTML; exclude them, e.g. \"source\": \"/((?!assets/).*)\"",
+                      file=HOSTING_CONFIG)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Check the Cache-Control policy vercel.json gives the files in dist/.")
+    parser.add_argument('--dist', default='dist',
+                        help="Build output directory, relative to the project (default: %(default)s)")
+    parser.add_argument('--emit', action='store_true',
+                        help="Print an optimized vercel.json headers block")
+    parser.add_argument('--write', action='store_true',
+                        help=f"Replace the headers block in {HOSTING_CONFIG} with the optimized one")
+    parser.add_argument('--all', action='store_true',
+                        help="List every flagged file instead of the ten largest")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+
+    print_header("Hosting Cache Policy")
+
+    project_dir = os.getcwd()
+    try:
+        report = analyze_cache_policy(project_dir, args.dist)
+    except ValueError as e:
+        print_error(f"Invalid JSON in {HOSTING_CONFIG}: {e}", file=HOSTING_CONFIG)
+        sys.exit(1)
+    if report is None:
+        print_error(f"No {args.dist}/ found; run 'npm run build' first")
+        sys.exit(1)
+    print_report(report, verbose=args.all)
+
+    headers = optimized_headers(report)
+    if args.emit:
+        print(json.dumps({'headers': headers}, indent=2))
+    if args.write:
+        path = write_headers(project_dir, headers)
+        print_success(f"Wrote the optimized headers block to {os.path.relpath(path)}")
+
+if __name__ == "__main__":
+    main()
@@ -7,67 +7,67 @@ and configuration files. It analyzes the package.json, verifies configuration fi
 and provides recommendations for any missing components.
 """
 
+import argparse
+import contextlib
+import io
 import json
 import os
 import sys
-from typing import Dict, List, Set, Tuple, Any, Optional
-import re
-
-# ANSI color codes for terminal output
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
-
-def print_header(message: str) -> None:
-    """Print a formatted header message."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(80)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}\n")
-
-def print_success(message: str) -> None:
-    """Print a success message."""
-    print(f"{Colors.GREEN}✓ {message}{Colors.ENDC}")
-
-def print_warning(message: str) -> None:
-    """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠ {message}{Colors.ENDC}")
-
-def print_error(message: str) -> None:
-    """Print an error message."""
-    print(f"{Colors.RED}✗ {message}{Colors.ENDC}")
-
-def print_info(message: str) -> None:
-    """Print an info message."""
-    print(f"{Colors.BLUE}ℹ {message}{Colors.ENDC}")
+import time
+from typing import Dict, Iterator, List, Set, Tuple, Any, Optional
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+# Only what every run needs is imported here; the heavier analyzers behind the
+# checks (and the process pool, cache, watcher and pstats) are imported by the
+# functions that use them, which keeps CLI startup and --help fast
+from . import file_snapshot, findings
+from .budgets import (DEFAULT_CHUNK_BUDGET_KB, DEFAULT_CONTENT_SCAN_MS, DEFAULT_MAX_BYTES,
+                      DEFAULT_MAX_PIXELS, DEFAULT_MAX_SVG_BYTES)
+from .check_scheduler import Check, ScheduleResult, default_jobs, run_checks, select_affected
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+from .lockfile_index import LOCKFILE_NAMES, iter_declared, load_lockfile_index, satisfies
+from .profiling import PROFILE_DIR, Profiler, profiling, span
+
+# Directories never descended into when looking for projects in --scan mode
+SCAN_SKIP_DIRS = {'node_modules', '.git', '.cache', 'dist', 'build', '.venv', 'venv'}
+
+# Bump when a check's logic changes in a way the source hash would not catch
+VALIDATOR_VERSION = '1'
+
+# Config file groups that may be missing (legacy .eslintrc files)
+OPTIONAL_CONFIGS = {'eslintrc'}
+
+# tsconfig targets accepted as modern (tsc compares them case-insensitively)
+MODERN_TS_TARGETS = ('ES2020', 'ES2021', 'ES2022', 'ES2023', 'ES2024', 'ESNEXT')
 
 def load_json_file(file_path: str) -> Optional[Dict]:
     """Load and parse a JSON file."""
     try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
+        with span(f"read {os.path.basename(file_path)}", 'io'):
+            text = file_snapshot.read_text(file_path)
+        with span(f"parse {os.path.basename(file_path)}", 'parse'):
+            return json.loads(text)
     except FileNotFoundError:
-        print_error(f"File not found: {file_path}")
+        print_error(f"File not found: {file_path}", file=os.path.relpath(file_path))
         return None
     except json.JSONDecodeError:
-        print_error(f"Invalid JSON in file: {file_path}")
+        print_error(f"Invalid JSON in file: {file_path}", file=os.path.relpath(file_path))
         return None
     except Exception as e:
-        print_error(f"Error reading {file_path}: {str(e)}")
+        print_error(f"Error reading {file_path}: {str(e)}", file=os.path.relpath(file_path))
         return None
 
 def check_file_exists(file_path: str) -> bool:
     """Check if a file exists."""
-    exists = os.path.isfile(file_path)
+    exists = file_snapshot.is_file(file_path)
     if exists:
-        print_success(f"Found {file_path}")
+        print_success(f"Found {file_path}", file=os.path.relpath(file_path))
     else:
-        print_error(f"Missing {file_path}")
+        print_error(f"Missing {file_path}", file=os.path.relpath(file_path))
     return exists
 
 def check_package_json(project_dir: str) -> Tuple[bool, Optional[Dict]]:
@@ -82,8 +82,12 @@ def check_package_json(project_dir: str) -> Tuple[bool, Optional[Dict]]:
     
     return True, package_data
 
-def check_required_dependencies(package_data: Dict) -> List[str]:
-    """Check if all required dependencies are present in package.json."""
+def check_required_dependencies(package_data: Dict, project_dir: Optional[str] = None,
+                                use_cache: bool = True) -> List[str]:
+    """
+    Check if all required dependencies are present in package.json and,
+    when a project directory is given, whether declared packages are used.
+    """
     dependencies = set(package_data.get('dependencies', {}).keys())
     dev_dependencies = set(package_data.get('devDependencies', {}).keys())
     all_dependencies = dependencies.union(dev_dependencies)
@@ -142,9 +146,9 @@ def check_required_dependencies(package_data: Dict) -> List[str]:
     
     for dep, description in all_required_deps.items():
         if dep in all_dependencies:
-            print_success(f"Found {dep} ({description})")
+            print_success(f"Found {dep} ({description})", file='package.json')
         else:
-            print_error(f"Missing {dep} ({description})")
+            print_error(f"Missing {dep} ({description})", file='package.json')
             missing_deps.append(dep)
     
     # Check for recommended testing dependencies
@@ -153,9 +157,9 @@ def check_required_dependencies(package_data: Dict) -> List[str]:
     missing_testing_deps = []
     for dep, description in testing_deps.items():
         if dep in all_dependencies:
-            print_success(f"Found {dep} ({description})")
+            print_success(f"Found {dep} ({description})", file='package.json')
         else:
-            print_warning(f"Recommended: {dep} ({description})")
+            print_warning(f"Recommended: {dep} ({description})", file='package.json')
             missing_testing_deps.append(dep)
     
     if missing_testing_deps:
@@ -166,13 +170,127 @@ def check_required_dependencies(package_data: Dict) -> List[str]:
     
     for dep, description in type_deps.items():
         if dep in all_dependencies:
-            print_success(f"Found {dep} ({description})")
+            print_success(f"Found {dep} ({description})", file='package.json')
         else:
-            print_warning(f"Recommended: {dep} ({description})")
+            print_warning(f"Recommended: {dep} ({description})", file='package.json')
             missing_deps.append(dep)
     
+    if project_dir is not None:
+        check_dependency_usage(project_dir, package_data, use_cache)
+    
     return missing_deps
 
+def check_dependency_usage(project_dir: str, package_data: Dict, use_cache: bool = True) -> Dict[str, Any]:
+    """Compare the packages imported from src/ with those declared in package.json."""
+    from .dependency_usage import analyze_usage
+    from .import_graph import shared_import_graph
+    
+    print_header("Checking Dependency Usage")
+    
+    graph = shared_import_graph(project_dir, use_cache=use_cache, jobs=default_jobs())
+    usage = analyze_usage(project_dir, package_data, graph)
+    print_info(f"{len(usage['index'])} packages imported from {len(graph.files)} source files")
+    
+    if usage['unused']:
+        for name in usage['unused']:
+            print_warning(f"Declared but never imported: {name} ({usage['groups'][name]})",
+                          file='package.json')
+        print_info("If these are truly unused, remove them with:")
+        print(f"\n    npm uninstall {' '.join(usage['unused'])}\n")
+    else:
+        print_success("Every declared dependency is used")
+    
+    if usage['undeclared']:
+        for name, files in usage['undeclared'].items():
+            more = f" and {len(files) - 1} more" if len(files) > 1 else ""
+            print_error(f"Imported but not declared: {name} (in {files[0]}{more})", file=files[0])
+        print_info("Declare them so installs are reproducible:")
+        print(f"\n    npm install {' '.join(usage['undeclared'])}\n")
+    else:
+        print_success("Every imported package is declared in package.json")
+    
+    return usage
+
+def check_resolved_versions(project_dir: str, package_data: Dict) -> List[str]:
+    """Check the versions resolved in the lockfile against the declared ranges."""
+    essential_deps = ['react', 'react-dom', 'vite', 'typescript', 'tailwindcss']
+    
+    print_header("Checking Resolved Dependency Versions")
+    
+    try:
+        index = load_lockfile_index(project_dir)
+    except (OSError, ValueError) as e:
+        print_error(f"Error reading lockfile: {str(e)}")
+        return []
+    if index is None:
+        print_warning("No lockfile found (package-lock.json or pnpm-lock.yaml); run npm install to create one")
+        return []
+    
+    print_info(f"Indexed {len(index)} packages from {os.path.basename(index.path)}")
+    
+    mismatched = []
+    for dep, declared in iter_declared(package_data, essential_deps):
+        resolved = index.resolved(dep)
+        if resolved is None:
+            print_error(f"{dep} is declared ({declared}) but not resolved in the lockfile",
+                        file='package.json')
+            mismatched.append(dep)
+            continue
+        
+        matches = satisfies(resolved, declared)
+        if matches is None:
+            print_info(f"{dep} resolves to {resolved} (range {declared} not checked)")
+        elif matches:
+            print_success(f"{dep} resolves to {resolved} (satisfies {declared})",
+                          file='package.json')
+        else:
+            print_error(f"{dep} resolves to {resolved}, which does not satisfy {declared}",
+                        file='package.json')
+            mismatched.append(dep)
+        
+        other_versions = index.versions_of(dep) - {resolved}
+        if other_versions:
+            print_warning(f"{dep} is also installed as {', '.join(sorted(other_versions))}",
+                          file='package.json')
+    
+    if mismatched:
+        print_info("Run npm install to bring the lockfile back in line with package.json")
+    
+    return mismatched
+
+def check_dependency_weight(project_dir: str, package_data: Dict) -> Dict[str, Any]:
+    """Report the installed size of each dependency and any duplicated packages."""
+    from .node_modules_report import build_report
+    
+    direct_deps = sorted(set(package_data.get('dependencies', {}) or {})
+                         | set(package_data.get('devDependencies', {}) or {}))
+    
+    print_header("Dependency Weight Report")
+    
+    report = build_report(project_dir, direct_deps, jobs=default_jobs())
+    if report is None:
+        print_warning("node_modules not found; run npm install to measure dependency weight")
+        return {}
+    
+    print_info(f"{report['package_count']} installed packages, "
+               f"{format_size(report['total_size'])} on disk")
+    
+    weights = sorted(report['weights'].items(), key=lambda item: item[1]['size'], reverse=True)
+    for name, weight in weights[:15]:
+        print_info(f"{name:<36} {format_size(weight['size']):>10} "
+                   f"({weight['packages']} packages, {format_size(weight['own_size'])} own)")
+    if len(weights) > 15:
+        print_info(f"... and {len(weights) - 15} smaller dependencies")
+    
+    if report['duplicates']:
+        for name, versions in sorted(report['duplicates'].items()):
+            print_warning(f"{name} is installed in {len(versions)} versions: {', '.join(versions)}")
+        print_info("Run npm dedupe, or align version ranges, to remove duplicated packages")
+    else:
+        print_success("No package is installed in more than one version")
+    
+    return report
+
 def check_config_files(project_dir: str) -> Dict[str, bool]:
     """Check if all required configuration files exist."""
     config_files = {
@@ -192,10 +310,10 @@ def check_config_files(project_dir: str) -> Dict[str, bool]:
     results = {}
     for file_name, description in config_files.items():
         file_path = os.path.join(project_dir, file_name)
-        exists = os.path.isfile(file_path)
+        exists = file_snapshot.is_file(file_path)
         
         # Group similar config files (e.g., different ESLint config formats)
-        base_name = file_name.split('.')[0]
+        base_name = file_name.lstrip('.').split('.')[0]
         if base_name in ['vite', 'eslintrc', 'eslint']:
             if base_name not in results:
                 results[base_name] = False
@@ -203,16 +321,20 @@ def check_config_files(project_dir: str) -> Dict[str, bool]:
             results[base_name] = results[base_name] or exists
             
             if exists:
-                print_success(f"Found {file_name} ({description})")
+                print_success(f"Found {file_name} ({description})", file=file_name)
         else:
             results[file_name] = exists
             if exists:
-                print_success(f"Found {file_name} ({description})")
+                print_success(f"Found {file_name} ({description})", file=file_name)
             else:
-                print_error(f"Missing {file_name} ({description})")
+                print_error(f"Missing {file_name} ({description})", file=file_name)
     
     return results
 
+def find_missing_configs(config_results: Dict[str, bool]) -> List[str]:
+    """Return the required config files (or groups) check_config_files did not find."""
+    return [key for key, found in config_results.items() if not found and key not in OPTIONAL_CONFIGS]
+
 def check_project_structure(project_dir: str) -> None:
     """Check if the project follows standard React/TypeScript structure."""
     expected_dirs = {
@@ -231,109 +353,370 @@ def check_project_structure(project_dir: str) -> None:
         else:
             print_warning(f"Missing {dir_name}/ directory ({description})")
 
+def check_static_assets(project_dir: str, budgets: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Check the weight and dimensions of static assets against the budgets."""
+    from .asset_audit import audit_assets
+    
+    print_header("Checking Static Asset Budgets")
+    
+    records = audit_assets(project_dir, max_bytes=budgets['max_bytes'],
+                           max_svg_bytes=budgets['max_svg_bytes'],
+                           max_pixels=budgets['max_pixels'], jobs=default_jobs())
+    if not records:
+        print_info("No images found in public/ or src/assets/")
+        return records
+    
+    print_info(f"{len(records)} assets, {format_size(sum(r['bytes'] for r in records))} in total")
+    
+    for record in records:
+        dimensions = f"{record['width']}x{record['height']}" if record['width'] else "unknown size"
+        details = f"{record['format'] or 'unknown format'}, {dimensions}"
+        if record['encoding']:
+            details += f", {record['encoding']}"
+        summary = f"{record['path']} ({format_size(record['bytes'])}, {details})"
+        
+        if record['problems']:
+            print_warning(summary, file=record['path'])
+            for problem in record['problems']:
+                print(f"    - {problem}")
+        else:
+            print_success(summary, file=record['path'])
+        
+        if record['references']:
+            print(f"    referenced by: {', '.join(record['references'])}")
+        else:
+            print("    not referenced from src/ or index.html")
+    
+    if any(record['problems'] for record in records):
+        print_info("Resize oversized images and serve WebP/AVIF variants with srcset")
+    
+    return records
+
+def analyze_route_chunks(project_dir: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """Report the modules and heavy libraries each lazy route chunk pulls in."""
+    from .import_graph import find_lazy_routes, route_report, shared_import_graph
+    
+    print_header("Analyzing Route Chunks")
+    
+    graph = shared_import_graph(project_dir, use_cache=use_cache, jobs=default_jobs())
+    if not graph.files:
+        print_warning("No source files found in src/")
+        return []
+    print_info(f"Indexed {len(graph.files)} modules ({graph.reparsed} re-parsed)")
+    
+    routes = find_lazy_routes(project_dir, graph)
+    if not routes:
+        print_info("No lazy(() => import(...)) routes found in src/App.tsx")
+    
+    report = route_report(graph, routes)
+    for chunk in report:
+        label = "Entry chunk" if chunk['route'] == 'entry' else f"Route {chunk['route']}"
+        summary = (f"{label} ({chunk['module']}): {chunk['modules']} modules, "
+                   f"{format_size(chunk['source_bytes'])} of source")
+        if chunk['heavy']:
+            print_warning(f"{summary}, pulls in {', '.join(chunk['heavy'])}", file=chunk['module'])
+        else:
+            print_success(summary, file=chunk['module'])
+    
+    if report and report[0]['heavy']:
+        print_info("Heavy libraries in the entry chunk load on every page; "
+                   "consider moving them behind lazy routes")
+    
+    return report
+
+def analyze_build_output(project_dir: str, budget_kb: int,
+                         route_chunks: Optional[List[Dict[str, Any]]] = None
+                         ) -> Optional[Dict[str, Any]]:
+    """Report the size of each built chunk and the packages bundled into it."""
+    from .build_analyzer import analyze_build, misplaced_packages
+    
+    print_header("Analyzing Build Output")
+    
+    report = analyze_build(project_dir, budget_kb=budget_kb, jobs=default_jobs())
+    if report is None:
+        print_info("No dist/assets/ found; run 'npm run build' to analyze the build output")
+        return None
+    if not report['chunks']:
+        print_warning("dist/assets/ contains no JavaScript or CSS chunks")
+        return report
+    
+    raw_total = sum(chunk['sizes']['raw'] for chunk in report['chunks'])
+    gzip_total = sum(chunk['sizes']['gzip'] for chunk in report['chunks'])
+    print_info(f"{len(report['chunks'])} chunks, {format_size(raw_total)} "
+               f"({format_size(gzip_total)} gzip)")
+    if not report['brotli']:
+        print_info("Install the 'brotli' package to include brotli sizes")
+    
+    for chunk in report['chunks']:
+        sizes = chunk['sizes']
+        summary = f"{chunk['file']}: {format_size(sizes['raw'])}, {format_size(sizes['gzip'])} gzip"
+        if sizes['brotli'] is not None:
+            summary += f", {format_size(sizes['brotli'])} brotli"
+        if chunk['initial']:
+            summary += " [initial]"
+        
+        if chunk['over_budget']:
+            print_warning(f"{summary} exceeds the {report['budget_kb']} KB chunk budget",
+                          file=f"dist/assets/{chunk['file']}")
+        else:
+            print_success(summary, file=f"dist/assets/{chunk['file']}")
+        
+        if chunk['packages']:
+            top = [f"{name} ({format_size(count)})" if chunk['attribution'] == 'bytes'
+                   else f"{name} ({count} module{'s' if count != 1 else ''})"
+                   for name, count in list(chunk['packages'].items())[:8]]
+            more = len(chunk['packages']) - len(top)
+            print(f"    packages: {', '.join(top)}" + (f" and {more} more" if more > 0 else ""))
+    
+    if not report['has_manifest'] and not report['has_stats']:
+        print_info("Set build.manifest: true (or add rollup-plugin-visualizer with "
+                   "template: 'raw-data') for exact chunk attribution")
+    
+    # Evaluate the manualChunks grouping against what the routes actually import
+    limit, config_file = report['chunk_size_warning_limit'], report['config_file']
+    if limit is not None and limit > DEFAULT_CHUNK_BUDGET_KB:
+        print_warning(f"chunkSizeWarningLimit is raised to {limit} KB, hiding Vite's warning "
+                      f"for chunks between {DEFAULT_CHUNK_BUDGET_KB} KB and {limit} KB",
+                      file=config_file)
+    
+    if route_chunks:
+        route_packages = {package for chunk in route_chunks[1:] for package in chunk['packages']}
+        for file_name, packages in misplaced_packages(report, route_packages).items():
+            print_warning(f"{file_name} loads on every page but includes packages only lazy "
+                          f"routes import: {', '.join(packages)}", file=f"dist/assets/{file_name}")
+            print_info("Narrow the manualChunks rule (match '/node_modules/<name>/' rather than "
+                       "substrings) so route-only libraries stay in their route chunks")
+    
+    return report
+
+def check_cache_policy(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Report the Cache-Control policy vercel.json gives each file in dist/."""
+    from .cache_policy import HOSTING_CONFIG, analyze_cache_policy, print_report
+    
+    print_header("Checking Hosting Cache Policy")
+    
+    try:
+        report = analyze_cache_policy(project_dir)
+    except ValueError:
+        print_error(f"Invalid JSON in file: {os.path.join(project_dir, HOSTING_CONFIG)}",
+                    file=HOSTING_CONFIG)
+        return None
+    if report is None:
+        print_info("No dist/ found; run 'npm run build' to check the hosting cache policy")
+        return None
+    
+    print_report(report)
+    if report['exposed_bytes']:
+        print_info("Run 'python -m pyutils cache-policy --emit' for an optimized headers block")
+    return report
+
 def analyze_vite_config(project_dir: str) -> None:
     """Analyze the Vite configuration file."""
+    from .js_config import lookup, parse_config, plugin_modules
+    
     vite_config_path = os.path.join(project_dir, 'vite.config.ts')
-    if not os.path.isfile(vite_config_path):
+    if not file_snapshot.is_file(vite_config_path):
         vite_config_path = os.path.join(project_dir, 'vite.config.js')
-        if not os.path.isfile(vite_config_path):
+        if not file_snapshot.is_file(vite_config_path):
             print_error("Could not find Vite configuration file")
             return
     
     print_header("Analyzing Vite Configuration")
     
+    config_file = os.path.basename(vite_config_path)
     try:
-        with open(vite_config_path, 'r') as file:
-            content = file.read()
-            
-            # Check for React plugin
-            if re.search(r'@vitejs/plugin-react', content):
-                print_success("Vite is configured with React plugin")
-            else:
-                print_error("Vite configuration is missing React plugin")
-            
-            # Check for path aliases
-            if re.search(r'resolve.*alias', content, re.DOTALL):
-                print_success("Vite is configured with path aliases")
-            else:
-                print_warning("Consider adding path aliases in Vite config for better imports")
-            
-            # Check for build optimizations
-            if re.search(r'build.*rollupOptions', content, re.DOTALL):
-                print_success("Vite has build optimizations configured")
-            else:
-                print_warning("Consider adding build optimizations in Vite config")
+        with span(f"read {config_file}", 'io'):
+            content = file_snapshot.read_text(vite_config_path)
+        
+        with span(f"parse {config_file}", 'parse'):
+            config = parse_config(content)
+        vite = config.value
+        
+        # Check for React plugin
+        if any(module.startswith('@vitejs/plugin-react')
+               for module in plugin_modules(config, lookup(vite, 'plugins'))):
+            print_success("Vite is configured with React plugin", file=config_file)
+        else:
+            print_error("Vite configuration is missing React plugin", file=config_file)
+        
+        # Check for path aliases
+        if lookup(vite, 'resolve', 'alias'):
+            print_success("Vite is configured with path aliases", file=config_file)
+        else:
+            print_warning("Consider adding path aliases in Vite config for better imports",
+                          file=config_file)
+        
+        # Check for build optimizations
+        if lookup(vite, 'build', 'rollupOptions') is not None:
+            print_success("Vite has build optimizations configured", file=config_file)
+        else:
+            print_warning("Consider adding build optimizations in Vite config",
+                          file=config_file)
     
     except Exception as e:
-        print_error(f"Error analyzing Vite config: {str(e)}")
+        print_error(f"Error analyzing Vite config: {str(e)}", file=config_file)
 
 def analyze_tsconfig(project_dir: str) -> None:
-    """Analyze the TypeScript configuration file."""
+    """Analyze the TypeScript configuration, following references and extends."""
+    from .tsconfig_resolver import build_problems, resolve_tsconfig
+    
     tsconfig_path = os.path.join(project_dir, 'tsconfig.json')
-    if not os.path.isfile(tsconfig_path):
+    if not file_snapshot.is_file(tsconfig_path):
         print_error("Could not find tsconfig.json")
         return
     
     print_header("Analyzing TypeScript Configuration")
     
-    tsconfig = load_json_file(tsconfig_path)
-    if not tsconfig:
+    with span("resolve tsconfig", 'parse'):
+        projects = resolve_tsconfig(project_dir)
+    if projects[0].error:
+        print_error(f"Invalid JSON in file: {tsconfig_path}", file='tsconfig.json')
         return
     
-    compiler_options = tsconfig.get('compilerOptions', {})
+    def rel(path: str) -> str:
+        return os.path.relpath(path, project_dir).replace(os.sep, '/')
     
-    # Check for strict mode
-    if compiler_options.get('strict'):
-        print_success("TypeScript is configured with strict mode")
-    else:
-        print_warning("Consider enabling strict mode in TypeScript for better type safety")
+    if len(projects) > 1:
+        print_info(f"Resolved {len(projects)} TypeScript projects: "
+                   f"{', '.join(rel(project.path) for project in projects)}")
+    for project in projects:
+        if project.error:
+            print_error(f"Could not read {rel(project.path)}: {project.error}",
+                        file=rel(project.path))
+        for problem in project.problems:
+            print_warning(f"{rel(project.path)}: {problem}", file=rel(project.path))
     
-    # Check for path aliases
-    if 'paths' in compiler_options:
-        print_success("TypeScript is configured with path aliases")
-    else:
-        print_warning("Consider adding path aliases in tsconfig.json for better imports")
+    # A solution-style root (files: [] plus references) is judged by the projects it references
+    source_projects = [project for project in projects
+                       if not project.error and project.has_sources()] or projects[:1]
     
-    # Check for target ECMAScript version
-    target = compiler_options.get('target')
-    if target and target in ['ES2020', 'ES2021', 'ES2022']:
-        print_success(f"TypeScript target is set to modern ECMAScript ({target})")
-    else:
-        print_warning(f"Consider using a modern ECMAScript target (current: {target})")
+    # Aliases usually live in the app project only, so other projects are not asked for them
+    has_paths = any('paths' in project.options for project in source_projects)
+    
+    for project in source_projects:
+        config_file = rel(project.path)
+        suffix = f" ({config_file})" if len(source_projects) > 1 else ""
+        compiler_options = project.options
+        
+        # Check for strict mode
+        if compiler_options.get('strict'):
+            print_success(f"TypeScript is configured with strict mode{suffix}", file=config_file)
+        else:
+            print_warning(f"Consider enabling strict mode in TypeScript for better type safety{suffix}",
+                          file=config_file)
+        
+        # Check for path aliases
+        if 'paths' in compiler_options:
+            print_success(f"TypeScript is configured with path aliases{suffix}", file=config_file)
+        elif not has_paths:
+            print_warning(f"Consider adding path aliases in tsconfig.json for better imports{suffix}",
+                          file=config_file)
+        
+        # Check for target ECMAScript version
+        target = compiler_options.get('target')
+        if isinstance(target, str) and target.upper() in MODERN_TS_TARGETS:
+            print_success(f"TypeScript target is set to modern ECMAScript ({target}){suffix}",
+                          file=config_file)
+        else:
+            print_warning(f"Consider using a modern ECMAScript target (current: {target}){suffix}",
+                          file=config_file)
+        
+        # Check for settings that slow down type-checking
+        problems = build_problems(project, project_dir)
+        for problem in problems:
+            print_warning(f"{problem}{suffix}", file=config_file)
+        if not problems:
+            print_success(f"TypeScript type-checking is incremental and skips library checks{suffix}",
+                          file=config_file)
 
-def analyze_tailwind_config(project_dir: str) -> None:
-    """Analyze the Tailwind CSS configuration file."""
+def analyze_tailwind_config(project_dir: str,
+                            max_scan_ms: float = DEFAULT_CONTENT_SCAN_MS) -> Optional[Dict[str, Any]]:
+    """Analyze the Tailwind CSS configuration file and the cost of its content globs."""
+    from .content_globs import config_globs
+    from .js_config import lookup, parse_config
+    
     tailwind_config_path = os.path.join(project_dir, 'tailwind.config.js')
-    if not os.path.isfile(tailwind_config_path):
+    if not file_snapshot.is_file(tailwind_config_path):
         print_error("Could not find tailwind.config.js")
-        return
+        return None
     
     print_header("Analyzing Tailwind CSS Configuration")
     
+    report = None
     try:
-        with open(tailwind_config_path, 'r') as file:
-            content = file.read()
-            
-            # Check for content configuration
-            if re.search(r'content.*\[.*\]', content, re.DOTALL):
-                print_success("Tailwind CSS content paths are configured")
-            else:
-                print_error("Tailwind CSS is missing content path configuration")
-            
-            # Check for theme customization
-            if re.search(r'theme.*extend', content, re.DOTALL):
-                print_success("Tailwind CSS theme customization is configured")
-            else:
-                print_warning("Consider customizing Tailwind CSS theme")
-            
-            # Check for plugins
-            if re.search(r'plugins.*\[', content, re.DOTALL):
-                print_success("Tailwind CSS plugins are configured")
-            else:
-                print_warning("Consider adding Tailwind CSS plugins for additional functionality")
+        with span(f"read {os.path.basename(tailwind_config_path)}", 'io'):
+            content = file_snapshot.read_text(tailwind_config_path)
+        
+        with span(f"parse {os.path.basename(tailwind_config_path)}", 'parse'):
+            tailwind = parse_config(content).value
+        
+        # Check for content configuration; v3 also accepts content: { files: [...] }
+        globs = config_globs(tailwind)
+        if globs:
+            print_success("Tailwind CSS content paths are configured",
+                          file='tailwind.config.js')
+            report = report_content_globs(project_dir, globs, max_scan_ms)
+        else:
+            print_error("Tailwind CSS is missing content path configuration",
+                        file='tailwind.config.js')
+        
+        # Check for theme customization
+        if lookup(tailwind, 'theme', 'extend') is not None:
+            print_success("Tailwind CSS theme customization is configured",
+                          file='tailwind.config.js')
+        else:
+            print_warning("Consider customizing Tailwind CSS theme", file='tailwind.config.js')
+        
+        # Check for plugins
+        if isinstance(lookup(tailwind, 'plugins'), list):
+            print_success("Tailwind CSS plugins are configured", file='tailwind.config.js')
+        else:
+            print_warning("Consider adding Tailwind CSS plugins for additional functionality",
+                          file='tailwind.config.js')
     
     except Exception as e:
-        print_error(f"Error analyzing Tailwind config: {str(e)}")
+        print_error(f"Error analyzing Tailwind config: {str(e)}", file='tailwind.config.js')
+    
+    return report
+
+def report_content_globs(project_dir: str, globs: List[str], max_scan_ms: float) -> Dict[str, Any]:
+    """Print what Tailwind's JIT scanner reads through the content globs."""
+    from .content_globs import analyze_content
+    
+    report = analyze_content(project_dir, globs, jobs=default_jobs(), max_scan_ms=max_scan_ms)
+    summary = (f"Content globs match {report['files']} files ({format_size(report['bytes'])}), "
+               f"estimated JIT scan {report['estimated_scan_ms']:.0f} ms")
+    if report['over_budget']:
+        print_warning(f"{summary}, over the {max_scan_ms:.0f} ms budget", file='tailwind.config.js')
+    else:
+        print_info(summary)
+    
+    for record in report['globs']:
+        line = f"{record['pattern']}: {record['files']} files, {format_size(record['bytes'])}"
+        if record['problems']:
+            print_warning(line, file='tailwind.config.js')
+            for problem in record['problems']:
+                print(f"    - {problem}")
+        else:
+            print(f"    {line}")
+    
+    if report['directories']:
+        heaviest = ', '.join(f"{directory} ({format_size(size)})"
+                             for directory, size in report['directories'][:3])
+        print_info(f"Heaviest scanned directories: {heaviest}")
+    return report
+
+def tailwind_reads(project_dir: str) -> List[str]:
+    """Return the Tailwind config plus the files and trees its content globs can match."""
+    from .content_globs import config_globs, glob_roots
+    from .js_config import parse_config
+    
+    reads = ['tailwind.config.js', 'vite.config.ts', 'vite.config.js']
+    try:
+        content = file_snapshot.read_text(os.path.join(project_dir, 'tailwind.config.js'))
+    except OSError:
+        return reads
+    return reads + glob_roots(project_dir, config_globs(parse_config(content).value))
 
 def generate_recommendations(missing_deps: List[str], config_results: Dict[str, bool]) -> None:
     """Generate recommendations based on analysis results."""
@@ -346,7 +729,7 @@ def generate_recommendations(missing_deps: List[str], config_results: Dict[str,
         print(f"\n    npm install {deps_str}\n")
     
     # Check for missing configuration files
-    missing_configs = [key for key, value in config_results.items() if not value and key not in ['eslintrc']]
+    missing_configs = find_missing_configs(config_results)
     
     if 'tsconfig.json' in missing_configs:
         print_info("Create a TypeScript configuration:")
@@ -390,42 +773,504 @@ def generate_recommendations(missing_deps: List[str], config_results: Dict[str,
 6. Add environment variable handling for different environments
     """)
 
-def main() -> None:
-    """Main function to run the script."""
-    print_header("Frontend Project Validator")
+def print_timing_summary(schedule: ScheduleResult) -> None:
+    """Print the wall time spent in each check."""
+    print_header("Check Timing")
+    for name, elapsed in sorted(schedule.timings, key=lambda item: item[1], reverse=True):
+        suffix = " (cached)" if name in schedule.cached else ""
+        print_info(f"{name:<28} {elapsed * 1000:9.1f} ms{suffix}", record=False)
+    print_info(f"{'total (wall)':<28} {schedule.wall_time * 1000:9.1f} ms", record=False)
+
+def check_toolchain(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Report the last run of tsc, eslint and vite build recorded by 'pyutils verify'."""
+    from .toolchain import describe, load_results
     
-    # Get project directory (default to current directory)
-    project_dir = os.getcwd()
+    print_header("Toolchain Results")
+    
+    run = load_results(project_dir)
+    if run is None:
+        print_info("No toolchain run recorded; run 'python -m pyutils verify' to type-check, "
+                   "lint and build with timing and peak memory")
+        return None
+    when = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['recorded_at']))
+    print_info(f"Last 'pyutils verify' run at {when}, {run['wall_time']:.1f}s wall time", record=False)
+    for result in run['tools']:
+        if result['status'] == 'passed':
+            print_success(describe(result))
+        elif result['status'] == 'missing':
+            print_warning(describe(result))
+        else:
+            print_error(describe(result))
+            for line in result['tail'][-5:]:
+                print(f"    {line}")
+    return run
+
+def check_perf_budgets(project_dir: str, schedule: ScheduleResult,
+                       record_run: bool = True) -> bool:
+    """
+    Record this run's metrics in the history and compare them with
+    perf-budgets.json and the rolling baseline; return False if a metric
+    failed. Without a budget file, drift is only reported as a warning.
+    """
+    from .perf_budgets import BUDGET_FILE, collect_metrics, evaluate, format_metric, load_budgets
+    
+    print_header("Performance Budgets")
     
-    # Check if package.json exists
-    has_package, package_data = check_package_json(project_dir)
-    if not has_package:
-        print_error("This doesn't appear to be a valid frontend project (missing package.json)")
-        sys.exit(1)
+    with findings.collecting('perf_budgets'):
+        try:
+            config = load_budgets(project_dir)
+        except (OSError, ValueError) as e:
+            print_error(f"Could not read {BUDGET_FILE}: {e}", file=BUDGET_FILE)
+            return False
+        metrics = collect_metrics(schedule.results,
+                                  load_json_file(os.path.join(project_dir, 'package.json')),
+                                  schedule.wall_time)
+        report = evaluate(project_dir, metrics, config, warm=bool(schedule.cached),
+                          record_run=record_run)
+        
+        failed = False
+        for entry in report['metrics']:
+            line = f"{entry['label']}: {format_metric(entry['metric'], entry['value'])}"
+            if entry['change_pct'] is not None:
+                line += f" ({entry['change_pct']:+.1f}% vs {entry['baseline_runs']}-run median)"
+            if entry['problems'] and config is not None:
+                failed = True
+                print_error(line, file=BUDGET_FILE)
+            elif entry['problems']:
+                print_warning(line)
+            else:
+                print_success(line)
+            for problem in entry['problems']:
+                print(f"    - {problem}")
     
-    # Check required dependencies
-    missing_deps = check_required_dependencies(package_data)
+    if config is None:
+        print_info(f"Add a {BUDGET_FILE} to enforce budgets and fail on regressions", record=False)
+    if report['recorded']:
+        print_info(f"Run recorded in {report['history']}"
+                   + (f" for commit {report['commit'][:10]}" if report['commit'] else ""), record=False)
+    return not failed
+
+def print_profile_summary(profiler: Profiler, paths: List[str]) -> None:
+    """Print where each check spent its time and the profile files written."""
+    import pstats
     
-    # Check configuration files
-    config_results = check_config_files(project_dir)
+    print_header("Profile")
+    print_info(f"{'check':<22} {'wall':>9} {'cpu':>9} {'io':>9} {'parse':>9}", record=False)
+    for row in profiler.summary():
+        print_info(f"{row['name']:<22} " + " ".join(
+            f"{row[column] * 1000:6.1f} ms" for column in ('wall', 'cpu', 'io', 'parse')),
+            record=False)
+    print_info("cpu is thread CPU time, so wall minus cpu is time blocked on I/O or the GIL; "
+               "io and parse add up spans on the check's helper threads too", record=False)
     
-    # Check project structure
-    check_project_structure(project_dir)
+    if profiler.cprofile is not None:
+        print_header("Slowest Functions (cProfile, cumulative)")
+        pstats.Stats(profiler.cprofile, stream=sys.stdout).sort_stats('cumulative').print_stats(15)
     
-    # Analyze configuration files
-    analyze_vite_config(project_dir)
-    analyze_tsconfig(project_dir)
-    analyze_tailwind_config(project_dir)
+    for path in paths:
+        print_info(f"Wrote {os.path.relpath(path)}", record=False)
+    print_info("Open trace.json in chrome://tracing or https://ui.perfetto.dev; "
+               "load profile.pstats with python -m pstats or snakeviz", record=False)
+
+def build_checks(project_dir: str, package_data: Dict,
+                 asset_budgets: Optional[Dict[str, int]] = None,
+                 use_cache: bool = True,
+                 chunk_budget_kb: int = DEFAULT_CHUNK_BUDGET_KB,
+                 content_scan_ms: int = DEFAULT_CONTENT_SCAN_MS) -> List[Check]:
+    """Declare the validator checks along with the files each one reads."""
+    from .tsconfig_resolver import tsconfig_files
     
-    # Generate recommendations
-    generate_recommendations(missing_deps, config_results)
+    if asset_budgets is None:
+        asset_budgets = {'max_bytes': DEFAULT_MAX_BYTES, 'max_svg_bytes': DEFAULT_MAX_SVG_BYTES,
+                         'max_pixels': DEFAULT_MAX_PIXELS}
+    return [
+        Check('dependencies',
+              lambda results: check_required_dependencies(package_data, project_dir, use_cache),
+              reads=['package.json', 'src/', 'vite.config.ts', 'vite.config.js',
+                     'tailwind.config.js', 'postcss.config.js', 'eslint.config.js']),
+        Check('resolved_versions',
+              lambda results: check_resolved_versions(project_dir, package_data),
+              reads=['package.json'] + list(LOCKFILE_NAMES)),
+        # Keyed on the lockfiles so an unchanged install replays from the cache
+        Check('dependency_weight',
+              lambda results: check_dependency_weight(project_dir, package_data),
+              reads=['package.json', 'node_modules/.package-lock.json',
+                     'node_modules/.modules.yaml', 'node_modules/.yarn-integrity']
+                    + list(LOCKFILE_NAMES)),
+        Check('config_files', lambda results: check_config_files(project_dir),
+              reads=['vite.config.ts', 'vite.config.js', 'tsconfig.json',
+                     'tailwind.config.js', 'postcss.config.js', 'eslint.config.js',
+                     '.eslintrc.js', '.eslintrc.json', 'components.json']),
+        Check('project_structure', lambda results: check_project_structure(project_dir),
+              reads=['src/', 'public/']),
+        Check('static_assets', lambda results: check_static_assets(project_dir, asset_budgets),
+              reads=['public/', 'src/', 'index.html'], params=asset_budgets),
+        Check('route_chunks', lambda results: analyze_route_chunks(project_dir, use_cache),
+              reads=['src/', 'vite.config.ts', 'vite.config.js', 'tsconfig.json',
+                     'tsconfig.app.json']),
+        Check('build_output',
+              lambda results: analyze_build_output(project_dir, chunk_budget_kb,
+                                                   results['route_chunks']),
+              reads=['dist/', 'stats.json', 'vite.config.ts', 'vite.config.js'],
+              requires=['route_chunks'], params=chunk_budget_kb),
+        Check('cache_policy', lambda results: check_cache_policy(project_dir),
+              reads=['dist/', 'vercel.json']),
+        Check('toolchain', lambda results: check_toolchain(project_dir),
+              reads=['.cache/pyutils/toolchain.json']),
+        Check('vite_config', lambda results: analyze_vite_config(project_dir),
+              reads=['vite.config.ts', 'vite.config.js']),
+        Check('tsconfig', lambda results: analyze_tsconfig(project_dir),
+              reads=tsconfig_files(project_dir)),
+        Check('tailwind_config',
+              lambda results: analyze_tailwind_config(project_dir, content_scan_ms),
+              reads=tailwind_reads(project_dir), params=content_scan_ms),
+        Check('recommendations',
+              lambda results: generate_recommendations(results['dependencies'] or [],
+                                                       results['config_files'] or {}),
+              requires=['dependencies', 'config_files']),
+    ]
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Validate a frontend project.")
+    parser.add_argument('--jobs', '-j', type=int, default=default_jobs(),
+                        help="Number of checks (or projects with --scan) to run in parallel "
+                             "(default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore and do not update the result cache in .cache/pyutils/")
+    parser.add_argument('--scan', metavar='ROOT',
+                        help="Validate every project with a package.json under ROOT")
+    parser.add_argument('--asset-max-kb', type=int, default=DEFAULT_MAX_BYTES // 1024,
+                        help="Byte budget per raster image in KB (default: %(default)s)")
+    parser.add_argument('--asset-max-svg-kb', type=int, default=DEFAULT_MAX_SVG_BYTES // 1024,
+                        help="Byte budget per SVG in KB (default: %(default)s)")
+    parser.add_argument('--asset-max-pixels', type=int, default=DEFAULT_MAX_PIXELS,
+                        help="Pixel budget per raster image (default: %(default)s)")
+    parser.add_argument('--chunk-max-kb', type=int, default=DEFAULT_CHUNK_BUDGET_KB,
+                        help="Raw size budget per built chunk in dist/assets/ in KB "
+                             "(default: %(default)s)")
+    parser.add_argument('--content-scan-max-ms', type=int, default=DEFAULT_CONTENT_SCAN_MS,
+                        help="Budget for the estimated Tailwind content scan in ms "
+                             "(default: %(default)s)")
+    parser.add_argument('--no-history', action='store_true',
+                        help="Do not record this run in the performance history "
+                             "(.cache/pyutils/perf-history.sqlite3)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time every check, split into I/O and parse time, and write a "
+                             f"Chrome trace to {PROFILE_DIR}/trace.json (implies --no-cache)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and re-run the checks affected by each change to "
+                             "package.json, the config files, src/ and the other inputs")
+    parser.add_argument('--poll', action='store_true',
+                        help="With --watch, poll for changes instead of using inotify")
+    parser.add_argument('--debounce-ms', type=int,
+                        help="With --watch, wait for this long without changes before "
+                             "re-running (default: 250)")
+    parser.add_argument('--format', choices=findings.FORMATS, default='text',
+                        help="ndjson streams one JSON object per finding and per finished check, "
+                             "then a summary; json writes one document at the end "
+                             "(default: %(default)s)")
+    parser.add_argument('--report-file', default='-', metavar='PATH',
+                        help="Where --format ndjson/json output goes; with '-' (the default) it "
+                             "goes to stdout and the text report moves to stderr")
+    parser.add_argument('--fail-on', choices=('never', 'error', 'warning'), default='never',
+                        help=f"Exit with {findings.EXIT_CODES['error']} when errors were found, or "
+                             f"{findings.EXIT_CODES['warning']} for warnings with 'warning' "
+                             "(default: %(default)s)")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="With --profile, also run under cProfile and write "
+                             f"{PROFILE_DIR}/profile.pstats (checks run serially)")
+    return parser.parse_args(argv)
+
+def source_version() -> str:
+    """
+    Hash every pyutils module, since checks call into many of them; an edit
+    to any one must invalidate the cached results.
+    """
+    from .result_cache import hash_bytes, hash_file
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digests = [f"{name}:{hash_file(os.path.join(package_dir, name))}"
+               for name in sorted(os.listdir(package_dir)) if name.endswith('.py')]
+    return hash_bytes('\n'.join(digests).encode())
+
+def open_result_cache(project_dir: str) -> Any:
+    """Open the result cache, keyed on the validator version and source."""
+    from .result_cache import ResultCache
+
+    version = f"{VALIDATOR_VERSION}:{source_version()}"
+    return ResultCache(project_dir, version)
+
+def asset_budgets_from_args(args: argparse.Namespace) -> Dict[str, int]:
+    """Collect the static asset budgets from the command line options."""
+    return {
+        'max_bytes': args.asset_max_kb * 1024,
+        'max_svg_bytes': args.asset_max_svg_kb * 1024,
+        'max_pixels': args.asset_max_pixels,
+    }
+
+def validate_project(project_dir: str, jobs: int, use_cache: bool = True,
+                     asset_budgets: Optional[Dict[str, int]] = None,
+                     chunk_budget_kb: int = DEFAULT_CHUNK_BUDGET_KB,
+                     content_scan_ms: int = DEFAULT_CONTENT_SCAN_MS) -> Optional[ScheduleResult]:
+    """Run every check against a project, or return None if it has no usable package.json."""
+    # Every check (and the cache fingerprints) reads the project through one
+    # snapshot, so each file is stat'ed and read once and all checks agree
+    with file_snapshot.snapshot(project_dir):
+        # Check if package.json exists
+        has_package, package_data = check_package_json(project_dir)
+        if not has_package:
+            print_error("This doesn't appear to be a valid frontend project (missing package.json)")
+            return None
+        
+        # Run the independent checks concurrently and replay their output in order;
+        # checks whose inputs are unchanged since the last run replay from the cache
+        cache = open_result_cache(project_dir) if use_cache else None
+        checks = build_checks(project_dir, package_data, asset_budgets, use_cache, chunk_budget_kb,
+                              content_scan_ms)
+        schedule = run_checks(checks, jobs=jobs, cache=cache)
+    if cache is not None:
+        cache.save()
+    
+    print_timing_summary(schedule)
+    return schedule
+
+def find_projects(root: str) -> Iterator[str]:
+    """Yield every directory under root that contains a package.json."""
+    stack = [os.path.abspath(root)]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        has_package = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == 'package.json' and entry.is_file():
+                        has_package = True
+                    elif entry.is_dir(follow_symlinks=False) and entry.name not in SCAN_SKIP_DIRS:
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        if has_package:
+            yield directory
+        stack.extend(sorted(subdirs, reverse=True))
+
+def scan_worker(project_dir: str, use_cache: bool,
+                asset_budgets: Optional[Dict[str, int]] = None,
+                chunk_budget_kb: int = DEFAULT_CHUNK_BUDGET_KB,
+                content_scan_ms: int = DEFAULT_CONTENT_SCAN_MS) -> Dict[str, Any]:
+    """Validate one project in a worker process and return a compact summary."""
+    start = time.perf_counter()
+    sink = findings.ReportSink(None)
+    with contextlib.redirect_stdout(io.StringIO()), findings.reporting(sink):
+        schedule = validate_project(project_dir, jobs=1, use_cache=use_cache,
+                                    asset_budgets=asset_budgets, chunk_budget_kb=chunk_budget_kb,
+                                    content_scan_ms=content_scan_ms)
+    summary: Dict[str, Any] = {
+        'path': project_dir,
+        'valid': schedule is not None,
+        'missing_deps': [],
+        'missing_configs': [],
+        'errors': sink.counts['error'],
+        'warnings': sink.counts['warning'],
+        'seconds': time.perf_counter() - start,
+    }
+    if schedule is not None:
+        config_results = schedule.results.get('config_files') or {}
+        summary['missing_deps'] = schedule.results.get('dependencies') or []
+        summary['missing_configs'] = find_missing_configs(config_results)
+    return summary
+
+def scan_projects(root: str, jobs: int, use_cache: bool = True,
+                  asset_budgets: Optional[Dict[str, int]] = None,
+                  chunk_budget_kb: int = DEFAULT_CHUNK_BUDGET_KB,
+                  content_scan_ms: int = DEFAULT_CONTENT_SCAN_MS) -> List[Dict[str, Any]]:
+    """
+    Validate every project under root on a process pool.
+
+    Projects are discovered lazily and at most ``2 * jobs`` are in flight at
+    once, and workers only send back a small summary, so memory stays bounded
+    however many projects the tree holds.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    summaries: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        in_flight = set()
+        for project_dir in find_projects(root):
+            in_flight.add(executor.submit(scan_worker, project_dir, use_cache, asset_budgets,
+                                          chunk_budget_kb, content_scan_ms))
+            if len(in_flight) >= 2 * jobs:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                summaries.extend(future.result() for future in finished)
+        finished, _ = wait(in_flight)
+        summaries.extend(future.result() for future in finished)
+    summaries.sort(key=lambda summary: summary['path'])
+    return summaries
+
+def print_scan_report(root: str, summaries: List[Dict[str, Any]], wall_time: float) -> None:
+    """Print the aggregated report for a --scan run."""
+    print_header("Monorepo Scan Report")
+    root = os.path.abspath(root)
+    for summary in summaries:
+        name = os.path.relpath(summary['path'], root)
+        timing = f"{summary['seconds'] * 1000:.1f} ms"
+        if not summary['valid']:
+            print_error(f"{name}: invalid package.json ({timing})")
+        elif summary['missing_deps'] or summary['missing_configs']:
+            print_warning(f"{name}: {len(summary['missing_deps'])} missing dependencies, "
+                          f"{len(summary['missing_configs'])} missing config files, "
+                          f"{summary['warnings']} warnings ({timing})")
+        else:
+            print_success(f"{name}: {summary['warnings']} warnings ({timing})")
+    
+    print_header("Scan Summary")
+    with_issues = [s for s in summaries if not s['valid'] or s['missing_deps'] or s['missing_configs']]
+    print_info(f"Projects scanned: {len(summaries)}")
+    print_info(f"Projects with issues: {len(with_issues)}")
+    print_info(f"Total check time: {sum(s['seconds'] for s in summaries) * 1000:.1f} ms")
+    print_info(f"Wall time: {wall_time * 1000:.1f} ms")
+
+def run_validation(project_dir: str, args: argparse.Namespace) -> Tuple[bool, bool]:
+    """
+    Validate a single project; return (valid, within_budgets), with valid
+    False if it has no usable package.json.
+    """
+    print_header("Frontend Project Validator")
+    
+    if args.profile:
+        # cProfile only sees the calling thread, so the checks run serially under it
+        with profiling(use_cprofile=args.cprofile) as profiler:
+            schedule = validate_project(project_dir, jobs=1 if args.cprofile else args.jobs,
+                                        use_cache=False,
+                                        asset_budgets=asset_budgets_from_args(args),
+                                        chunk_budget_kb=args.chunk_max_kb,
+                                        content_scan_ms=args.content_scan_max_ms)
+        print_profile_summary(profiler, profiler.write(os.path.join(project_dir, PROFILE_DIR)))
+    else:
+        schedule = validate_project(project_dir, jobs=args.jobs, use_cache=not args.no_cache,
+                                    asset_budgets=asset_budgets_from_args(args),
+                                    chunk_budget_kb=args.chunk_max_kb,
+                                    content_scan_ms=args.content_scan_max_ms)
+    if schedule is None:
+        return False, True
+    # Profiled runs are slower than normal ones and would skew the run time history
+    within_budgets = check_perf_budgets(project_dir, schedule,
+                                        record_run=not (args.profile or args.no_history))
+    missing_deps = schedule.results['dependencies'] or []
+    config_results = schedule.results['config_files'] or {}
     
     print_header("Validation Complete")
     
-    if not missing_deps and all(config_results.values()):
+    if not missing_deps and not find_missing_configs(config_results):
         print_success("All required dependencies and configuration files are present!")
     else:
         print_warning("Some dependencies or configuration files are missing. See recommendations above.")
+    if not within_budgets:
+        print_error("Performance budgets failed. See the Performance Budgets section above.")
+    return True, within_budgets
+
+def watch_project(project_dir: str, args: argparse.Namespace) -> bool:
+    """Validate once, then re-run only the checks affected by each batch of changes."""
+    from .file_watcher import DEFAULT_DEBOUNCE_SECONDS, create_watcher, watch_changes
+    
+    if not run_validation(project_dir, args)[0]:
+        return False
+    
+    use_cache = not args.no_cache
+    asset_budgets = asset_budgets_from_args(args)
+    cache = open_result_cache(project_dir) if use_cache else None
+    package_path = os.path.join(project_dir, 'package.json')
+    checks = build_checks(project_dir, load_json_file(package_path) or {}, asset_budgets, use_cache,
+                          args.chunk_max_kb, args.content_scan_max_ms)
+    paths = sorted(set(['package.json']).union(*(check.reads for check in checks)))
+    watcher = create_watcher(project_dir, paths, force_polling=args.poll)
+    print_info(f"Watching {len(paths)} paths ({watcher.method}); press Ctrl+C to stop",
+               record=False)
+    
+    try:
+        debounce = (DEFAULT_DEBOUNCE_SECONDS if args.debounce_ms is None
+                    else args.debounce_ms / 1000)
+        for changed in watch_changes(watcher, debounce=debounce):
+            # A fresh snapshot per batch picks up the changed files
+            with file_snapshot.snapshot(project_dir):
+                # package.json feeds every check's closure, so it is re-read each time
+                package_data = load_json_file(package_path)
+                if package_data is None:
+                    continue
+                checks = build_checks(project_dir, package_data, asset_budgets, use_cache,
+                                      args.chunk_max_kb, args.content_scan_max_ms)
+                affected = select_affected(checks, changed)
+                if not affected:
+                    continue
+                
+                names = sorted(changed)
+                more = f" and {len(names) - 3} more" if len(names) > 3 else ""
+                print_header(f"Changed: {', '.join(names[:3])}{more}")
+                if cache is not None:
+                    cache.forget_trees()
+                schedule = run_checks(affected, jobs=args.jobs, cache=cache)
+            if cache is not None:
+                cache.save()
+            print_timing_summary(schedule)
+    except KeyboardInterrupt:
+        print_info("Stopped watching", record=False)
+    finally:
+        watcher.close()
+    return True
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+    
+    if args.cprofile:
+        args.profile = True
+    
+    if args.scan:
+        print_header("Frontend Project Validator (scan mode)")
+        if args.profile:
+            print_warning("--profile is not supported with --scan and is ignored")
+        if args.format != 'text':
+            print_warning(f"--format {args.format} is not supported with --scan and is ignored")
+        if args.watch:
+            print_warning("--watch is not supported with --scan and is ignored")
+        start = time.perf_counter()
+        summaries = scan_projects(args.scan, jobs=args.jobs, use_cache=not args.no_cache,
+                                  asset_budgets=asset_budgets_from_args(args),
+                                  chunk_budget_kb=args.chunk_max_kb,
+                                  content_scan_ms=args.content_scan_max_ms)
+        print_scan_report(args.scan, summaries, time.perf_counter() - start)
+        if not summaries:
+            print_warning(f"No projects with a package.json found under {args.scan}")
+        if not all(summary['valid'] for summary in summaries):
+            sys.exit(1)
+        return
+    
+    # Get project directory (default to current directory)
+    project_dir = os.getcwd()
+    
+    with contextlib.ExitStack() as stack:
+        if args.format == 'text':
+            stream = None
+        elif args.report_file == '-':
+            # Keep stdout machine-readable; the human report goes to stderr
+            stream = sys.stdout
+            stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        else:
+            stream = stack.enter_context(open(args.report_file, 'w', encoding='utf-8'))
+        sink = stack.enter_context(findings.reporting(
+            findings.ReportSink(stream, streaming=args.format == 'ndjson')))
+        
+        within_budgets = True
+        if args.watch:
+            valid = watch_project(project_dir, args)
+        else:
+            valid, within_budgets = run_validation(project_dir, args)
+        # A perf-budgets.json failure fails the run whatever --fail-on says
+        exit_code = 1 if not valid else None if within_budgets else findings.EXIT_CODES['error']
+        code = sink.close(args.fail_on, exit_code=exit_code, project=project_dir, valid=valid)
+    if code:
+        sys.exit(code)
 
 if __name__ == "__main__":
     main()
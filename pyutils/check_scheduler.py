@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Check Scheduler
+
+Runs a list of project checks on a thread pool. Each check declares the files
+it reads and writes; two checks only run concurrently when neither writes a
+file the other one touches. Output printed by a check is captured per thread
+and replayed in declaration order once everything has finished, so the report
+reads exactly as it would from a serial run. When a result cache is given,
+checks whose inputs are unchanged replay their stored output instead.
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import findings
+from .profiling import span
+
+class Check:
+    """A unit of work together with the files it reads and writes."""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any],
+                 reads: Sequence[str] = (), writes: Sequence[str] = (),
+                 requires: Sequence[str] = (), params: Any = None) -> None:
+        self.name = name
+        self.func = func
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+        self.requires = tuple(requires)
+        # Options that change the check's output; part of its cache key
+        self.params = params
+
+    def conflicts_with(self, other: 'Check') -> bool:
+        """Return True if the two checks must not run at the same time."""
+        return bool(self.writes & (other.reads | other.writes)
+                    or other.writes & self.reads)
+
+class ScheduleResult:
+    """Results, timings and failures collected from a scheduler run."""
+
+    def __init__(self) -> None:
+        self.results: Dict[str, Any] = {}
+        self.timings: List[Tuple[str, float]] = []
+        self.errors: Dict[str, BaseException] = {}
+        self.cached: Set[str] = set()
+        self.findings: Dict[str, List[Dict[str, Any]]] = {}
+        self.wall_time = 0.0
+
+class _ThreadLocalStdout:
+    """A sys.stdout stand-in that routes writes to a per-thread buffer."""
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+        self._local = threading.local()
+
+    def push(self, buffer: io.StringIO) -> None:
+        self._local.buffer = buffer
+
+    def pop(self) -> None:
+        self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self._target.write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, 'buffer', None) is None:
+            self._target.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+_install_lock = threading.Lock()
+_install_count = 0
+_proxy: Optional[_ThreadLocalStdout] = None
+
+def _install_proxy() -> _ThreadLocalStdout:
+    """Install the capturing stdout proxy (reference counted for nesting)."""
+    global _install_count, _proxy
+    with _install_lock:
+        if _install_count == 0:
+            _proxy = _ThreadLocalStdout(sys.stdout)
+            sys.stdout = _proxy
+        _install_count += 1
+        return _proxy
+
+def _uninstall_proxy() -> None:
+    """Restore the original stdout once the outermost run has finished."""
+    global _install_count, _proxy
+    with _install_lock:
+        _install_count -= 1
+        if _install_count == 0 and _proxy is not None:
+            sys.stdout = _proxy._target
+            _proxy = None
+
+def default_jobs() -> int:
+    """Return the default worker count for the thread pool."""
+    return min(8, os.cpu_count() or 1)
+
+def build_dependencies(checks: Sequence[Check]) -> Dict[str, List[str]]:
+    """Map each check name to the earlier checks it has to wait for."""
+    names = {check.name for check in checks}
+    dependencies: Dict[str, List[str]] = {}
+    for index, check in enumerate(checks):
+        deps = [name for name in check.requires if name in names]
+        for earlier in checks[:index]:
+            if earlier.name not in deps and check.conflicts_with(earlier):
+                deps.append(earlier.name)
+        dependencies[check.name] = deps
+    return dependencies
+
+def _run_check(check: Check, result: ScheduleResult,
+               proxy: Optional[_ThreadLocalStdout],
+               cache: Optional[Any] = None) -> Tuple[str, float]:
+    """Run a single check, capturing its output when a proxy is given."""
+    start = time.perf_counter()
+    key = None
+    if cache is not None and not check.writes:
+        inputs = [result.results.get(name) for name in check.requires]
+        key = cache.key(check.name, check.reads, inputs, check.params)
+        entry = cache.lookup(check.name, key)
+        if entry is not None:
+            result.results[check.name] = entry['value']
+            result.cached.add(check.name)
+            result.findings[check.name] = entry.get('findings', [])
+            findings.replay(result.findings[check.name])
+            elapsed = time.perf_counter() - start
+            findings.check_finished(check.name, elapsed, cached=True)
+            return entry['output'], elapsed
+
+    buffer = io.StringIO()
+    if proxy is not None:
+        proxy.push(buffer)
+    with findings.collecting(check.name) as collected:
+        try:
+            with span(check.name, 'check'):
+                result.results[check.name] = check.func(result.results)
+        except BaseException as e:
+            result.results[check.name] = None
+            result.errors[check.name] = e
+            if isinstance(e, Exception):
+                print(f"✗ Check {check.name} failed: {str(e)}")
+                findings.record('error', f"Check {check.name} failed: {str(e)}")
+        finally:
+            elapsed = time.perf_counter() - start
+            if proxy is not None:
+                proxy.pop()
+    result.findings[check.name] = collected
+    findings.check_finished(check.name, elapsed)
+    output = buffer.getvalue()
+    if key is not None and check.name not in result.errors:
+        cache.store(check.name, key, output, result.results[check.name], collected)
+    return output, elapsed
+
+def _reads_path(check: Check, rel_path: str) -> bool:
+    """Return True if rel_path is one of the check's inputs or lies below one."""
+    for read in check.reads:
+        if read.endswith('/'):
+            if rel_path.startswith(read) or rel_path == read.rstrip('/'):
+                return True
+        elif rel_path == read:
+            return True
+    return False
+
+def select_affected(checks: Sequence[Check], changed: Set[str]) -> List[Check]:
+    """
+    Return the checks to re-run after the given project paths changed: those
+    reading a changed path, every check requiring one of them (transitively),
+    and the checks those require so their inputs are available. Checks are
+    returned in declaration order.
+    """
+    by_name = {check.name: check for check in checks}
+    affected = {check.name for check in checks
+                if any(_reads_path(check, path) for path in changed)}
+    grew = True
+    while grew:
+        grew = False
+        for check in checks:
+            if check.name not in affected and affected.intersection(check.requires):
+                affected.add(check.name)
+                grew = True
+    stack = list(affected)
+    while stack:
+        for name in by_name[stack.pop()].requires:
+            if name in by_name and name not in affected:
+                affected.add(name)
+                stack.append(name)
+    return [check for check in checks if check.name in affected]
+
+def run_checks(checks: Sequence[Check], jobs: Optional[int] = None,
+               cache: Optional[Any] = None) -> ScheduleResult:
+    """
+    Run checks respecting their file dependencies and return the results.
+
+    With ``jobs == 1`` checks run serially in declaration order. Otherwise
+    independent checks run on a thread pool and their output is written in
+    declaration order after the run completes. ``cache`` is an optional
+    ``ResultCache``; checks that write files are never cached.
+    """
+    jobs = jobs or default_jobs()
+    result = ScheduleResult()
+    start = time.perf_counter()
+
+    if jobs <= 1:
+        proxy = _install_proxy() if cache is not None else None
+        try:
+            for check in checks:
+                output, elapsed = _run_check(check, result, proxy, cache)
+                sys.stdout.write(output)
+                result.timings.append((check.name, elapsed))
+                _reraise_fatal(result)
+        finally:
+            if proxy is not None:
+                _uninstall_proxy()
+        result.wall_time = time.perf_counter() - start
+        return result
+
+    # Imported here: concurrent.futures pulls in logging, which CLI startup
+    # (and every serial run) can do without
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    dependencies = build_dependencies(checks)
+    pending = list(checks)
+    done: Dict[str, Tuple[str, float]] = {}
+    proxy = _install_proxy()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            while pending or running:
+                for check in list(pending):
+                    if all(dep in done for dep in dependencies[check.name]):
+                        pending.remove(check)
+                        future = executor.submit(_run_check, check, result, proxy, cache)
+                        running[future] = check.name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[running.pop(future)] = future.result()
+    finally:
+        _uninstall_proxy()
+
+    for check in checks:
+        output, elapsed = done[check.name]
+        sys.stdout.write(output)
+        result.timings.append((check.name, elapsed))
+    sys.stdout.flush()
+    result.wall_time = time.perf_counter() - start
+    _reraise_fatal(result)
+    return result
+
+def _reraise_fatal(result: ScheduleResult) -> None:
+    """Propagate SystemExit/KeyboardInterrupt raised inside a check."""
+    for error in result.errors.values():
+        if not isinstance(error, Exception):
+            raise error
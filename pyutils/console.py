@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Console Output
+
+Coloured terminal helpers shared by the pyutils commands. Messages printed
+through print_success / print_warning / print_error / print_info are also
+recorded as structured findings (see findings.py), which is a no-op unless a
+report sink is open or a check is collecting them.
+"""
+
+from typing import Optional
+
+from . import findings
+
+# ANSI color codes for terminal output
+class Colors:
+    HEADER = '\033[95m'
+    BLUE = '\033[94m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+    UNDERLINE = '\033[4m'
+
+def print_header(message: str) -> None:
+    """Print a formatted header message."""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(80)}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}\n")
+
+def print_success(message: str, file: Optional[str] = None) -> None:
+    """Print a success message."""
+    print(f"{Colors.GREEN}✓ {message}{Colors.ENDC}")
+    findings.record('success', message, file)
+
+def print_warning(message: str, file: Optional[str] = None) -> None:
+    """Print a warning message."""
+    print(f"{Colors.YELLOW}⚠ {message}{Colors.ENDC}")
+    findings.record('warning', message, file)
+
+def print_error(message: str, file: Optional[str] = None) -> None:
+    """Print an error message."""
+    print(f"{Colors.RED}✗ {message}{Colors.ENDC}")
+    findings.record('error', message, file)
+
+def print_info(message: str, file: Optional[str] = None, record: bool = True) -> None:
+    """Print an info message; record=False keeps it out of the structured report."""
+    print(f"{Colors.BLUE}ℹ {message}{Colors.ENDC}")
+    if record:
+        findings.record('info', message, file)
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Tailwind Content Glob Cost
+
+Expands the ``content`` globs of a Tailwind config the way its JIT scanner
+does (fast-glob semantics: ``**``, ``*``, ``?``, ``[...]``, ``{a,b}``
+alternatives, ``!`` negations, wildcards not matching dotfiles) and counts
+the files and bytes every glob matches. Tailwind reads each of those files
+when the dev server starts and on every ``vite build``, so the totals give
+an estimate of the scan cost.
+
+The walk starts at the static prefix of each glob, descends only into
+directories some glob can still match below, and lists directories a level
+at a time on a thread pool. Matches inside node_modules, public/ or the
+build output are reported, since they add scan time without adding classes.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from . import file_snapshot
+from .budgets import DEFAULT_CONTENT_SCAN_MS
+from .profiling import carry, span
+
+# Extensions Tailwind can find class names in; anything else is scanned for nothing
+SOURCE_EXTENSIONS = ('.html', '.htm', '.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.mts',
+                     '.cts', '.vue', '.svelte', '.astro', '.md', '.mdx', '.php')
+
+# Directories whose files are never meant to be scanned for classes
+VENDOR_DIR = 'node_modules'
+PUBLIC_DIR = 'public'
+BUILD_DIRS = ('dist', 'build')
+
+# Rough cost model of the JIT content scan: a fixed cost per file for the
+# stat/read/cache lookup plus candidate extraction at a steady throughput
+SCAN_MS_PER_FILE = 0.05
+SCAN_BYTES_PER_MS = 40 * 1024
+
+# Brace alternatives beyond this many expansions are left unexpanded
+MAX_EXPANSIONS = 256
+
+_GLOB_CHARS = re.compile(r'[*?\[{]')
+
+def expand_braces(pattern: str) -> List[str]:
+    """Expand {a,b} alternatives, innermost groups included: 'x.{ts,tsx}' -> x.ts, x.tsx."""
+    depth = 0
+    start = -1
+    for index, char in enumerate(pattern):
+        if char == '{':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                options = _split_top_level(pattern[start + 1:index])
+                if len(options) < 2:
+                    continue
+                expanded: List[str] = []
+                for option in options:
+                    for tail in expand_braces(pattern[index + 1:]):
+                        for head in expand_braces(option):
+                            expanded.append(pattern[:start] + head + tail)
+                            if len(expanded) >= MAX_EXPANSIONS:
+                                return expanded
+                return expanded
+    return [pattern]
+
+def _split_top_level(text: str) -> List[str]:
+    parts = []
+    depth = 0
+    current = []
+    for char in text:
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+def _segment_regex(segment: str) -> 're.Pattern[str]':
+    out = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            end = segment.find(']', index + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[index + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                index = end
+        else:
+            out.append(re.escape(char))
+        index += 1
+    return re.compile(''.join(out))
+
+class GlobPattern:
+    """One brace-expanded glob, split into its static base and matchable segments."""
+
+    def __init__(self, glob: str, source: str) -> None:
+        self.source = source
+        parts = [part for part in glob.split('/') if part not in ('', '.')]
+        literal = 0
+        while literal < len(parts) - 1 and not _GLOB_CHARS.search(parts[literal]):
+            literal += 1
+        # Project-relative directory the walk for this glob starts at ('' for the root)
+        self.base = '/'.join(parts[:literal])
+        self.segments: List[Any] = []
+        for part in parts[literal:]:
+            self.segments.append('**' if part == '**' else
+                                 (part, _segment_regex(part), part.startswith('.')))
+
+    def _closure(self, states: Iterable[int]) -> FrozenSet[int]:
+        result = set(states)
+        for state in sorted(result):
+            while state < len(self.segments) and self.segments[state] == '**':
+                state += 1
+                result.add(state)
+        return frozenset(result)
+
+    def start(self) -> FrozenSet[int]:
+        """Matcher state at the base directory."""
+        return self._closure([0])
+
+    def step(self, states: FrozenSet[int], name: str) -> FrozenSet[int]:
+        """Advance the matcher state by one path component."""
+        following = []
+        for state in states:
+            if state >= len(self.segments):
+                continue
+            segment = self.segments[state]
+            if segment == '**':
+                # ** does not descend into dot-directories
+                if not name.startswith('.'):
+                    following.append(state)
+                continue
+            _text, regex, allows_dot = segment
+            if name.startswith('.') and not allows_dot:
+                continue
+            if regex.fullmatch(name):
+                following.append(state + 1)
+        return self._closure(following)
+
+    def matched(self, states: FrozenSet[int]) -> bool:
+        return len(self.segments) in states
+
+    def can_descend(self, states: FrozenSet[int]) -> bool:
+        return any(state < len(self.segments) for state in states)
+
+    def names_vendor_dir(self) -> bool:
+        """Return True if the glob spells out node_modules itself."""
+        return VENDOR_DIR in self.base.split('/') or any(
+            segment != '**' and segment[0] == VENDOR_DIR for segment in self.segments)
+
+def config_globs(config: Optional[Dict[str, Any]]) -> List[str]:
+    """Return the content globs of a parsed Tailwind config (content: [...] or { files: [...] })."""
+    from .js_config import lookup, string_values
+
+    content = lookup(config, 'content')
+    if isinstance(content, dict):
+        content = content.get('files')
+    return string_values(content)
+
+def compile_globs(globs: Iterable[str]) -> Tuple[List[GlobPattern], List[GlobPattern]]:
+    """Split content globs into brace-expanded positive and negated patterns."""
+    positive: List[GlobPattern] = []
+    negative: List[GlobPattern] = []
+    for glob in globs:
+        negated = glob.startswith('!')
+        pattern = glob[1:] if negated else glob
+        for expanded in expand_braces(pattern.replace('\\', '/')):
+            (negative if negated else positive).append(GlobPattern(expanded, glob))
+    return positive, negative
+
+# Per walked directory: project-relative path plus the matcher state of every
+# pattern whose base it lies under
+_Task = Tuple[str, Dict[int, FrozenSet[int]]]
+
+def _scan_directory(project_dir: str, patterns: List[GlobPattern], task: _Task,
+                    ) -> Tuple[List[Tuple[str, int, List[int]]], List[_Task]]:
+    rel_dir, states = task
+    files: List[Tuple[str, int, List[int]]] = []
+    subdirs: List[_Task] = []
+    try:
+        with os.scandir(os.path.join(project_dir, rel_dir)) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                advanced = {index: patterns[index].step(state, entry.name)
+                            for index, state in states.items()}
+                if is_dir:
+                    for index, pattern in enumerate(patterns):
+                        if index not in advanced and pattern.base == rel:
+                            advanced[index] = pattern.start()
+                    live = {index: state for index, state in advanced.items()
+                            if patterns[index].can_descend(state)}
+                    on_path = any(pattern.base.startswith(rel + '/') for pattern in patterns)
+                    if live or on_path:
+                        subdirs.append((rel, live))
+                    continue
+                matched = [index for index, state in advanced.items()
+                           if patterns[index].matched(state)]
+                if matched:
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    files.append((rel, size, matched))
+    except OSError:
+        pass
+    return files, subdirs
+
+def _single_files(project_dir: str, patterns: List[GlobPattern]) -> List[Tuple[str, int, List[int]]]:
+    """Globs without wildcards name a single file, e.g. './index.html'."""
+    found: Dict[str, Tuple[int, List[int]]] = {}
+    for index, pattern in enumerate(patterns):
+        if len(pattern.segments) != 1 or pattern.segments[0] == '**' \
+                or _GLOB_CHARS.search(pattern.segments[0][0]):
+            continue
+        rel = f"{pattern.base}/{pattern.segments[0][0]}" if pattern.base else pattern.segments[0][0]
+        path = os.path.join(project_dir, rel)
+        if file_snapshot.is_file(path):
+            found.setdefault(rel, (file_snapshot.stat(path).st_size, []))[1].append(index)
+    return [(rel, size, indexes) for rel, (size, indexes) in found.items()]
+
+def walk_globs(project_dir: str, patterns: List[GlobPattern],
+               jobs: int = 8) -> List[Tuple[str, int, List[int]]]:
+    """Return (project-relative path, size, matching pattern indexes) for every matched file."""
+    literal = {index for index, pattern in enumerate(patterns)
+               if len(pattern.segments) == 1 and pattern.segments[0] != '**'
+               and not _GLOB_CHARS.search(pattern.segments[0][0])}
+    walked = [pattern for index, pattern in enumerate(patterns) if index not in literal]
+    index_map = [index for index in range(len(patterns)) if index not in literal]
+
+    # Start at the shallowest bases; deeper ones are picked up on the way down
+    bases = sorted({pattern.base for pattern in walked}, key=lambda base: (base.count('/'), base))
+    roots: List[str] = []
+    for base in bases:
+        if not any(root == '' or base == root or base.startswith(root + '/') for root in roots):
+            roots.append(base)
+    level: List[_Task] = [(root, {index: pattern.start() for index, pattern in enumerate(walked)
+                                  if pattern.base == root}) for root in roots]
+
+    matches: List[Tuple[str, int, List[int]]] = []
+    scan = carry(lambda task: _scan_directory(project_dir, walked, task))
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while level:
+            next_level: List[_Task] = []
+            for files, subdirs in executor.map(scan, level):
+                matches.extend((rel, size, [index_map[index] for index in indexes])
+                               for rel, size, indexes in files)
+                next_level.extend(subdirs)
+            level = next_level
+    matches.extend(_single_files(project_dir, patterns))
+    return matches
+
+def glob_roots(project_dir: str, globs: Iterable[str]) -> List[str]:
+    """
+    Return the project-relative directories ('src/') and files the globs can
+    match in. A glob rooted at the project itself yields its top-level entries
+    except node_modules/ and the build output, which would make every cache
+    lookup stat the whole install; the cost report flags those matches instead.
+    """
+    positive, _negative = compile_globs(globs)
+    skipped = {f"{name}/" for name in [VENDOR_DIR] + build_output_dirs(project_dir)}
+    roots: List[str] = []
+    for pattern in positive:
+        if len(pattern.segments) == 1 and pattern.segments[0] != '**' \
+                and not _GLOB_CHARS.search(pattern.segments[0][0]):
+            found = [f"{pattern.base}/{pattern.segments[0][0]}" if pattern.base
+                     else pattern.segments[0][0]]
+        elif pattern.base:
+            found = [f"{pattern.base}/"]
+        else:
+            try:
+                with os.scandir(project_dir) as entries:
+                    found = sorted(f"{entry.name}/" if entry.is_dir() else entry.name
+                                   for entry in entries if not entry.name.startswith('.'))
+            except OSError:
+                found = []
+        roots.extend(root for root in found if root not in roots and root not in skipped)
+    return roots
+
+def build_output_dirs(project_dir: str) -> List[str]:
+    """Return dist/, build/ and Vite's build.outDir when it is set elsewhere."""
+    from .js_config import lookup, parse_config
+
+    dirs = list(BUILD_DIRS)
+    for name in ('vite.config.ts', 'vite.config.js', 'vite.config.mts', 'vite.config.mjs'):
+        try:
+            content = file_snapshot.read_text(os.path.join(project_dir, name))
+        except OSError:
+            continue
+        out_dir = lookup(parse_config(content).value, 'build', 'outDir')
+        if isinstance(out_dir, str):
+            out_dir = os.path.normpath(out_dir).replace(os.sep, '/')
+            if not out_dir.startswith('..') and out_dir not in dirs:
+                dirs.append(out_dir)
+        break
+    return dirs
+
+def _area(rel: str, build_dirs: List[str]) -> Optional[str]:
+    parts = rel.split('/')
+    if VENDOR_DIR in parts[:-1]:
+        return VENDOR_DIR
+    if parts[0] == PUBLIC_DIR:
+        return PUBLIC_DIR
+    for build_dir in build_dirs:
+        if rel.startswith(build_dir + '/'):
+            return build_dir
+    return None
+
+def estimate_scan_ms(files: int, total_bytes: int) -> float:
+    """Estimate how long Tailwind's JIT scanner takes to read and extract these files."""
+    return files * SCAN_MS_PER_FILE + total_bytes / SCAN_BYTES_PER_MS
+
+def analyze_content(project_dir: str, globs: List[str], jobs: int = 8,
+                    max_scan_ms: float = DEFAULT_CONTENT_SCAN_MS) -> Dict[str, Any]:
+    """
+    Expand the content globs and return a JSON-serializable report with the
+    files and bytes per glob, the heaviest directories and the estimated scan
+    time. Each glob record lists its problems.
+    """
+    positive, negative = compile_globs(globs)
+    build_dirs = build_output_dirs(project_dir)
+    started = time.perf_counter()
+    with span("walk content globs", 'io'):
+        matches = walk_globs(project_dir, positive, jobs)
+    walk_ms = (time.perf_counter() - started) * 1000
+
+    def excluded(rel: str) -> bool:
+        for pattern in negative:
+            if pattern.base and not rel.startswith(pattern.base + '/'):
+                continue
+            state = pattern.start()
+            for name in rel[len(pattern.base) + 1 if pattern.base else 0:].split('/'):
+                state = pattern.step(state, name)
+                if not state:
+                    break
+            if pattern.matched(state):
+                return True
+        return False
+
+    sources = [glob for glob in dict.fromkeys(globs) if not glob.startswith('!')]
+    per_glob = {glob: {'pattern': glob, 'files': 0, 'bytes': 0, 'areas': {}, 'other_extensions': {}}
+                for glob in sources}
+    seen: Dict[str, int] = {}
+    directories: Dict[str, int] = {}
+    for rel, size, indexes in matches:
+        if excluded(rel):
+            continue
+        area = _area(rel, build_dirs)
+        extension = os.path.splitext(rel)[1].lower()
+        for glob in dict.fromkeys(positive[index].source for index in indexes):
+            record = per_glob[glob]
+            record['files'] += 1
+            record['bytes'] += size
+            if area is not None:
+                record['areas'][area] = record['areas'].get(area, 0) + 1
+            if extension not in SOURCE_EXTENSIONS:
+                key = extension or '(none)'
+                record['other_extensions'][key] = record['other_extensions'].get(key, 0) + 1
+        if rel not in seen:
+            seen[rel] = size
+            directory = '/'.join(rel.split('/')[:-1][:3]) or '.'
+            directories[directory] = directories.get(directory, 0) + size
+
+    vendor_globs = {pattern.source for pattern in positive if pattern.names_vendor_dir()}
+    for glob, record in per_glob.items():
+        problems = []
+        if record['files'] == 0:
+            problems.append("matches no files")
+        if glob in vendor_globs or VENDOR_DIR in record['areas']:
+            count = record['areas'].get(VENDOR_DIR, 0)
+            problems.append(f"reaches into node_modules ({count} files matched); list the "
+                            "specific package paths that ship class names instead")
+        if PUBLIC_DIR in record['areas']:
+            problems.append(f"matches {record['areas'][PUBLIC_DIR]} files in public/, "
+                            "which are served as-is and hold no class names")
+        for build_dir in build_dirs:
+            if build_dir in record['areas']:
+                problems.append(f"matches {record['areas'][build_dir]} files of build output in "
+                                f"{build_dir}/, so every build rescans its own output")
+        if record['other_extensions']:
+            listed = ', '.join(sorted(record['other_extensions']))
+            count = sum(record['other_extensions'].values())
+            problems.append(f"matches {count} files that cannot contain classes ({listed}); "
+                            "narrow the extension list")
+        record['problems'] = problems
+        del record['areas']
+        del record['other_extensions']
+
+    total_files = len(seen)
+    total_bytes = sum(seen.values())
+    estimated_ms = estimate_scan_ms(total_files, total_bytes)
+    return {
+        'globs': list(per_glob.values()),
+        'files': total_files,
+        'bytes': total_bytes,
+        'estimated_scan_ms': round(estimated_ms, 1),
+        'over_budget': estimated_ms > max_scan_ms,
+        'walk_ms': round(walk_ms, 1),
+        'directories': sorted(directories.items(), key=lambda item: item[1], reverse=True)[:5],
+    }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Dependency Usage Index
+
+Builds an inverted index of the bare package specifiers imported from src/
+(package -> importing files) on top of the import graph, and compares it
+with the dependencies declared in package.json. Packages that are only
+imported, required or loaded as plugins by root config files (vite, eslint,
+postcss, tailwind) or run from package.json scripts, and @types/* packages
+for used libraries, count as used.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Set
+
+from . import file_snapshot
+from .import_graph import ImportGraph, package_name, scan_imports
+from .js_config import ConfigFile, lookup, parse_config, plugin_modules
+
+NODE_BUILTINS = {
+    'assert', 'buffer', 'child_process', 'crypto', 'events', 'fs', 'http', 'https', 'module',
+    'net', 'os', 'path', 'process', 'querystring', 'readline', 'stream', 'string_decoder',
+    'timers', 'tls', 'url', 'util', 'worker_threads', 'zlib',
+}
+
+# Command names that differ from the package providing them
+BIN_PACKAGES = {
+    'tsc': 'typescript',
+    'tsserver': 'typescript',
+    'vite': 'vite',
+    'eslint': 'eslint',
+    'vitest': 'vitest',
+    'tailwindcss': 'tailwindcss',
+    'prettier': 'prettier',
+}
+
+# Packages the toolchain loads implicitly once a related package is present
+IMPLICIT_PACKAGES = {
+    'postcss': 'tailwindcss',
+    'autoprefixer': 'postcss',
+}
+
+_CONFIG_FILE = re.compile(r'^[\w.-]+\.config\.(?:js|cjs|mjs|ts|cts|mts)$')
+
+def usage_index(graph: ImportGraph) -> Dict[str, List[str]]:
+    """Map each imported package to the sorted list of files importing it."""
+    index: Dict[str, Set[str]] = {}
+    for path, externals in graph.externals.items():
+        for _kind, package in externals:
+            index.setdefault(package, set()).add(path)
+    return {package: sorted(files) for package, files in index.items()}
+
+def declared_dependencies(package_data: Dict[str, Any]) -> Dict[str, str]:
+    """Map every declared dependency to the package.json group declaring it."""
+    declared: Dict[str, str] = {}
+    for group in ('peerDependencies', 'optionalDependencies', 'devDependencies', 'dependencies'):
+        for name in (package_data.get(group) or {}):
+            declared[name] = group
+    return declared
+
+def config_plugins(config_file: ConfigFile) -> List[str]:
+    """
+    Modules named as plugins in a parsed config: entries of a plugins array
+    (react(), require('x')) and keys of a PostCSS-style plugins object.
+    """
+    plugins = lookup(config_file.value, 'plugins')
+    if isinstance(plugins, dict):
+        return list(plugins)
+    return plugin_modules(config_file, plugins)
+
+def config_references(project_dir: str, declared: Dict[str, str]) -> Dict[str, List[str]]:
+    """Find declared packages imported, required or loaded as plugins by root config files."""
+    references: Dict[str, Set[str]] = {}
+    try:
+        names = [name for name in os.listdir(project_dir) if _CONFIG_FILE.match(name)]
+    except OSError:
+        return {}
+    for name in sorted(names):
+        try:
+            content = file_snapshot.read_text(os.path.join(project_dir, name))
+        except OSError:
+            continue
+        found = {specifier for _kind, specifier in scan_imports(content)}
+        found.update(config_plugins(parse_config(content)))
+        for specifier in found:
+            package = package_name(specifier)
+            if package in declared:
+                references.setdefault(package, set()).add(name)
+    return {package: sorted(files) for package, files in references.items()}
+
+def script_references(package_data: Dict[str, Any], declared: Dict[str, str]) -> Set[str]:
+    """Find declared packages whose commands are run from package.json scripts."""
+    used: Set[str] = set()
+    for command in (package_data.get('scripts') or {}).values():
+        for word in re.findall(r'[@\w./-]+', command):
+            package = BIN_PACKAGES.get(word, word)
+            if package in declared:
+                used.add(package)
+    return used
+
+def analyze_usage(project_dir: str, package_data: Dict[str, Any],
+                  graph: ImportGraph) -> Dict[str, Any]:
+    """Return the usage index with declared-but-unused and used-but-undeclared packages."""
+    declared = declared_dependencies(package_data)
+    index = usage_index(graph)
+    from_configs = config_references(project_dir, declared)
+    from_scripts = script_references(package_data, declared)
+
+    used = set(index) | set(from_configs) | from_scripts
+    # Type packages and implicitly loaded tooling follow the package they serve
+    for name in declared:
+        if name.startswith('@types/'):
+            target = name[len('@types/'):]
+            if '__' in target:
+                target = '@' + target.replace('__', '/')
+            if target in used or target == 'node':
+                used.add(name)
+    for name, trigger in IMPLICIT_PACKAGES.items():
+        if name in declared and trigger in used:
+            used.add(name)
+
+    unused = sorted(name for name in declared if name not in used
+                    and declared[name] != 'peerDependencies')
+    undeclared = {package: files for package, files in sorted(index.items())
+                  if package not in declared
+                  and package not in NODE_BUILTINS
+                  and not package.startswith('node:')}
+    return {
+        'index': index,
+        'unused': unused,
+        'undeclared': undeclared,
+        'groups': {name: declared[name] for name in unused},
+    }
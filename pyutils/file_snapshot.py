@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+File Snapshot
+
+A per-run view of the project files that every check reads through. Each file
+under the project root is stat'ed at most once and read at most once per run,
+however many checks (and the result cache) ask for it; large files are
+memory-mapped rather than copied into memory. Contents are handed out as
+read-only memoryviews and str objects, so no check can alter what another one
+sees, and since nothing is re-read mid-run all checks see the same version of
+a file even if an editor saves it while the run is in progress.
+
+Values derived from many files, such as the src/ import graph, can be memoized
+on the snapshot as well, so checks running concurrently build them once.
+
+Outside an active snapshot, and for paths outside its root, the helpers fall
+back to reading the file system directly.
+"""
+
+import io
+import mmap
+import os
+import stat as stat_module
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, TextIO, Tuple, Union
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 20
+
+class _ViewReader(io.RawIOBase):
+    """Raw binary stream over a memoryview, so buffered/text wrappers can read it."""
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+def _text_stream(view: memoryview) -> TextIO:
+    """Decode a memoryview as UTF-8 text with universal newlines, like open(path, 'r')."""
+    return io.TextIOWrapper(io.BufferedReader(_ViewReader(view)), encoding='utf-8')
+
+def _decode(view: memoryview, errors: str) -> str:
+    text = str(view, 'utf-8', errors)
+    if '\r' in text:
+        # Match the newline translation of files opened in text mode
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+class FileSnapshot:
+    """Stat and content memo for the files under one project root."""
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+        self._contents: Dict[str, Union[memoryview, OSError]] = {}
+        self._texts: Dict[Tuple[str, str], str] = {}
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._maps: List[mmap.mmap] = []
+        self._memo: Dict[Hashable, Any] = {}
+        self._memo_locks: Dict[Hashable, threading.Lock] = {}
+
+    def covers(self, path: str) -> bool:
+        """Return True if an absolute path lies under the snapshot root."""
+        return path == self.root or path.startswith(self.root + os.sep)
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """Return the stat result of an absolute path, or None if it does not exist."""
+        with self._lock:
+            if path in self._stats:
+                return self._stats[path]
+        with self._path_lock(path):
+            with self._lock:
+                if path in self._stats:
+                    return self._stats[path]
+            try:
+                result: Optional[os.stat_result] = os.stat(path)
+            except OSError:
+                result = None
+            with self._lock:
+                self._stats[path] = result
+            return result
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        # Serializes the first stat and read of one path across threads
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def read_bytes(self, path: str) -> memoryview:
+        """Return the contents of an absolute path as a read-only memoryview."""
+        with self._path_lock(path):
+            content = self._contents.get(path)
+            if content is None:
+                content = self._load(path)
+                self._contents[path] = content
+        if isinstance(content, OSError):
+            raise OSError(content.errno, content.strerror, content.filename)
+        return content
+
+    def read_text(self, path: str, errors: str = 'strict') -> str:
+        """Return the contents of an absolute path decoded as UTF-8."""
+        key = (path, errors)
+        with self._lock:
+            if key in self._texts:
+                return self._texts[key]
+        text = _decode(self.read_bytes(path), errors)
+        with self._lock:
+            return self._texts.setdefault(key, text)
+
+    def _load(self, path: str) -> Union[memoryview, OSError]:
+        try:
+            with open(path, 'rb') as file:
+                file_stat = os.fstat(file.fileno())
+                if file_stat.st_size >= MMAP_THRESHOLD:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    with self._lock:
+                        self._maps.append(mapped)
+                    content = memoryview(mapped)
+                else:
+                    content = memoryview(file.read())
+        except OSError as error:
+            return error
+        with self._lock:
+            self._stats.setdefault(path, file_stat)
+        return content
+
+    def memoize(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the value stored under key, computing it with factory on first use."""
+        with self._lock:
+            key_lock = self._memo_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._memo:
+                    return self._memo[key]
+            value = factory()
+            with self._lock:
+                self._memo[key] = value
+            return value
+
+    def close(self) -> None:
+        """Release the memory maps that no caller still holds a view of."""
+        with self._lock:
+            self._contents.clear()
+            self._texts.clear()
+            self._memo.clear()
+            maps, self._maps = self._maps, []
+        for mapped in maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller kept a view; the map is released with it
+                pass
+
+_active: Optional[FileSnapshot] = None
+
+@contextmanager
+def snapshot(root: str) -> Iterator[FileSnapshot]:
+    """Serve reads of files under root from one shared snapshot for the block."""
+    global _active
+    current = FileSnapshot(root)
+    previous, _active = _active, current
+    try:
+        yield current
+    finally:
+        _active = previous
+        current.close()
+
+def _snapshot_for(path: str) -> Tuple[Optional[FileSnapshot], str]:
+    full_path = os.path.abspath(path)
+    current = _active
+    if current is not None and current.covers(full_path):
+        return current, full_path
+    return None, full_path
+
+def memoized(root: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Compute factory() once per snapshot covering root; concurrent callers wait
+    for the first. Without a snapshot, factory() runs on every call.
+    """
+    current, full_path = _snapshot_for(root)
+    if current is not None:
+        return current.memoize((full_path, key), factory)
+    return factory()
+
+def stat(path: str) -> Optional[os.stat_result]:
+    """Return the stat result of a path, or None if it does not exist."""
+    current, full_path = _snapshot_for(path)
+    if current is not None:
+        return current.stat(full_path)
+    try:
+        return os.stat(full_path)
+    except OSError:
+        return None
+
+def is_file(path: str) -> bool:
+    """Return True if path is an existing regular file."""
+    result = stat(path)
+    return result is not None and stat_module.S_ISREG(result.st_mode)
+
+def is_dir(path: str) -> bool:
+    """Return True if path is an existing directory."""
+    result = stat(path)
+    return result is not None and stat_module.S_ISDIR(result.st_mode)
+
+def read_bytes(path: str) -> memoryview:
+    """Return a file's contents as a read-only memoryview; raises OSError."""
+    current, full_path = _snapshot_for(path)
+    if current is not None:
+        return current.read_bytes(full_path)
+    with open(full_path, 'rb') as file:
+        return memoryview(file.read())
+
+def read_text(path: str, errors: str = 'strict') -> str:
+    """Return a file's contents decoded as UTF-8; raises OSError."""
+    current, full_path = _snapshot_for(path)
+    if current is not None:
+        return current.read_text(full_path, errors)
+    with open(full_path, 'r', encoding='utf-8', errors=errors) as file:
+        return file.read()
+
+def open_text(path: str) -> TextIO:
+    """Open a file for streaming UTF-8 text reads; raises OSError."""
+    current, full_path = _snapshot_for(path)
+    if current is not None:
+        return _text_stream(current.read_bytes(full_path))
+    return open(full_path, 'r', encoding='utf-8')
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+File Watcher
+
+Reports changes to a set of project paths for --watch mode. On Linux the
+kernel's inotify interface is used through ctypes (no third-party package);
+directory paths are watched recursively and directories created later are
+picked up as they appear. Elsewhere, or when inotify is unavailable or out of
+watches, the paths are polled by mtime and size. Bursts of events, such as an
+editor writing a temp file and renaming it over the original, are debounced
+into a single batch of changed paths.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Iterator, Set, Tuple
+
+from .result_cache import TREE_SKIP_DIRS
+
+DEFAULT_DEBOUNCE_SECONDS = 0.25
+DEFAULT_POLL_SECONDS = 0.5
+
+# Upper bound on how long a continuous stream of events can delay a run
+MAX_BATCH_SECONDS = 2.0
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT = struct.Struct('iIII')
+
+def _split_targets(paths: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """Split watched paths into directory trees ('src/') and single files."""
+    trees = {path.rstrip('/') for path in paths if path.endswith('/')}
+    files = {path for path in paths if not path.endswith('/')}
+    return trees, files
+
+def is_watched(rel_path: str, paths: Iterable[str]) -> bool:
+    """Return True if a project-relative path falls under one of the watched paths."""
+    for path in paths:
+        if path.endswith('/'):
+            if rel_path.startswith(path) or rel_path == path.rstrip('/'):
+                return True
+        elif rel_path == path:
+            return True
+    return False
+
+class PollingWatcher:
+    """Detects changes by comparing mtime and size snapshots."""
+
+    method = 'polling'
+
+    def __init__(self, root: str, paths: Iterable[str],
+                 interval: float = DEFAULT_POLL_SECONDS) -> None:
+        self.root = root
+        self.paths = sorted(set(paths))
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        trees, files = _split_targets(self.paths)
+        for rel in files:
+            try:
+                stat = os.stat(os.path.join(self.root, rel))
+            except OSError:
+                continue
+            snapshot[rel] = (stat.st_mtime_ns, stat.st_size)
+        for tree in trees:
+            stack = [os.path.join(self.root, tree)]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in TREE_SKIP_DIRS:
+                                    stack.append(entry.path)
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            rel = os.path.relpath(entry.path, self.root).replace(os.sep, '/')
+                            snapshot[rel] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Wait up to timeout seconds and return the paths that changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {rel for rel in set(current) | set(self.snapshot)
+                       if current.get(rel) != self.snapshot.get(rel)}
+            self.snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+class InotifyWatcher:
+    """Linux inotify watcher; raises OSError if inotify cannot be set up."""
+
+    method = 'inotify'
+
+    def __init__(self, root: str, paths: Iterable[str]) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.paths = sorted(set(paths))
+        self.trees, self.files = _split_targets(self.paths)
+        self.dirs: Dict[int, str] = {}
+        try:
+            # Single files are watched through their directory so that editors
+            # replacing them by rename are still seen
+            for directory in {os.path.dirname(rel) for rel in self.files}:
+                self._watch(directory)
+            for tree in self.trees:
+                self._watch_tree(tree)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, rel_dir: str) -> None:
+        full = os.path.join(self.root, rel_dir)
+        if not os.path.isdir(full):
+            return
+        wd = self._add_watch(self.fd, os.fsencode(full), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {rel_dir}: {os.strerror(errno)}")
+        self.dirs[wd] = rel_dir
+
+    def _watch_tree(self, rel_dir: str) -> None:
+        self._watch(rel_dir)
+        for current, subdirs, _files in os.walk(os.path.join(self.root, rel_dir)):
+            subdirs[:] = [name for name in subdirs if name not in TREE_SKIP_DIRS]
+            for name in subdirs:
+                self._watch(os.path.relpath(os.path.join(current, name), self.root))
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Wait up to timeout seconds and return the watched paths that changed."""
+        changed: Set[str] = set()
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return changed
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report every watched path as changed
+                return set(self.paths)
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.dirs[wd]
+                continue
+            rel = os.path.join(directory, os.fsdecode(name)) if name else directory
+            rel = os.path.normpath(rel).replace(os.sep, '/')
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if rel in self.trees or (os.path.basename(rel) not in TREE_SKIP_DIRS and any(
+                        rel.startswith(tree + '/') for tree in self.trees)):
+                    try:
+                        self._watch_tree(rel)
+                    except OSError:
+                        pass
+            if is_watched(rel, self.paths):
+                changed.add(rel)
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+def create_watcher(root: str, paths: Iterable[str], force_polling: bool = False):
+    """Return an inotify watcher when possible, otherwise a polling watcher."""
+    paths = list(paths)
+    if not force_polling:
+        try:
+            return InotifyWatcher(root, paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, paths)
+
+def watch_changes(watcher, debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                  idle_timeout: float = 1.0) -> Iterator[Set[str]]:
+    """
+    Yield batches of changed paths forever. A batch is closed once no new
+    event arrived for debounce seconds, or after MAX_BATCH_SECONDS.
+    """
+    while True:
+        changed = watcher.poll(idle_timeout)
+        if not changed:
+            continue
+        started = time.monotonic()
+        while time.monotonic() - started < MAX_BATCH_SECONDS:
+            more = watcher.poll(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Structured Findings
+
+Every message the validator prints through print_success / print_warning /
+print_error / print_info is also recorded as a finding: the check it came
+from, a severity, an optional project file and the message text. While a
+report sink is open, findings are written out as they happen, either as one
+NDJSON object per line (streamed while the checks run) or as a single JSON
+document at the end, followed by a summary with per-severity counts and the
+exit code derived from them. CI can consume this directly instead of scraping
+the coloured terminal output.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+SEVERITIES = ('error', 'warning', 'info', 'success')
+
+# Process exit codes when findings of a severity are present; 1 is reserved
+# for "not a valid project"
+EXIT_CODES = {'error': 2, 'warning': 3}
+
+FORMATS = ('text', 'ndjson', 'json')
+
+# Findings outside any check (e.g. a missing package.json) belong to this id
+GLOBAL_CHECK = 'validator'
+
+_context = threading.local()
+
+class ReportSink:
+    """
+    Receives findings and check completions and writes the machine report.
+    With no stream it only counts, which is enough to derive the exit code.
+    """
+
+    def __init__(self, stream: Optional[TextIO], streaming: bool = True) -> None:
+        self.stream = stream
+        self.streaming = streaming
+        self.counts = {severity: 0 for severity in SEVERITIES}
+        self.findings: List[Dict[str, Any]] = []
+        self.checks: List[Dict[str, Any]] = []
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        if self.stream is None:
+            return
+        self.stream.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def finding(self, finding: Dict[str, Any]) -> None:
+        with self._lock:
+            self.counts[finding['severity']] += 1
+            if self.streaming:
+                self._emit(dict(type='finding', **finding))
+            else:
+                self.findings.append(finding)
+
+    def check_finished(self, name: str, duration: float, cached: bool) -> None:
+        event = {'check': name, 'duration_ms': round(duration * 1000, 3), 'cached': cached}
+        with self._lock:
+            if self.streaming:
+                self._emit(dict(type='check', **event))
+            else:
+                self.checks.append(event)
+
+    def exit_code(self, fail_on: str) -> int:
+        """Return the exit code for the findings so far ('never', 'error' or 'warning')."""
+        if fail_on == 'never':
+            return 0
+        if self.counts['error']:
+            return EXIT_CODES['error']
+        if fail_on == 'warning' and self.counts['warning']:
+            return EXIT_CODES['warning']
+        return 0
+
+    def close(self, fail_on: str, exit_code: Optional[int] = None, **extra: Any) -> int:
+        """
+        Write the summary (or the whole document) and return the exit code;
+        exit_code overrides the one derived from the findings.
+        """
+        code = self.exit_code(fail_on) if exit_code is None else exit_code
+        summary = dict(extra, counts=self.counts, exit_code=code,
+                       duration_ms=round((time.perf_counter() - self.start) * 1000, 3))
+        with self._lock:
+            if self.streaming:
+                self._emit(dict(type='summary', **summary))
+            elif self.stream is not None:
+                json.dump({'findings': self.findings, 'checks': self.checks,
+                           'summary': summary}, self.stream, indent=2, ensure_ascii=False)
+                self.stream.write('\n')
+                self.stream.flush()
+        return code
+
+_sink: Optional[ReportSink] = None
+
+@contextmanager
+def reporting(sink: ReportSink) -> Iterator[ReportSink]:
+    """Send findings to sink for the duration of the block."""
+    global _sink
+    previous, _sink = _sink, sink
+    try:
+        yield sink
+    finally:
+        _sink = previous
+
+@contextmanager
+def collecting(check: str) -> Iterator[List[Dict[str, Any]]]:
+    """Attribute findings recorded on this thread to check and collect them."""
+    previous = (getattr(_context, 'check', None), getattr(_context, 'collected', None))
+    collected: List[Dict[str, Any]] = []
+    _context.check, _context.collected = check, collected
+    try:
+        yield collected
+    finally:
+        _context.check, _context.collected = previous
+
+def record(severity: str, message: str, file: Optional[str] = None) -> None:
+    """Record one finding for the check running on this thread."""
+    finding = {
+        'check': getattr(_context, 'check', None) or GLOBAL_CHECK,
+        'severity': severity,
+        'file': file,
+        'message': message,
+    }
+    collected = getattr(_context, 'collected', None)
+    if collected is not None:
+        collected.append(finding)
+    sink = _sink
+    if sink is not None:
+        sink.finding(finding)
+
+def replay(findings: List[Dict[str, Any]]) -> None:
+    """Re-emit findings stored with a cached check result."""
+    sink = _sink
+    if sink is not None:
+        for finding in findings:
+            sink.finding(finding)
+
+def check_finished(name: str, duration: float, cached: bool = False) -> None:
+    """Report that a check completed, with its duration."""
+    sink = _sink
+    if sink is not None:
+        sink.check_finished(name, duration, cached)
+
+def count(findings: List[Dict[str, Any]], severity: str) -> int:
+    """Number of findings of one severity."""
+    return sum(1 for finding in findings if finding['severity'] == severity)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Import Graph Indexer
+
+Builds the module graph of a project's src/ tree from the import/export
+statements of every TS/TSX/JS/JSX file. Files are tokenized with a single
+linear scanner that skips comments and string contents, so commented-out
+imports and strings that merely look like imports are ignored. The raw
+import specifiers of every file are persisted under .cache/pyutils/ and a
+file is only re-tokenized when its mtime, size and content hash change.
+"""
+
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import file_snapshot
+from .js_config import alias_map, lookup, parse_config
+from .profiling import carry, span
+from .result_cache import CACHE_DIR, hash_bytes
+
+GRAPH_CACHE_NAME = 'import-graph.json'
+GRAPH_CACHE_VERSION = 1
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+RESOLVE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.json')
+
+# Libraries whose presence in a route chunk is worth calling out
+HEAVY_LIBRARIES = ('echarts', 'echarts-for-react', 'leaflet', 'react-leaflet', 'framer-motion',
+                   'recharts', '@tremor/react', 'vue-data-ui', 'date-fns')
+
+_TOKEN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<template>`(?:[^`\\]|\\.)*`?)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<punct>[(){};,*=])
+  | (?P<other>[^\sA-Za-z_$"'`/(){};,*=]+|/)
+  | \s+
+''', re.VERBOSE | re.DOTALL)
+
+# Tokens allowed between "import"/"export" and "from"
+_CLAUSE_PUNCT = {'{', '}', ',', '*'}
+
+def _tokens(text: str) -> Iterator[Tuple[str, str]]:
+    """Yield (kind, value) for significant tokens, dropping comments and whitespace."""
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind is None or kind == 'comment':
+            continue
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1] if len(value) > 1 and value[-1] == value[0] else value[1:]
+        yield kind, value
+
+def stripped_text(text: str) -> str:
+    """
+    Re-join the significant tokens of a source file with single spaces:
+    comments are gone, strings are re-quoted with double quotes and template
+    literals are emptied, so regexes over it only see live code.
+    """
+    parts = []
+    for kind, value in _tokens(text):
+        if kind == 'string':
+            parts.append(json.dumps(value))
+        elif kind == 'template':
+            parts.append('``')
+        else:
+            parts.append(value)
+    return ' '.join(parts)
+
+def scan_imports(text: str) -> List[Tuple[str, str]]:
+    """
+    Return (kind, specifier) for every import in a source file.
+
+    kind is "static" for import/export ... from and side-effect imports,
+    "dynamic" for import() and require(), and "type" for type-only imports,
+    which are erased at build time.
+    """
+    imports: List[Tuple[str, str]] = []
+    tokens = list(_tokens(text))
+    count = len(tokens)
+    i = 0
+    while i < count:
+        kind, value = tokens[i]
+        if kind != 'word' or value not in ('import', 'export', 'require'):
+            i += 1
+            continue
+        # Skip property accesses such as foo.import or import.meta
+        if i > 0 and tokens[i - 1] == ('other', '.'):
+            i += 1
+            continue
+        nxt = tokens[i + 1] if i + 1 < count else ('', '')
+        if nxt == ('punct', '(') and value in ('import', 'require'):
+            if i + 2 < count and tokens[i + 2][0] == 'string':
+                imports.append(('dynamic', tokens[i + 2][1]))
+            i += 2
+            continue
+        if value == 'require':
+            i += 1
+            continue
+        if value == 'import' and nxt[0] == 'string':
+            imports.append(('static', nxt[1]))
+            i += 2
+            continue
+
+        # import/export clause: walk until "from" STRING, or bail out on anything else
+        type_only = nxt == ('word', 'type')
+        j = i + 1
+        while j < count:
+            tkind, tvalue = tokens[j]
+            if tkind == 'word' and tvalue == 'from' and j + 1 < count and tokens[j + 1][0] == 'string':
+                imports.append(('type' if type_only else 'static', tokens[j + 1][1]))
+                j += 2
+                break
+            if tkind == 'word' and tvalue not in ('import', 'export', 'require', 'from'):
+                j += 1
+                continue
+            if tkind == 'punct' and tvalue in _CLAUSE_PUNCT:
+                j += 1
+                continue
+            break
+        i = max(j, i + 1)
+    return imports
+
+def load_aliases(project_dir: str) -> Dict[str, str]:
+    """
+    Read resolve.alias from vite.config.ts/js, falling back to the tsconfig
+    paths and finally to the conventional '@' -> 'src'.
+    """
+    aliases: Dict[str, str] = {}
+    for name in ('vite.config.ts', 'vite.config.js', 'vite.config.mts', 'vite.config.mjs'):
+        try:
+            content = file_snapshot.read_text(os.path.join(project_dir, name))
+        except OSError:
+            continue
+        vite = parse_config(content).value
+        for find, replacement in alias_map(lookup(vite, 'resolve', 'alias')).items():
+            aliases[find] = os.path.normpath(replacement)
+        break
+    if aliases:
+        return aliases
+    for name in ('tsconfig.app.json', 'tsconfig.json'):
+        try:
+            content = file_snapshot.read_text(os.path.join(project_dir, name))
+        except OSError:
+            continue
+        for match in re.finditer(r'"([^"*]+)/\*"\s*:\s*\[\s*"([^"*]+)/\*"', content):
+            aliases[match.group(1)] = os.path.normpath(match.group(2))
+        if aliases:
+            return aliases
+    return {'@': 'src'}
+
+def package_name(specifier: str) -> str:
+    """Return the package a bare specifier belongs to (e.g. @scope/pkg/sub -> @scope/pkg)."""
+    parts = specifier.split('/')
+    if specifier.startswith('@') and len(parts) > 1:
+        return '/'.join(parts[:2])
+    return parts[0]
+
+class ImportGraph:
+    """Module graph of a project: internal edges plus external packages per file."""
+
+    def __init__(self, project_dir: str, aliases: Dict[str, str]) -> None:
+        self.project_dir = project_dir
+        self.aliases = aliases
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # file -> [(kind, resolved project-relative path)]
+        self.edges: Dict[str, List[Tuple[str, str]]] = {}
+        # file -> [(kind, package name)]
+        self.externals: Dict[str, List[Tuple[str, str]]] = {}
+        self.reparsed = 0
+
+    def _existing(self, candidate: str) -> Optional[str]:
+        full = os.path.join(self.project_dir, candidate)
+        if file_snapshot.is_file(full):
+            return candidate
+        for extension in RESOLVE_EXTENSIONS:
+            if file_snapshot.is_file(full + extension):
+                return candidate + extension
+        for extension in RESOLVE_EXTENSIONS:
+            if file_snapshot.is_file(os.path.join(full, 'index' + extension)):
+                return os.path.join(candidate, 'index' + extension)
+        return None
+
+    def resolve(self, importer: str, specifier: str) -> Tuple[str, Optional[str]]:
+        """Resolve a specifier to ('internal', path), ('external', package) or ('missing', None)."""
+        specifier = specifier.split('?', 1)[0]
+        if specifier.startswith('.'):
+            candidate = os.path.normpath(os.path.join(os.path.dirname(importer), specifier))
+            resolved = self._existing(candidate)
+            return ('internal', resolved) if resolved else ('missing', None)
+        for alias, target in sorted(self.aliases.items(), key=lambda item: -len(item[0])):
+            if specifier == alias or specifier.startswith(alias + '/'):
+                candidate = os.path.normpath(os.path.join(target, specifier[len(alias):].lstrip('/')))
+                resolved = self._existing(candidate)
+                return ('internal', resolved) if resolved else ('missing', None)
+        if specifier.startswith('/') or ':' in specifier.split('/')[0]:
+            return ('missing', None)
+        return ('external', package_name(specifier))
+
+    def link(self) -> None:
+        """Resolve every file's specifiers into internal edges and external packages."""
+        self.edges = {}
+        self.externals = {}
+        for path, entry in self.files.items():
+            edges: List[Tuple[str, str]] = []
+            externals: List[Tuple[str, str]] = []
+            for kind, specifier in entry['imports']:
+                where, target = self.resolve(path, specifier)
+                if where == 'internal' and target:
+                    edges.append((kind, target))
+                elif where == 'external' and target:
+                    externals.append((kind, target))
+            self.edges[path] = edges
+            self.externals[path] = externals
+
+    def reachable(self, start: str, kinds: Tuple[str, ...] = ('static',)) -> Set[str]:
+        """Return every module reachable from start through edges of the given kinds."""
+        seen: Set[str] = set()
+        stack = [start]
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            stack.extend(target for kind, target in self.edges.get(path, ()) if kind in kinds)
+        return seen
+
+    def packages_of(self, modules: Set[str], kinds: Tuple[str, ...] = ('static',)) -> Set[str]:
+        """Return the external packages imported by a set of modules."""
+        return {package for path in modules for kind, package in self.externals.get(path, ())
+                if kind in kinds}
+
+    def size_of(self, modules: Set[str]) -> int:
+        """Total source bytes of a set of modules."""
+        return sum(self.files[path]['size'] for path in modules if path in self.files)
+
+def _source_files(project_dir: str, source_dir: str) -> Dict[str, os.stat_result]:
+    """Return project-relative source paths under source_dir with their stat results."""
+    found: Dict[str, os.stat_result] = {}
+    stack = [os.path.join(project_dir, source_dir)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != 'node_modules':
+                            stack.append(entry.path)
+                    elif entry.name.endswith(SOURCE_EXTENSIONS) and not entry.name.endswith('.d.ts'):
+                        found[os.path.relpath(entry.path, project_dir)] = entry.stat()
+        except OSError:
+            continue
+    return found
+
+def _parse_file(project_dir: str, path: str) -> Tuple[str, List[Tuple[str, str]]]:
+    full = os.path.join(project_dir, path)
+    with span(f"read {path}", 'io'):
+        digest = hash_bytes(file_snapshot.read_bytes(full))
+        text = file_snapshot.read_text(full, errors='ignore')
+    with span(f"tokenize {path}", 'parse'):
+        return digest, scan_imports(text)
+
+def build_import_graph(project_dir: str, source_dir: str = 'src', use_cache: bool = True,
+                       jobs: int = 8) -> ImportGraph:
+    """
+    Build the import graph of a project, re-tokenizing only files whose
+    mtime/size (and then content hash) changed since the cached graph.
+    """
+    graph = ImportGraph(project_dir, load_aliases(project_dir))
+    cache_path = os.path.join(project_dir, CACHE_DIR, GRAPH_CACHE_NAME)
+    cached: Dict[str, Any] = {}
+    if use_cache:
+        try:
+            with open(cache_path, 'r') as file:
+                data = json.load(file)
+            if data.get('version') == GRAPH_CACHE_VERSION:
+                cached = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    sources = _source_files(project_dir, source_dir)
+    stale = []
+    for path, stat in sources.items():
+        entry = cached.get(path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            graph.files[path] = entry
+        else:
+            stale.append(path)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for path, (digest, imports) in zip(stale, executor.map(
+                carry(lambda path: _parse_file(project_dir, path)), stale)):
+            stat = sources[path]
+            previous = cached.get(path)
+            if previous and previous.get('hash') == digest:
+                imports = [tuple(item) for item in previous['imports']]
+            else:
+                graph.reparsed += 1
+            graph.files[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                 'hash': digest, 'imports': [list(item) for item in imports]}
+
+    if use_cache and (stale or set(cached) != set(graph.files)):
+        directory = os.path.dirname(cache_path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump({'version': GRAPH_CACHE_VERSION, 'files': graph.files}, file)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    graph.link()
+    return graph
+
+def shared_import_graph(project_dir: str, source_dir: str = 'src', use_cache: bool = True,
+                        jobs: int = 8) -> ImportGraph:
+    """
+    Build the import graph once per file snapshot; the dependency and route
+    checks both read it and may ask for it at the same time.
+    """
+    return file_snapshot.memoized(project_dir, ('import_graph', source_dir, use_cache),
+                                  lambda: build_import_graph(project_dir, source_dir, use_cache, jobs))
+
+def find_lazy_routes(project_dir: str, graph: ImportGraph,
+                     app_file: str = os.path.join('src', 'App.tsx')) -> Dict[str, str]:
+    """Map each lazy(() => import("...")) component in App.tsx to its module."""
+    try:
+        content = file_snapshot.read_text(os.path.join(project_dir, app_file))
+    except OSError:
+        return {}
+    routes: Dict[str, str] = {}
+    # Matched on the stripped text so commented-out routes are not counted
+    pattern = re.compile(
+        r'(?:const|let|var) ([\w$]+) = (?:React \. )?lazy \( (?:async )?\( \) = > import \( ("(?:[^"\\]|\\.)*") \)')
+    for match in pattern.finditer(stripped_text(content)):
+        where, target = graph.resolve(app_file, json.loads(match.group(2)))
+        if where == 'internal' and target:
+            routes[match.group(1)] = target
+    return routes
+
+def route_report(graph: ImportGraph, routes: Dict[str, str],
+                 entry: str = os.path.join('src', 'main.tsx')) -> List[Dict[str, Any]]:
+    """
+    Describe what each chunk pulls in: the entry chunk first, then each lazy
+    route beyond what the entry already loads, with its own modules, source
+    bytes and the heavy libraries it reaches.
+    """
+    entry_modules = graph.reachable(entry) if entry in graph.files else set()
+    entry_packages = graph.packages_of(entry_modules)
+    chunks = [('entry', entry, entry_modules, entry_packages)]
+    for name, module in sorted(routes.items()):
+        modules = graph.reachable(module) - entry_modules
+        chunks.append((name, module, modules, graph.packages_of(modules) - entry_packages))
+
+    return [{
+        'route': name,
+        'module': module,
+        'modules': len(modules),
+        'source_bytes': graph.size_of(modules),
+        'packages': sorted(packages),
+        'heavy': sorted(package for package in packages if package in HEAVY_LIBRARIES),
+    } for name, module, modules, packages in chunks]
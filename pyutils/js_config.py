@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+JS/TS Config Extractor
+
+Reads the object-literal structure of JavaScript/TypeScript config files
+(vite.config.ts, tailwind.config.js, ...) without evaluating them. A single
+linear tokenizer drops comments and keeps strings, template literals and
+regex literals as opaque tokens, so text inside them can never be mistaken for
+configuration. A small recursive-descent pass then rebuilds the exported
+config: object literals become dicts, array literals lists, strings, numbers
+and booleans Python values, and anything else (calls, arrow functions,
+identifiers) an Expression that keeps its source text, and for calls the
+callee and parsed arguments. ``export default``, ``module.exports =``,
+``defineConfig(...)`` wrappers, arrow-function configs, ``satisfies``/``as``
+suffixes and configs bound to a top-level const are all unwrapped.
+
+Every token is visited a bounded number of times and inputs are capped at
+MAX_CONFIG_BYTES, so the cost stays bounded however large or machine-generated
+a config file is.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Config files beyond this size are only read up to it
+MAX_CONFIG_BYTES = 1 << 20
+
+# Deeper nesting is kept as an opaque Expression instead of being recursed into
+MAX_DEPTH = 64
+
+# Each alternative starts with a distinct character class and none of the
+# repetitions can match the same text in two ways, so matching never backtracks.
+# Regex literals are scanned by hand in _regex_literal_end instead.
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*(?:\*/)?)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<template>`(?:[^`\\]|\\.)*`?)
+  | (?P<number>0[xXoObB][0-9a-fA-F_]+n?|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>\.\.\.|=>|[{}\[\]();,:?.=])
+  | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+
+_REGEX_FLAGS = re.compile(r'[A-Za-z]*')
+
+# A "/" after one of these starts a regex literal rather than a division
+_REGEX_PRECEDERS = {'(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';', '=>', 'return'}
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+_CLOSERS = {'(': ')', '[': ']', '{': '}'}
+_TERMINATORS = {',', ';', ')', ']', '}'}
+_KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+# Starting a new line with one of these ends a statement without a semicolon
+_STATEMENT_STARTS = {'export', 'import', 'const', 'let', 'var', 'module', 'function', 'class'}
+
+class Token:
+    __slots__ = ('kind', 'value', 'start', 'end')
+
+    def __init__(self, kind: str, value: str, start: int, end: int) -> None:
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+
+class Expression:
+    """
+    A value that is not a plain literal. ``callee`` is the dotted name of a
+    call such as react() or path.resolve(...), with ``arguments`` parsed;
+    ``body`` is the value an arrow function returns, when it is an expression.
+    """
+
+    __slots__ = ('source', 'callee', 'arguments', 'body')
+
+    def __init__(self, source: str, callee: Optional[str] = None,
+                 arguments: Optional[List[Any]] = None, body: Any = None) -> None:
+        self.source = source
+        self.callee = callee
+        self.arguments = arguments or []
+        self.body = body
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+class ConfigFile:
+    """The parsed exported config plus the names it imports."""
+
+    def __init__(self, value: Optional[Dict[str, Any]], imports: Dict[str, str],
+                 bindings: Dict[str, Any]) -> None:
+        self.value = value
+        # local name -> module specifier, from import statements and require() calls
+        self.imports = imports
+        self.bindings = bindings
+
+def _unquote(literal: str) -> str:
+    body = literal[1:-1] if len(literal) > 1 and literal[-1] == literal[0] else literal[1:]
+    if '\\' not in body:
+        return body
+    out = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == '\\' and i + 1 < len(body):
+            nxt = body[i + 1]
+            out.append(_ESCAPES.get(nxt, '' if nxt == '\n' else nxt))
+            i += 2
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+def _regex_literal_end(text: str, pos: int, dead: Set[int]) -> Optional[int]:
+    """
+    Return the end of the regex literal starting with the "/" at pos, or None
+    if there is none. One pass over the characters, tracking whether the scan
+    is inside a [...] class (where "/" does not close the literal); a newline
+    or the end of the text before the closing "/" or "]" means no literal.
+
+    ``dead`` collects the (position, inside a class) states a failed scan
+    passed through. A later scan reaching one of them would fail the same
+    way, so it stops there, and a line full of unclosed "/[" stays linear.
+    """
+    length = len(text)
+    i = pos + 1
+    in_class = False
+    visited: List[int] = []
+    while i < length:
+        char = text[i]
+        state = 2 * i + in_class
+        if state in dead:
+            break
+        visited.append(state)
+        if char == '\n':
+            break
+        if char == '\\':
+            if i + 1 >= length or text[i + 1] == '\n':
+                break
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '/':
+            if i == pos + 1:
+                # "//" starts a comment, not an empty regex
+                return None
+            return _REGEX_FLAGS.match(text, i + 1).end()
+        i += 1
+    dead.update(visited)
+    return None
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Yield the significant tokens of JS/TS source; comments and whitespace are dropped."""
+    pos = 0
+    previous = ''
+    length = len(text)
+    dead: Set[int] = set()
+    while pos < length:
+        if text[pos] == '/' and previous in _REGEX_PRECEDERS:
+            end = _regex_literal_end(text, pos, dead)
+            if end is not None:
+                yield Token('regex', text[pos:end], pos, end)
+                previous = 'regex'
+                pos = end
+                continue
+        match = _TOKEN.match(text, pos)
+        kind = match.lastgroup
+        if kind not in ('space', 'comment'):
+            value = match.group()
+            if kind in ('string', 'template'):
+                value = _unquote(value)
+            yield Token(kind, value, pos, match.end())
+            previous = value if kind in ('punct', 'other', 'name') else kind
+        pos = match.end()
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens = list(tokenize(text))
+        self.count = len(self.tokens)
+
+    def _is(self, i: int, value: str) -> bool:
+        return i < self.count and self.tokens[i].kind in ('punct', 'name') \
+            and self.tokens[i].value == value
+
+    def _ends(self, i: int) -> bool:
+        """Return True if the token at i ends the current expression."""
+        if i >= self.count:
+            return True
+        token = self.tokens[i]
+        if token.kind == 'punct':
+            return token.value in _TERMINATORS
+        return token.kind == 'name' and token.value in _STATEMENT_STARTS and i > 0 \
+            and '\n' in self.text[self.tokens[i - 1].end:token.start]
+
+    def _skip_balanced(self, i: int) -> int:
+        """Return the index after the bracket group opening at i."""
+        stack = [_CLOSERS[self.tokens[i].value]]
+        i += 1
+        while i < self.count and stack:
+            token = self.tokens[i]
+            if token.kind == 'punct':
+                if token.value in _CLOSERS:
+                    stack.append(_CLOSERS[token.value])
+                elif token.value == stack[-1]:
+                    stack.pop()
+                elif token.value in (')', ']', '}'):
+                    # Unbalanced input: stop at the stray closer
+                    return i
+            i += 1
+        return i
+
+    def _skip_expression(self, i: int) -> int:
+        """Return the index of the terminator ending the expression at i."""
+        while not self._ends(i):
+            if self.tokens[i].kind == 'punct' and self.tokens[i].value in _CLOSERS:
+                i = self._skip_balanced(i)
+                continue
+            i += 1
+        return i
+
+    def _source(self, start: int, end: int) -> str:
+        end = min(end, self.count)
+        if start >= end:
+            return ''
+        return self.text[self.tokens[start].start:self.tokens[end - 1].end]
+
+    def value(self, i: int, depth: int = 0) -> Tuple[Any, int]:
+        """Parse the value starting at token i; return it and the index after it."""
+        if i >= self.count:
+            return None, i
+        token = self.tokens[i]
+        if depth > MAX_DEPTH:
+            end = self._skip_expression(i)
+            return Expression(self._source(i, end)), end
+
+        result: Any
+        literal = True
+        if token.kind == 'punct' and token.value == '{':
+            result, j = self._object(i, depth)
+        elif token.kind == 'punct' and token.value == '[':
+            result, j = self._array(i, depth)
+        elif token.kind in ('string', 'template') and '${' not in token.value:
+            result, j = token.value, i + 1
+        elif token.kind == 'number':
+            result, j = self._number(token.value), i + 1
+        elif token.kind == 'name' and token.value in _KEYWORDS:
+            result, j = _KEYWORDS[token.value], i + 1
+        else:
+            literal = False
+            result, j = self._expression(i, depth)
+
+        if literal and j < self.count and self.tokens[j].kind == 'name' \
+                and self.tokens[j].value in ('as', 'satisfies'):
+            # TypeScript annotations after a literal do not change its value
+            j = self._skip_expression(j)
+        elif literal and not self._ends(j):
+            # The literal is only part of a larger expression, e.g. [...].concat(x)
+            end = self._skip_expression(j)
+            return Expression(self._source(i, end)), end
+        return result, j
+
+    @staticmethod
+    def _number(literal: str) -> Any:
+        literal = literal.replace('_', '').rstrip('n')
+        try:
+            return int(literal, 0)
+        except ValueError:
+            try:
+                return float(literal)
+            except ValueError:
+                return literal
+
+    def _object(self, i: int, depth: int) -> Tuple[Dict[str, Any], int]:
+        result: Dict[str, Any] = {}
+        i += 1
+        while i < self.count and not self._is(i, '}'):
+            token = self.tokens[i]
+            if self._is(i, ','):
+                i += 1
+                continue
+            if self._is(i, '...'):
+                # Spread members cannot be resolved statically
+                i = self._skip_expression(i + 1)
+                continue
+            if token.kind == 'punct' and token.value == '[':
+                key = None
+                i = self._skip_balanced(i)
+            elif token.kind in ('name', 'string', 'number'):
+                key = token.value
+                i += 1
+                # get/set/async method prefixes
+                if key in ('get', 'set', 'async') and i < self.count \
+                        and self.tokens[i].kind in ('name', 'string'):
+                    key = self.tokens[i].value
+                    i += 1
+            else:
+                i = max(self._skip_expression(i), i + 1)
+                continue
+
+            if self._is(i, ':'):
+                value, i = self.value(i + 1, depth + 1)
+            elif self._is(i, '('):
+                # Method shorthand: key(args) { body }
+                start = i
+                i = self._skip_balanced(i)
+                if self._is(i, '{'):
+                    i = self._skip_balanced(i)
+                value = Expression(f"{key}{self._source(start, i)}")
+            else:
+                # Shorthand property: { react }
+                value = Expression(key if key is not None else '')
+            if key is not None:
+                result[key] = value
+            if not self._is(i, '}'):
+                i = max(self._skip_expression(i), i + 1)
+        return result, i + 1
+
+    def _array(self, i: int, depth: int) -> Tuple[List[Any], int]:
+        result: List[Any] = []
+        i += 1
+        while i < self.count and not self._is(i, ']'):
+            if self._is(i, ','):
+                i += 1
+                continue
+            value, i = self.value(i, depth + 1)
+            result.append(value)
+            if not self._is(i, ']') and not self._is(i, ','):
+                i = max(self._skip_expression(i), i + 1)
+        return result, i + 1
+
+    def _expression(self, i: int, depth: int) -> Tuple[Expression, int]:
+        start = i
+        if self._is(i, 'new') or self._is(i, 'await'):
+            i += 1
+        # Dotted callee: name(.name)*(
+        callee_start = i
+        while i < self.count and self.tokens[i].kind == 'name':
+            if self._is(i + 1, '.') and i + 2 < self.count and self.tokens[i + 2].kind == 'name':
+                i += 2
+                continue
+            break
+        if i < self.count and self.tokens[i].kind == 'name' and self._is(i + 1, '('):
+            callee = ''.join(token.value for token in self.tokens[callee_start:i + 1])
+            arguments, i = self._arguments(i + 1, depth)
+            end = self._skip_expression(i)
+            return Expression(self._source(start, end), callee, arguments), end
+
+        # Arrow function: (params) => body or name => body
+        i = start
+        if self._is(i, 'async'):
+            i += 1
+        if self._is(i, '('):
+            i = self._skip_balanced(i)
+        elif i < self.count and self.tokens[i].kind == 'name':
+            i += 1
+        if self._is(i, '=>'):
+            body_start = i + 1
+            body = None
+            end = body_start
+            if self._is(body_start, '('):
+                body, end = self.value(body_start + 1, depth + 1)
+            end = self._skip_expression(end + 1 if self._is(end, ')') else end)
+            return Expression(self._source(start, end), body=body), end
+
+        end = self._skip_expression(start)
+        if end == start:
+            end = start + 1
+        return Expression(self._source(start, end)), end
+
+    def _arguments(self, i: int, depth: int) -> Tuple[List[Any], int]:
+        """Parse call arguments from the "(" at i; return them and the index after ")"."""
+        arguments: List[Any] = []
+        i += 1
+        while i < self.count and not self._is(i, ')'):
+            if self._is(i, ','):
+                i += 1
+                continue
+            value, i = self.value(i, depth + 1)
+            arguments.append(value)
+            if not self._is(i, ')') and not self._is(i, ','):
+                i = self._skip_expression(i)
+                if i < self.count and not self._is(i, ')') and not self._is(i, ','):
+                    break
+        return arguments, i + 1
+
+    def module(self) -> ConfigFile:
+        """Scan top-level statements for imports, bindings and the exported config."""
+        imports: Dict[str, str] = {}
+        bindings: Dict[str, Any] = {}
+        exported: Any = None
+        i = 0
+        while i < self.count:
+            token = self.tokens[i]
+            if token.kind == 'punct' and token.value in _CLOSERS:
+                i = self._skip_balanced(i)
+                continue
+            if token.kind != 'name' or (i > 0 and self._is(i - 1, '.')):
+                i += 1
+                continue
+            if token.value == 'import' and not self._is(i + 1, '('):
+                i = self._import(i + 1, imports)
+            elif token.value in ('const', 'let', 'var') and i + 2 < self.count \
+                    and self.tokens[i + 1].kind == 'name':
+                name = self.tokens[i + 1].value
+                j = i + 2
+                if self._is(j, ':'):
+                    # Type annotation: const config: UserConfig = {...}
+                    while j < self.count and not self._is(j, '=') and not self._is(j, ';'):
+                        j += 1
+                if self._is(j, '='):
+                    value, i = self.value(j + 1)
+                    bindings[name] = value
+                    if isinstance(value, Expression) and value.callee == 'require' \
+                            and value.arguments and isinstance(value.arguments[0], str):
+                        imports[name] = value.arguments[0]
+                else:
+                    i = j
+            elif token.value == 'export' and self._is(i + 1, 'default'):
+                exported, i = self.value(i + 2)
+            elif token.value == 'module' and self._is(i + 1, '.') and self._is(i + 2, 'exports') \
+                    and self._is(i + 3, '='):
+                exported, i = self.value(i + 4)
+            else:
+                i += 1
+        return ConfigFile(self._config_object(exported, bindings), imports, bindings)
+
+    def _import(self, i: int, imports: Dict[str, str]) -> int:
+        """Record the local names bound by an import clause starting at i."""
+        names: List[str] = []
+        start = i
+        while i < self.count and not self._is(i, ';'):
+            token = self.tokens[i]
+            if token.kind == 'string':
+                if self._is(i - 1, 'from') or i == start:
+                    for name in names:
+                        imports[name] = token.value
+                return i + 1
+            if token.kind == 'name':
+                if self._is(i + 1, 'as'):
+                    i += 2
+                    continue
+                if token.value not in ('type', 'from', 'as'):
+                    names.append(token.value)
+            elif not (token.kind == 'punct' and token.value in ('{', '}', ',')) \
+                    and token.value != '*':
+                return i
+            i += 1
+        return i
+
+    def _config_object(self, value: Any, bindings: Dict[str, Any],
+                       hops: int = 0) -> Optional[Dict[str, Any]]:
+        """Unwrap defineConfig(...), arrow functions and const references to the config dict."""
+        if hops > 8:
+            return None
+        if isinstance(value, dict):
+            return value
+        if not isinstance(value, Expression):
+            return None
+        if value.body is not None:
+            return self._config_object(value.body, bindings, hops + 1)
+        if value.callee is not None:
+            for argument in value.arguments:
+                found = self._config_object(argument, bindings, hops + 1)
+                if found is not None:
+                    return found
+            return None
+        if value.source in bindings:
+            return self._config_object(bindings[value.source], bindings, hops + 1)
+        return None
+
+def parse_config(text: str) -> ConfigFile:
+    """Parse the source of a JS/TS config file."""
+    return _Parser(text[:MAX_CONFIG_BYTES]).module()
+
+def lookup(config: Optional[Dict[str, Any]], *keys: str) -> Any:
+    """Follow nested object keys, e.g. lookup(config, 'build', 'rollupOptions'); None if absent."""
+    node: Any = config
+    for key in keys:
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+def plugin_modules(config_file: ConfigFile, plugins: Any) -> List[str]:
+    """
+    Return the module each entry of a plugins array comes from: react() with
+    ``import react from '@vitejs/plugin-react'`` gives '@vitejs/plugin-react'.
+    Inline require('x') calls give 'x'; unresolved calls give the callee name.
+    """
+    modules: List[str] = []
+    for plugin in plugins if isinstance(plugins, list) else []:
+        if not isinstance(plugin, Expression) or plugin.source.startswith('...'):
+            continue
+        if plugin.callee == 'require' and plugin.arguments and isinstance(plugin.arguments[0], str):
+            modules.append(plugin.arguments[0])
+        elif plugin.callee is not None:
+            root = plugin.callee.split('.')[0]
+            modules.append(config_file.imports.get(root, plugin.callee))
+        else:
+            modules.append(config_file.imports.get(plugin.source, plugin.source))
+    return modules
+
+def _path_argument(value: Any) -> Optional[str]:
+    """The directory a path expression points at, e.g. path.resolve(__dirname, './src')."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Expression):
+        strings = [argument for argument in value.arguments if isinstance(argument, str)]
+        if strings:
+            return strings[-1]
+        for argument in value.arguments:
+            found = _path_argument(argument)
+            if found is not None:
+                return found
+    return None
+
+def alias_map(alias: Any) -> Dict[str, str]:
+    """
+    Return find -> replacement for a Vite resolve.alias value, in either the
+    object form ({'@': path.resolve(__dirname, './src')}) or the array form
+    ([{find: '@', replacement: ...}]).
+    """
+    aliases: Dict[str, str] = {}
+    if isinstance(alias, dict):
+        for find, replacement in alias.items():
+            target = _path_argument(replacement)
+            if target is not None:
+                aliases[find] = target
+    elif isinstance(alias, list):
+        for entry in alias:
+            if isinstance(entry, dict) and isinstance(entry.get('find'), str):
+                target = _path_argument(entry.get('replacement'))
+                if target is not None:
+                    aliases[entry['find']] = target
+    return aliases
+
+def string_values(value: Any) -> List[str]:
+    """Return the string literals of an array (or a lone string), e.g. Tailwind content globs."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
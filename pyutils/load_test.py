@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Preview Load Test
+
+Measures how the production build behaves when served: requests the routes
+declared in src/config/navigation.ts (optionally with the scripts,
+stylesheets and preloads index.html references) over keep-alive HTTP/1.1
+connections and reports p50/p90/p99 latency per route and overall, plus
+requests and bytes per second.
+
+Without --url the preview server (``python -m pyutils serve``) is started
+on a free local port for the duration of the run, so the whole measurement
+works offline. Latency is time to the last byte of the body as seen by an
+asyncio client on the same machine; compare runs against each other rather
+than against production numbers.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+
+NAVIGATION_FILE = os.path.join('src', 'config', 'navigation.ts')
+
+# Assets the browser fetches before first render
+_INITIAL_ASSET = re.compile(
+    r'<(?:script[^>]*\bsrc|link[^>]*\brel=["\']?(?:stylesheet|modulepreload|preload)["\']?[^>]*\bhref'
+    r'|link[^>]*\bhref(?=[^>]*\brel=["\']?(?:stylesheet|modulepreload|preload)))'
+    r'=["\']?([^"\'\s>]+)', re.IGNORECASE)
+
+SERVER_START_SECONDS = 10.0
+REQUEST_TIMEOUT_SECONDS = 10.0
+
+def navigation_routes(project_dir: str) -> List[str]:
+    """Return the href of every entry in the navigation arrays, in file order."""
+    from .js_config import parse_config
+
+    path = os.path.join(project_dir, NAVIGATION_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as file:
+            config_file = parse_config(file.read())
+    except OSError:
+        return []
+    routes: List[str] = []
+    for value in config_file.bindings.values():
+        for entry in value if isinstance(value, list) else []:
+            href = entry.get('href') if isinstance(entry, dict) else None
+            if isinstance(href, str) and href.startswith('/') and href not in routes:
+                routes.append(href)
+    return routes
+
+def initial_assets(dist_dir: str) -> List[str]:
+    """Return the same-origin scripts and stylesheets dist/index.html loads."""
+    try:
+        with open(os.path.join(dist_dir, 'index.html'), 'r', encoding='utf-8', errors='replace') as file:
+            html = file.read()
+    except OSError:
+        return []
+    assets: List[str] = []
+    for url in _INITIAL_ASSET.findall(html):
+        if url.startswith('/') and not url.startswith('//') and url not in assets:
+            assets.append(url)
+    return assets
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int, encoding: Optional[str]) -> None:
+        self.host = host
+        self.port = port
+        self.encoding = encoding
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, path: str) -> Tuple[int, int]:
+        """Send a GET and read the full response; return (status, body bytes)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", 'User-Agent: pyutils-loadtest']
+        if self.encoding:
+            lines.append(f"Accept-Encoding: {self.encoding}")
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split(' ')[1])
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'content-length' in headers:
+            length = int(headers['content-length'])
+            await self.reader.readexactly(length)
+        else:
+            length = len(await self.reader.read())
+        if headers.get('connection', '').lower() == 'close' or 'content-length' not in headers:
+            self.close()
+        return status, length
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+async def run_load(host: str, port: int, paths: List[str], concurrency: int,
+                   duration: Optional[float], total: Optional[int],
+                   encoding: Optional[str]) -> Dict[str, Any]:
+    """
+    Request the paths round-robin from `concurrency` connections until
+    `duration` seconds pass or `total` requests complete.
+    """
+    samples: Dict[str, List[float]] = {path: [] for path in paths}
+    statuses: Dict[int, int] = {}
+    errors: Dict[str, int] = {}
+    counters = {'issued': 0, 'bytes': 0}
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker(offset: int) -> None:
+        connection = Connection(host, port, encoding)
+        index = offset
+        try:
+            while True:
+                if total is not None and counters['issued'] >= total:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                counters['issued'] += 1
+                path = paths[index % len(paths)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    status, size = await asyncio.wait_for(connection.request(path), REQUEST_TIMEOUT_SECONDS)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError) as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                    connection.close()
+                    continue
+                samples[path].append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+                counters['bytes'] += size
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def summary(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        return {'requests': len(ordered),
+                'p50_ms': percentile(ordered, 0.50) * 1000,
+                'p90_ms': percentile(ordered, 0.90) * 1000,
+                'p99_ms': percentile(ordered, 0.99) * 1000,
+                'max_ms': (ordered[-1] if ordered else 0.0) * 1000}
+
+    everything = [value for values in samples.values() for value in values]
+    return {
+        'concurrency': concurrency,
+        'elapsed_s': elapsed,
+        'requests': len(everything),
+        'requests_per_s': len(everything) / elapsed if elapsed else 0.0,
+        'bytes': counters['bytes'],
+        'bytes_per_s': counters['bytes'] / elapsed if elapsed else 0.0,
+        'statuses': statuses,
+        'errors': errors,
+        'overall': summary(everything),
+        'routes': {path: summary(values) for path, values in samples.items()},
+    }
+
+async def start_preview(dist: str) -> Tuple[asyncio.subprocess.Process, str, int]:
+    """Start ``python -m pyutils serve`` on a free port; return (process, host, port)."""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-m', 'pyutils', 'serve', '--port', '0', '--quiet', '--dist', dist,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, env=env)
+    try:
+        while True:
+            line = await asyncio.wait_for(process.stdout.readline(), SERVER_START_SECONDS)
+            if not line:
+                raise RuntimeError("preview server exited before listening")
+            match = re.search(rb'http://([^:/\s]+):(\d+)/', line)
+            if match:
+                return process, match.group(1).decode(), int(match.group(2))
+    except (asyncio.TimeoutError, RuntimeError):
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+        raise
+
+async def load_test(args: argparse.Namespace, paths: List[str]) -> Dict[str, Any]:
+    """Run the load against --url, or against a preview server started for the run."""
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or '127.0.0.1', parts.port or 80
+    else:
+        process, host, port = await start_preview(args.dist)
+    try:
+        # One untimed pass so first-touch costs (page cache, imports) are not measured
+        await run_load(host, port, paths, 1, None, len(paths), args.encoding)
+        report = await run_load(host, port, paths, args.concurrency,
+                                None if args.requests else args.duration, args.requests, args.encoding)
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+    report['target'] = f"http://{host}:{port}"
+    report['encoding'] = args.encoding
+    return report
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the latency table and totals."""
+    print_header("Load Test Results")
+    print_info(f"{report['target']}, {report['concurrency']} connections, "
+               f"Accept-Encoding: {report['encoding'] or 'identity'}")
+    width = max([len(path) for path in report['routes']] + [len('overall')])
+    print(f"  {'route':<{width}}  {'reqs':>7}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+    rows = list(report['routes'].items()) + [('overall', report['overall'])]
+    for path, stats in rows:
+        print(f"  {path:<{width}}  {stats['requests']:>7}  {stats['p50_ms']:>8.2f}  "
+              f"{stats['p90_ms']:>8.2f}  {stats['p99_ms']:>8.2f}  {stats['max_ms']:>8.2f}")
+    print_info(f"Throughput: {report['requests_per_s']:.0f} req/s, "
+               f"{format_size(int(report['bytes_per_s']))}/s over {report['elapsed_s']:.1f} s")
+    statuses = ', '.join(f"{status}: {count}" for status, count in sorted(report['statuses'].items()))
+    failed = sum(count for status, count in report['statuses'].items() if status >= 400)
+    if report['errors']:
+        errors = ', '.join(f"{name}: {count}" for name, count in sorted(report['errors'].items()))
+        print_warning(f"Connection errors: {errors}")
+    if failed:
+        print_warning(f"Responses by status: {statuses}")
+    else:
+        print_success(f"Responses by status: {statuses}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure latency and throughput of the production build for the navigation routes.")
+    parser.add_argument('--url', help="Server to test (default: start 'pyutils serve' on a free port)")
+    parser.add_argument('--dist', default='dist', help="Build output directory (default: %(default)s)")
+    parser.add_argument('--concurrency', '-c', type=int, default=16,
+                        help="Concurrent keep-alive connections (default: %(default)s)")
+    parser.add_argument('--duration', '-d', type=float, default=10.0,
+                        help="Seconds to run (default: %(default)s)")
+    parser.add_argument('--requests', '-n', type=int,
+                        help="Stop after this many requests instead of after --duration")
+    parser.add_argument('--encoding', default='br, gzip',
+                        help="Accept-Encoding to send; '' for identity (default: %(default)s)")
+    parser.add_argument('--with-assets', action='store_true',
+                        help="Also request the scripts and stylesheets index.html loads")
+    parser.add_argument('--routes', nargs='+', metavar='PATH',
+                        help=f"Paths to request instead of the routes in {NAVIGATION_FILE}")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+    project_dir = os.getcwd()
+
+    paths = args.routes or navigation_routes(project_dir)
+    if not paths:
+        print_error(f"No routes found in {NAVIGATION_FILE}; pass them with --routes")
+        sys.exit(1)
+    if args.with_assets:
+        paths += [asset for asset in initial_assets(os.path.join(project_dir, args.dist))
+                  if asset not in paths]
+    if not args.url and not os.path.isdir(os.path.join(project_dir, args.dist)):
+        print_error(f"No {args.dist}/ found; run 'npm run build' first")
+        sys.exit(1)
+    if args.concurrency < 1 or (args.requests is not None and args.requests < 1):
+        print_error("--concurrency and --requests must be at least 1")
+        sys.exit(2)
+
+    try:
+        report = asyncio.run(load_test(args, paths))
+    except (OSError, RuntimeError, asyncio.TimeoutError) as e:
+        print_error(f"Could not run the load test: {e or type(e).__name__}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    if args.json:
+        import json
+
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Lockfile Index
+
+Builds a name -> resolved versions index from package-lock.json or
+pnpm-lock.yaml without loading the whole file. package-lock.json is read in
+fixed-size chunks through a small incremental JSON tokenizer that only
+materializes the scalar values the caller asks for, and pnpm-lock.yaml is read
+line by line, so memory use is bounded by the size of the index rather than
+by the size of the lockfile.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Any
+
+from . import file_snapshot
+from .profiling import span
+
+LOCKFILE_NAMES = ('package-lock.json', 'npm-shrinkwrap.json', 'pnpm-lock.yaml')
+
+CHUNK_SIZE = 1 << 16
+
+_TOKEN = re.compile(r'\s*(?:"((?:[^"\\]|\\.)*)"|([{}\[\]:,])|([^\s{}\[\],:"]+))', re.DOTALL)
+
+class LockfileIndex:
+    """Resolved package versions, queryable by name in O(1)."""
+
+    def __init__(self, path: str, kind: str) -> None:
+        self.path = path
+        self.kind = kind
+        self.lockfile_version: Optional[str] = None
+        self.versions: Dict[str, Set[str]] = {}
+        self.direct: Dict[str, str] = {}
+
+    def add(self, name: str, version: str, direct: bool = False) -> None:
+        """Record a resolved version of a package."""
+        self.versions.setdefault(name, set()).add(version)
+        if direct:
+            self.direct[name] = version
+
+    def versions_of(self, name: str) -> Set[str]:
+        """Return every resolved version of a package."""
+        return self.versions.get(name, set())
+
+    def resolved(self, name: str) -> Optional[str]:
+        """Return the version the project itself resolves for a package."""
+        version = self.direct.get(name)
+        if version is None and len(self.versions.get(name, ())) == 1:
+            version = next(iter(self.versions[name]))
+        return version
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.versions
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+def iter_json_scalars(file: Any, leaf_keys: Optional[Set[str]] = None,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+    """
+    Incrementally tokenize a JSON stream and yield (path, value) for scalars.
+
+    ``path`` holds the object keys and array indices leading to the value.
+    When ``leaf_keys`` is given only scalars stored under one of those keys
+    are yielded, which keeps the per-value overhead down on large files.
+    """
+    path: List[Any] = []
+    containers: List[str] = []
+    expect_key = False
+    buffer = ''
+    eof = False
+
+    while not eof:
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        pos = 0
+        length = len(buffer)
+        while pos < length:
+            match = _TOKEN.match(buffer, pos)
+            if match is None or (match.end() == length and not eof):
+                break
+            pos = match.end()
+            string, punct, literal = match.groups()
+
+            if punct is not None:
+                if punct == '{':
+                    containers.append('o')
+                    path.append(None)
+                    expect_key = True
+                elif punct == '[':
+                    containers.append('a')
+                    path.append(0)
+                elif punct in '}]':
+                    containers.pop()
+                    path.pop()
+                    expect_key = False
+                elif punct == ',':
+                    if containers and containers[-1] == 'a':
+                        path[-1] += 1
+                    else:
+                        expect_key = True
+                continue
+
+            if string is not None:
+                value: Any = json.loads(f'"{string}"') if '\\' in string else string
+                if expect_key:
+                    path[-1] = value
+                    expect_key = False
+                    continue
+            elif literal is not None:
+                value = json.loads(literal)
+            else:
+                # Trailing whitespace only
+                continue
+
+            if leaf_keys is None or (path and path[-1] in leaf_keys):
+                yield tuple(path), value
+        buffer = buffer[pos:]
+
+def parse_package_lock(path: str) -> LockfileIndex:
+    """Index a package-lock.json (lockfileVersion 1, 2 or 3)."""
+    index = LockfileIndex(path, 'npm')
+    with file_snapshot.open_text(path) as file:
+        for key_path, value in iter_json_scalars(file, {'version', 'lockfileVersion'}):
+            if key_path == ('lockfileVersion',):
+                index.lockfile_version = str(value)
+                continue
+            if key_path[-1] != 'version' or not isinstance(value, str) or len(key_path) < 3:
+                continue
+            if key_path[0] == 'packages' and len(key_path) == 3:
+                # v2/v3: "packages": {"node_modules/a/node_modules/b": {"version": ...}}
+                location = key_path[1]
+                if 'node_modules/' not in location:
+                    continue
+                name = location.rsplit('node_modules/', 1)[1]
+                index.add(name, value, direct=location == f'node_modules/{name}')
+            elif key_path[0] == 'dependencies' and key_path[-3] == 'dependencies':
+                # v1: nested "dependencies": {"a": {"version": ..., "dependencies": {...}}}
+                index.add(key_path[-2], value, direct=len(key_path) == 3)
+    return index
+
+def _split_pnpm_key(key: str) -> Optional[Tuple[str, str]]:
+    """Split a pnpm package key such as /@scope/name@1.2.3(peer) into name and version."""
+    key = key.strip().strip('\'"').lstrip('/')
+    key = key.split('(', 1)[0]
+    at = key.rfind('@')
+    if at > 0:
+        return key[:at], key[at + 1:]
+    # pnpm v5 style: name/1.2.3 or @scope/name/1.2.3
+    slash = key.rfind('/')
+    if slash > 0:
+        return key[:slash], key[slash + 1:].split('_', 1)[0]
+    return None
+
+def parse_pnpm_lock(path: str) -> LockfileIndex:
+    """Index a pnpm-lock.yaml (v5, v6 and v9 layouts) line by line."""
+    index = LockfileIndex(path, 'pnpm')
+    section = ''
+    importer = ''
+    dep_group = ''
+    dep_name = ''
+    with file_snapshot.open_text(path) as file:
+        for raw_line in file:
+            line = raw_line.rstrip('\n')
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            indent = len(line) - len(line.lstrip(' '))
+
+            if indent == 0:
+                key, _, value = stripped.partition(':')
+                section = key
+                dep_group = key if key in ('dependencies', 'devDependencies',
+                                           'optionalDependencies') else ''
+                if key == 'lockfileVersion':
+                    index.lockfile_version = value.strip().strip('\'"')
+                continue
+
+            if section in ('packages', 'snapshots'):
+                if indent == 2 and stripped.endswith(':'):
+                    parsed = _split_pnpm_key(stripped[:-1])
+                    if parsed:
+                        index.add(*parsed)
+                continue
+
+            # Direct dependencies: top-level groups (v5/v6) or importers['.'] (v9)
+            if section == 'importers':
+                if indent == 2:
+                    importer = stripped.rstrip(':').strip('\'"')
+                    dep_group = ''
+                    continue
+                if importer != '.':
+                    continue
+                if indent == 4:
+                    dep_group = stripped.rstrip(':')
+                    continue
+                indent -= 4
+            if not dep_group:
+                continue
+            if indent == 2:
+                name, _, value = stripped.partition(':')
+                dep_name = name.strip('\'"')
+                if value.strip():
+                    # v5: "  react: 18.3.1"
+                    index.add(dep_name, value.strip().split('_', 1)[0], direct=True)
+            elif indent == 4 and stripped.startswith('version:') and dep_name:
+                version = stripped.partition(':')[2].strip().strip('\'"').split('(', 1)[0]
+                if not version.startswith('link:'):
+                    index.add(dep_name, version, direct=True)
+    return index
+
+def find_lockfile(project_dir: str) -> Optional[str]:
+    """Return the path of the project's lockfile, if it has one."""
+    for name in LOCKFILE_NAMES:
+        path = os.path.join(project_dir, name)
+        if file_snapshot.is_file(path):
+            return path
+    return None
+
+# Indexes of the most recently used lockfiles; bounded so a --scan over many
+# projects does not keep every index alive
+INDEX_MEMO_SIZE = 4
+_index_lock = threading.Lock()
+_index_memo: OrderedDict[str, Tuple[Tuple[int, int], LockfileIndex]] = OrderedDict()
+
+def load_lockfile_index(project_dir: str) -> Optional[LockfileIndex]:
+    """
+    Return the lockfile index for a project, parsing the lockfile at most once
+    per change so every check in a run can share the same index.
+    """
+    path = find_lockfile(project_dir)
+    if path is None:
+        return None
+    stat = file_snapshot.stat(path)
+    if stat is None:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _index_lock:
+        memo = _index_memo.get(path)
+        if memo is not None and memo[0] == stamp:
+            _index_memo.move_to_end(path)
+            return memo[1]
+        with span(f"parse {os.path.basename(path)}", 'parse'):
+            if path.endswith('.yaml'):
+                index = parse_pnpm_lock(path)
+            else:
+                index = parse_package_lock(path)
+        _index_memo[path] = (stamp, index)
+        _index_memo.move_to_end(path)
+        while len(_index_memo) > INDEX_MEMO_SIZE:
+            _index_memo.popitem(last=False)
+        return index
+
+def parse_version(version: str) -> Optional[Tuple[Any, ...]]:
+    """Parse a semver string into a comparable tuple."""
+    match = re.match(r'^\s*v?(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+\S*)?\s*$', version)
+    if not match:
+        return None
+    major, minor, patch, pre = match.groups()
+    if pre is None:
+        pre_key: Tuple[Any, ...] = (1,)
+    else:
+        pre_key = (0,) + tuple((0, int(p), '') if p.isdigit() else (1, 0, p) for p in pre.split('.'))
+    return (int(major), int(minor), int(patch), pre_key)
+
+def _partial(text: str) -> Tuple[List[int], int]:
+    """Parse a possibly partial version (1, 1.2, 1.x) into its numbers."""
+    text = text.strip().lstrip('v=').split('-', 1)[0].split('+', 1)[0]
+    parts: List[int] = []
+    for part in text.split('.') if text else []:
+        if part in ('x', 'X', '*') or not part.isdigit():
+            break
+        parts.append(int(part))
+    return parts[:3], len(parts[:3])
+
+def _key(parts: List[int]) -> Tuple[Any, ...]:
+    padded = (parts + [0, 0, 0])[:3]
+    return (padded[0], padded[1], padded[2], (0,))
+
+def _next(parts: List[int], depth: int) -> Tuple[Any, ...]:
+    """Lowest version above every version matching the first `depth` numbers."""
+    bumped = parts[:depth]
+    bumped[-1] += 1
+    return _key(bumped)
+
+def _comparators(term: str) -> Optional[List[Tuple[str, Tuple[Any, ...]]]]:
+    """Translate one comparator token into (operator, version) pairs."""
+    match = re.match(r'^(\^|~>?|>=|<=|>|<|=)?\s*(.*)$', term)
+    if not match:
+        return None
+    op, rest = match.group(1) or '', match.group(2)
+    parts, count = _partial(rest)
+    exact = parse_version(rest.lstrip('v='))
+    if count == 0:
+        return [] if op in ('', '=', '>=', '<=', '^', '~', '~>') else None
+    low = exact or _key(parts)
+    if op == '^':
+        first_nonzero = next((i for i, p in enumerate(parts) if p != 0), count - 1)
+        return [('>=', low), ('<', _next(parts, min(first_nonzero + 1, count)))]
+    if op in ('~', '~>'):
+        return [('>=', low), ('<', _next(parts, min(2, count) if count > 1 else 1))]
+    if op in ('', '='):
+        if count == 3:
+            return [('==', low)]
+        return [('>=', low), ('<', _next(parts, count))]
+    if op == '>':
+        return [('>', low)] if count == 3 else [('>=', _next(parts, count))]
+    if op == '<=':
+        return [('<=', low)] if count == 3 else [('<', _next(parts, count))]
+    return [(op, low)]
+
+def satisfies(version: str, spec: str) -> Optional[bool]:
+    """
+    Check a version against an npm semver range.
+
+    Returns None for specs that are not version ranges (tags, git URLs,
+    workspace: / file: / npm: aliases).
+    """
+    parsed = parse_version(version)
+    spec = spec.strip()
+    if parsed is None or re.search(r'[:/#]|^[a-zA-Z]', spec.replace('x', '0').replace('X', '0')):
+        return None
+    for alternative in spec.split('||'):
+        alternative = alternative.strip()
+        hyphen = re.match(r'^(\S+)\s+-\s+(\S+)$', alternative)
+        if hyphen:
+            terms = [f">={hyphen.group(1)}", f"<={hyphen.group(2)}"]
+        else:
+            terms = re.sub(r'(\^|~>?|>=|<=|>|<|=)\s+', r'\1', alternative).split()
+        ok = True
+        # As in npm, a prerelease only matches a set that names a prerelease
+        # of the same major.minor.patch; partial and x-ranges never do
+        prerelease_allowed = len(parsed[3]) == 1
+        for term in terms or ['*']:
+            comparators = _comparators(term)
+            if comparators is None:
+                return None
+            for op, bound in comparators:
+                if not {'==': parsed == bound, '>=': parsed >= bound, '<=': parsed <= bound,
+                        '>': parsed > bound, '<': parsed < bound}[op]:
+                    ok = False
+                # Partial versions get a bare (0,) prerelease key; real tags are longer
+                if len(bound[3]) > 1 and bound[:3] == parsed[:3]:
+                    prerelease_allowed = True
+        if ok and prerelease_allowed:
+            return True
+    return False
+
+def iter_declared(package_data: Dict[str, Any], names: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (name, range) for the given packages declared in package.json."""
+    declared: Dict[str, str] = {}
+    for group in ('devDependencies', 'dependencies'):
+        declared.update(package_data.get(group, {}) or {})
+    for name in names:
+        if name in declared:
+            yield name, declared[name]
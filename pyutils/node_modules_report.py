@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+node_modules Weight Report
+
+Walks an installed node_modules tree (npm, yarn or pnpm layout) with a
+thread pool of os.scandir walkers, records the on-disk size of every
+installed package, resolves each package's dependencies the way Node does
+(nearest node_modules first, then each parent) and sums the transitive
+closure of every direct dependency of the project.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+class InstalledPackage:
+    """A package directory found under node_modules."""
+
+    def __init__(self, path: str, name: str, version: str,
+                 dependencies: List[str], size: int) -> None:
+        self.path = path
+        self.name = name
+        self.version = version
+        self.dependencies = dependencies
+        self.size = size
+
+def disk_usage(path: str) -> int:
+    """Return the on-disk size of a package, excluding nested node_modules."""
+    total = 0
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != 'node_modules':
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            blocks = getattr(stat, 'st_blocks', None)
+                            total += blocks * 512 if blocks is not None else stat.st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+def _read_package(path: str) -> Tuple[Optional[InstalledPackage], List[str]]:
+    """Read one package directory and return it with its nested node_modules dirs."""
+    try:
+        with open(os.path.join(path, 'package.json'), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None, []
+    dependencies: Set[str] = set()
+    for group in ('dependencies', 'optionalDependencies'):
+        dependencies.update((manifest.get(group) or {}).keys())
+    package = InstalledPackage(
+        path=path,
+        name=manifest.get('name') or os.path.basename(path),
+        version=str(manifest.get('version', '0.0.0')),
+        dependencies=sorted(dependencies),
+        size=disk_usage(path),
+    )
+    nested = os.path.join(path, 'node_modules')
+    return package, [nested] if os.path.isdir(nested) else []
+
+def _list_node_modules(directory: str) -> Tuple[List[str], List[str]]:
+    """Split a node_modules directory into package dirs and further node_modules dirs."""
+    packages: List[str] = []
+    more: List[str] = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return packages, more
+    for entry in entries:
+        if entry.name == '.pnpm':
+            # pnpm keeps every real package under .pnpm/<name@version>/node_modules
+            try:
+                more.extend(os.path.join(sub.path, 'node_modules') for sub in os.scandir(entry.path)
+                            if sub.is_dir(follow_symlinks=False) and not sub.name.startswith('.'))
+            except OSError:
+                pass
+        elif entry.name.startswith('.') or entry.is_symlink():
+            continue
+        elif entry.name.startswith('@') and entry.is_dir():
+            try:
+                packages.extend(sub.path for sub in os.scandir(entry.path)
+                                if sub.is_dir(follow_symlinks=False))
+            except OSError:
+                pass
+        elif entry.is_dir():
+            packages.append(entry.path)
+    return packages, more
+
+def scan_node_modules(node_modules: str, jobs: int = 8) -> Dict[str, InstalledPackage]:
+    """Return every installed package under node_modules keyed by its real path."""
+    packages: Dict[str, InstalledPackage] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running = set()
+        pending_dirs = [node_modules]
+        while pending_dirs or running:
+            while pending_dirs:
+                package_dirs, more = _list_node_modules(pending_dirs.pop())
+                pending_dirs.extend(more)
+                running.update(executor.submit(_read_package, path) for path in package_dirs)
+            if not running:
+                break
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                package, nested = future.result()
+                if package is not None:
+                    packages[os.path.realpath(package.path)] = package
+                pending_dirs.extend(nested)
+    return packages
+
+def resolve_package(from_dir: str, name: str) -> Optional[str]:
+    """Resolve a dependency from a directory the way Node's require() does."""
+    directory = os.path.realpath(from_dir)
+    while True:
+        if os.path.basename(directory) != 'node_modules':
+            candidate = os.path.join(directory, 'node_modules', name)
+            if os.path.isfile(os.path.join(candidate, 'package.json')):
+                return os.path.realpath(candidate)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def closure(project_dir: str, name: str, packages: Dict[str, InstalledPackage],
+            memo: Dict[Tuple[str, str], Optional[str]]) -> Set[str]:
+    """Return the real paths of a direct dependency and everything it pulls in."""
+    def resolve(from_dir: str, dep: str) -> Optional[str]:
+        key = (from_dir, dep)
+        if key not in memo:
+            memo[key] = resolve_package(from_dir, dep)
+        return memo[key]
+
+    root = resolve(project_dir, name)
+    seen: Set[str] = set()
+    stack = [root] if root else []
+    while stack:
+        path = stack.pop()
+        if path in seen or path not in packages:
+            continue
+        seen.add(path)
+        for dep in packages[path].dependencies:
+            resolved = resolve(path, dep)
+            if resolved and resolved not in seen:
+                stack.append(resolved)
+    return seen
+
+def build_report(project_dir: str, direct_deps: List[str], jobs: int = 8) -> Optional[Dict[str, Any]]:
+    """
+    Build the dependency weight report for a project.
+
+    Returns None when node_modules does not exist. Otherwise returns a
+    JSON-serializable dict with per-dependency closure sizes, duplicated
+    packages and totals.
+    """
+    node_modules = os.path.join(project_dir, 'node_modules')
+    if not os.path.isdir(node_modules):
+        return None
+    packages = scan_node_modules(node_modules, jobs=jobs)
+
+    memo: Dict[Tuple[str, str], Optional[str]] = {}
+    weights = {}
+    for name in direct_deps:
+        paths = closure(project_dir, name, packages, memo)
+        root = memo.get((project_dir, name))
+        if paths and root in packages:
+            weights[name] = {
+                'size': sum(packages[path].size for path in paths),
+                'own_size': packages[root].size,
+                'packages': len(paths),
+            }
+
+    versions: Dict[str, Set[str]] = {}
+    for package in packages.values():
+        versions.setdefault(package.name, set()).add(package.version)
+    duplicates = {name: sorted(found) for name, found in versions.items() if len(found) > 1}
+
+    return {
+        'total_size': sum(package.size for package in packages.values()),
+        'package_count': len(packages),
+        'weights': weights,
+        'duplicates': duplicates,
+    }
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Image Optimizer
+
+This script produces optimized variants of every raster image in public/:
+resized breakpoints as progressive JPEG, plus WebP and AVIF where a local
+encoder is available (Pillow, ImageMagick, cwebp or avifenc). Images are
+encoded on a process pool, outputs are named after the source content hash and
+the quality so unchanged images are never re-encoded, and a manifest.json with ready-made
+srcset strings is written for the frontend.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .asset_audit import read_image_info
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+from .result_cache import hash_file
+
+RASTER_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+DEFAULT_BREAKPOINTS = (640, 1280, 1920, 2560)
+DEFAULT_OUTPUT_DIR = os.path.join('public', 'optimized')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+
+FORMAT_EXTENSIONS = {'jpeg': '.jpg', 'webp': '.webp', 'avif': '.avif'}
+
+# Names optimize_image gives its outputs: {stem}-{hash[:10]}-q{quality}-{width}{ext}
+GENERATED_NAME = re.compile(r'-[0-9a-f]{10}-q\d+-\d+\.(?:jpg|webp|avif)$')
+
+# Encoders without a resize step; they encode the resized JPEG variant instead
+NON_RESIZING_ENCODERS = ('cwebp', 'avifenc')
+
+def _pillow_formats() -> List[str]:
+    """Return the output formats the installed Pillow can write, if any."""
+    try:
+        from PIL import features
+    except ImportError:
+        return []
+    formats = ['jpeg']
+    if features.check('webp'):
+        formats.append('webp')
+    try:
+        if features.check('avif'):
+            formats.append('avif')
+    except ValueError:
+        # Older Pillow releases do not know about the avif feature
+        pass
+    return formats
+
+def detect_encoders() -> Dict[str, str]:
+    """Pick an encoder for each output format from what is installed locally."""
+    encoders: Dict[str, str] = {}
+    for image_format in _pillow_formats():
+        encoders[image_format] = 'pillow'
+    magick = shutil.which('magick') or shutil.which('convert')
+    if magick:
+        encoders.setdefault('jpeg', 'magick')
+        encoders.setdefault('webp', 'magick')
+    if shutil.which('cwebp'):
+        encoders.setdefault('webp', 'cwebp')
+    if shutil.which('avifenc'):
+        encoders.setdefault('avif', 'avifenc')
+    return encoders
+
+def _encode_pillow(source: str, target: str, image_format: str, width: int, quality: int) -> None:
+    from PIL import Image, ImageOps
+    with Image.open(source) as image:
+        # Match magick's -auto-orient: rotate by the EXIF orientation first
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        if image_format == 'jpeg':
+            image.convert('RGB').save(target, 'JPEG', quality=quality, optimize=True, progressive=True)
+        elif image_format == 'webp':
+            image.save(target, 'WEBP', quality=quality, method=6)
+        else:
+            image.save(target, 'AVIF', quality=quality)
+
+def _encode_magick(source: str, target: str, width: int, quality: int) -> None:
+    magick = shutil.which('magick') or shutil.which('convert')
+    subprocess.run([magick, source, '-auto-orient', '-resize', f'{width}x>', '-strip',
+                    '-interlace', 'Plane', '-quality', str(quality), target],
+                   check=True, capture_output=True)
+
+def encode_variant(source: str, target: str, image_format: str, width: int,
+                   quality: int, encoder: str, jpeg_variant: Optional[str] = None) -> None:
+    """
+    Write one resized variant. cwebp and avifenc cannot resize reliably, so
+    they encode from the already-resized JPEG variant of the same width, or
+    from the source when it is no wider than the variant.
+    """
+    if encoder == 'pillow':
+        _encode_pillow(source, target, image_format, width, quality)
+    elif encoder == 'magick':
+        _encode_magick(source, target, width, quality)
+    elif encoder == 'cwebp':
+        subprocess.run(['cwebp', '-quiet', '-q', str(quality), jpeg_variant or source, '-o', target],
+                       check=True, capture_output=True)
+    elif encoder == 'avifenc':
+        subprocess.run(['avifenc', '--jobs', '1', '-q', str(quality), jpeg_variant or source, target],
+                       check=True, capture_output=True)
+    else:
+        raise ValueError(f"Unknown encoder: {encoder}")
+
+def variant_widths(original_width: Optional[int], breakpoints: Tuple[int, ...]) -> List[int]:
+    """Breakpoints narrower than the original, or the original width alone."""
+    if not original_width:
+        return [breakpoints[0]]
+    widths = [width for width in breakpoints if width < original_width]
+    return widths or [original_width]
+
+def optimize_image(project_dir: str, rel_path: str, digest: str, output_dir: str,
+                   breakpoints: Tuple[int, ...], quality: int,
+                   encoders: Dict[str, str]) -> Dict[str, Any]:
+    """Encode every variant of one image; runs in a worker process."""
+    start = time.perf_counter()
+    source = os.path.join(project_dir, rel_path)
+    info = read_image_info(source)
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    entry: Dict[str, Any] = {
+        'hash': digest,
+        'quality': quality,
+        'encoders': encoders,
+        'width': info.width if info else None,
+        'height': info.height if info else None,
+        'bytes': os.path.getsize(source),
+        'variants': {},
+        'errors': [],
+    }
+    jpeg_variants: Dict[int, str] = {}
+    for image_format in ('jpeg', 'webp', 'avif'):
+        encoder = encoders.get(image_format)
+        if encoder is None:
+            continue
+        variants = []
+        for width in variant_widths(entry['width'], breakpoints):
+            if encoder in NON_RESIZING_ENCODERS and width not in jpeg_variants \
+                    and (entry['width'] is None or entry['width'] > width):
+                # Encoding the full-size source would mislabel it in the srcset
+                continue
+            name = f"{stem}-{digest[:10]}-q{quality}-{width}{FORMAT_EXTENSIONS[image_format]}"
+            target = os.path.join(project_dir, output_dir, name)
+            if not os.path.isfile(target):
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target),
+                                                suffix=FORMAT_EXTENSIONS[image_format])
+                os.close(fd)
+                try:
+                    encode_variant(source, tmp_path, image_format, width, quality, encoder,
+                                   jpeg_variants.get(width))
+                    # mkstemp creates 0600 files; the dev server and hosts need them readable
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, target)
+                except (OSError, ValueError, subprocess.CalledProcessError) as e:
+                    os.unlink(tmp_path)
+                    entry['errors'].append(f"{image_format} {width}w: {str(e)}")
+                    continue
+            if image_format == 'jpeg':
+                jpeg_variants[width] = target
+            variants.append({'width': width, 'path': name, 'bytes': os.path.getsize(target)})
+        if variants:
+            entry['variants'][image_format] = variants
+    entry['seconds'] = time.perf_counter() - start
+    return entry
+
+def find_rasters(project_dir: str, output_dir: str) -> List[str]:
+    """Return project-relative paths of raster images under public/, skipping outputs."""
+    rasters = []
+    output_path = os.path.join(project_dir, output_dir)
+    for root, dirs, files in os.walk(os.path.join(project_dir, 'public')):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != output_path]
+        for file_name in files:
+            if file_name.lower().endswith(RASTER_EXTENSIONS):
+                rasters.append(os.path.relpath(os.path.join(root, file_name), project_dir))
+    return sorted(rasters)
+
+def read_manifest(manifest_path: str) -> Optional[Dict[str, Any]]:
+    """Load a manifest written by this script, of any version, or None."""
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('version'), int) \
+            or not isinstance(manifest.get('images'), dict):
+        return None
+    return manifest
+
+def public_url(output_dir: str, name: str) -> str:
+    """URL under which a file in the output directory is served."""
+    rel = os.path.relpath(os.path.join(output_dir, name), 'public')
+    return '/' + rel.replace(os.sep, '/')
+
+def add_srcsets(entry: Dict[str, Any], output_dir: str) -> None:
+    """Add srcset strings for each format to a manifest entry."""
+    entry['srcset'] = {
+        image_format: ', '.join(f"{public_url(output_dir, v['path'])} {v['width']}w" for v in variants)
+        for image_format, variants in entry['variants'].items()
+    }
+
+def is_fresh(entry: Optional[Dict[str, Any]], digest: str, output_path: str,
+             encoders: Dict[str, str], quality: int) -> bool:
+    """True if a manifest entry already covers this content hash, quality and encoder set."""
+    if not entry or entry.get('hash') != digest or entry.get('errors'):
+        return False
+    if entry.get('quality') != quality or entry.get('encoders') != encoders:
+        return False
+    return all(os.path.isfile(os.path.join(output_path, variant['path']))
+               for variants in entry['variants'].values() for variant in variants)
+
+def recorded_outputs(manifest: Dict[str, Any]) -> Set[str]:
+    """File names of every variant a manifest lists."""
+    names = set()
+    for entry in manifest['images'].values():
+        for variants in entry.get('variants', {}).values():
+            names.update(variant['path'] for variant in variants)
+    return names
+
+def remove_stale_outputs(output_path: str, manifest: Dict[str, Any],
+                         previous: Optional[Dict[str, Any]]) -> int:
+    """
+    Delete generated files no longer referenced by the manifest. Only names
+    the previous manifest recorded or that follow the variant naming scheme
+    are touched, and nothing is pruned unless a previous manifest of ours
+    shows the directory is ours.
+    """
+    if previous is None:
+        return 0
+    keep = recorded_outputs(manifest)
+    recorded = recorded_outputs(previous)
+    removed = 0
+    for name in os.listdir(output_path):
+        if name in keep or (name not in recorded and not GENERATED_NAME.search(name)):
+            continue
+        if os.path.isfile(os.path.join(output_path, name)):
+            os.unlink(os.path.join(output_path, name))
+            removed += 1
+    return removed
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate optimized variants of public/ images.")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: %(default)s)")
+    parser.add_argument('--breakpoints', default=','.join(str(w) for w in DEFAULT_BREAKPOINTS),
+                        help="Comma-separated variant widths (default: %(default)s)")
+    parser.add_argument('--quality', type=int, default=80,
+                        help="Encoder quality, 1-100 (default: %(default)s)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
+                        help="Output directory, relative to the project (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+    breakpoints = tuple(sorted(int(width) for width in args.breakpoints.split(',') if width.strip()))
+
+    print_header("Image Optimizer")
+
+    project_dir = os.getcwd()
+    output_path = os.path.join(project_dir, args.output)
+    manifest_path = os.path.join(output_path, MANIFEST_NAME)
+
+    encoders = detect_encoders()
+    if not encoders:
+        print_error("No image encoder found. Install Pillow (pip install Pillow), "
+                    "ImageMagick, cwebp or avifenc.")
+        sys.exit(1)
+    for image_format in ('jpeg', 'webp', 'avif'):
+        if image_format in encoders:
+            print_success(f"{image_format}: {encoders[image_format]}")
+        else:
+            print_warning(f"{image_format}: no local encoder, skipping")
+    for image_format, encoder in encoders.items():
+        if encoder in NON_RESIZING_ENCODERS and 'jpeg' not in encoders:
+            print_warning(f"{image_format}: {encoder} encodes the resized JPEG variants and there is "
+                          "no JPEG encoder, so only images no wider than a breakpoint get this format")
+
+    rasters = find_rasters(project_dir, args.output)
+    if not rasters:
+        print_info("No raster images found in public/")
+        return
+    previous = read_manifest(manifest_path)
+    if previous is None and os.path.exists(manifest_path):
+        print_error(f"{os.path.relpath(manifest_path, project_dir)} was not written by this script; "
+                    "pass a dedicated --output directory")
+        sys.exit(1)
+    os.makedirs(output_path, exist_ok=True)
+    reusable = previous if previous is not None and previous['version'] == MANIFEST_VERSION else {'images': {}}
+    manifest: Dict[str, Any] = {'version': MANIFEST_VERSION, 'breakpoints': list(breakpoints),
+                                'images': {}}
+
+    print_header("Optimizing Images")
+
+    start = time.perf_counter()
+    pending = {}
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        for rel_path in rasters:
+            key = os.path.relpath(rel_path, 'public').replace(os.sep, '/')
+            digest = hash_file(os.path.join(project_dir, rel_path))
+            entry = reusable['images'].get(key)
+            if is_fresh(entry, digest, output_path, encoders, args.quality) and \
+                    reusable.get('breakpoints') == list(breakpoints):
+                manifest['images'][key] = entry
+                print_info(f"{key}: unchanged, skipped")
+                continue
+            future = executor.submit(optimize_image, project_dir, rel_path, digest, args.output,
+                                     breakpoints, args.quality, encoders)
+            pending[future] = key
+
+        for future in as_completed(pending):
+            key = pending[future]
+            entry = future.result()
+            add_srcsets(entry, args.output)
+            manifest['images'][key] = entry
+            smallest = min((v['bytes'] for variants in entry['variants'].values() for v in variants),
+                           default=entry['bytes'])
+            if entry['errors']:
+                for error in entry['errors']:
+                    print_error(f"{key}: {error}")
+            else:
+                print_success(f"{key}: {format_size(entry['bytes'])} -> "
+                              f"{format_size(smallest)} smallest variant ({entry['seconds']:.1f}s)")
+
+    manifest['images'] = dict(sorted(manifest['images'].items()))
+    with open(manifest_path, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    removed = remove_stale_outputs(output_path, manifest, previous)
+
+    print_header("Summary")
+    print_info(f"{len(pending)} images encoded, {len(rasters) - len(pending)} unchanged, "
+               f"{removed} stale files removed in {time.perf_counter() - start:.1f}s")
+    print_info(f"Manifest written to {os.path.relpath(manifest_path, project_dir)}")
+
+if __name__ == "__main__":
+    main()
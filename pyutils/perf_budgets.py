@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Performance Budgets and History
+
+Collects a handful of per-run metrics from the validator's results (largest
+built chunk, total JS, total image bytes, dependency count and the check run
+time), appends them to a SQLite history under .cache/pyutils/, and evaluates
+each one against two limits:
+
+- the absolute budgets in perf-budgets.json at the project root
+- a rolling baseline: the median of the most recent runs on other commits,
+  one run per commit, with a relative tolerance
+
+Runs of the current commit never count towards its own baseline, so a
+commit that adds a heavy library (echarts, say) fails however often it is
+re-validated. The median only moves once most of the window has seen the new
+value, so one noisy earlier run does not shift it. A deliberate increase is
+accepted by raising the budget file or when it becomes the new normal.
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .console import format_size
+from .result_cache import CACHE_DIR
+
+BUDGET_FILE = 'perf-budgets.json'
+HISTORY_NAME = 'perf-history.sqlite3'
+
+# Runs kept in the history; older ones are pruned as new ones are recorded
+MAX_HISTORY_RUNS = 1000
+
+# metric -> (label, key in the budget file, budget file unit in metric units)
+METRICS = {
+    'max_chunk_bytes': ('largest chunk', 'max_chunk_kb', 1024),
+    'total_js_bytes': ('total JS', 'total_js_kb', 1024),
+    'total_image_bytes': ('total image bytes', 'total_image_kb', 1024),
+    'dependency_count': ('dependencies', 'dependency_count', 1),
+    'check_runtime_ms': ('check run time', 'check_runtime_ms', 1),
+}
+
+DEFAULT_REGRESSION = {
+    'window': 10,
+    'min_runs': 3,
+    'tolerance_pct': 5,
+    # Wall time varies far more between runs than sizes do
+    'tolerance_pct_by_metric': {'check_runtime_ms': 50},
+}
+
+JS_EXTENSIONS = ('.js', '.mjs')
+
+def load_budgets(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Load perf-budgets.json, or None if the project has none; ValueError if it is invalid."""
+    try:
+        with open(os.path.join(project_dir, BUDGET_FILE), 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return None
+    if not isinstance(data, dict):
+        raise ValueError(f"{BUDGET_FILE} must contain a JSON object")
+    budgets = data.get('budgets', {})
+    unknown = sorted(set(budgets) - {key for _label, key, _scale in METRICS.values()})
+    if unknown:
+        raise ValueError(f"unknown budgets in {BUDGET_FILE}: {', '.join(unknown)}")
+    return data
+
+def regression_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The regression section of the budget file merged over the defaults."""
+    settings = dict(DEFAULT_REGRESSION)
+    settings.update((config or {}).get('regression', {}))
+    settings['tolerance_pct_by_metric'] = dict(DEFAULT_REGRESSION['tolerance_pct_by_metric'],
+                                               **settings.get('tolerance_pct_by_metric', {}))
+    return settings
+
+def collect_metrics(results: Dict[str, Any], package_data: Optional[Dict[str, Any]],
+                    wall_time: float) -> Dict[str, Optional[float]]:
+    """Derive the tracked metrics from the check results; None where a check had nothing to measure."""
+    metrics: Dict[str, Optional[float]] = {name: None for name in METRICS}
+    build = results.get('build_output')
+    if build and build.get('chunks'):
+        sizes = [chunk['sizes']['raw'] for chunk in build['chunks']]
+        metrics['max_chunk_bytes'] = max(sizes)
+        metrics['total_js_bytes'] = sum(chunk['sizes']['raw'] for chunk in build['chunks']
+                                        if chunk['file'].endswith(JS_EXTENSIONS))
+    assets = results.get('static_assets')
+    if assets is not None:
+        metrics['total_image_bytes'] = sum(record['bytes'] for record in assets)
+    if package_data is not None:
+        metrics['dependency_count'] = len(package_data.get('dependencies') or {})
+    metrics['check_runtime_ms'] = wall_time * 1000
+    return metrics
+
+def git_commit(project_dir: str) -> Optional[str]:
+    """The HEAD commit of the project's repository, or None outside git."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_dir, capture_output=True,
+                                text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None if result.returncode == 0 else None
+
+class History:
+    """Metric history of one project, one row per validator run."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=5)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at REAL NOT NULL,
+                commit_sha TEXT,
+                warm INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS metrics (
+                run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+                name TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (run_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (name, run_id);
+        """)
+
+    def record(self, metrics: Dict[str, Optional[float]], commit: Optional[str], warm: bool) -> int:
+        """Append one run and prune the oldest beyond MAX_HISTORY_RUNS; return the run id."""
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (recorded_at, commit_sha, warm) VALUES (?, ?, ?)',
+                (time.time(), commit, int(warm)))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)',
+                [(run_id, name, value) for name, value in metrics.items() if value is not None])
+            cutoff = run_id - MAX_HISTORY_RUNS
+            self.connection.execute('DELETE FROM metrics WHERE run_id <= ?', (cutoff,))
+            self.connection.execute('DELETE FROM runs WHERE id <= ?', (cutoff,))
+        return run_id
+
+    def baseline(self, name: str, window: int, before_run: int, commit: Optional[str],
+                 warm: Optional[bool] = None) -> Tuple[Optional[float], int]:
+        """
+        Return (median, runs) of the metric over the latest run of each of the
+        `window` most recent commits other than `commit`. Runs outside git
+        count one each. `warm` restricts the runs to those with (True) or
+        without (False) cached checks.
+        """
+        query = ('SELECT r.commit_sha, m.value FROM metrics m JOIN runs r ON r.id = m.run_id '
+                 'WHERE m.name = ? AND r.id < ?')
+        params: List[Any] = [name, before_run]
+        if commit is not None:
+            query += ' AND (r.commit_sha IS NULL OR r.commit_sha != ?)'
+            params.append(commit)
+        if warm is not None:
+            query += ' AND r.warm = ?'
+            params.append(int(warm))
+        query += ' ORDER BY r.id DESC'
+        values: List[float] = []
+        seen = set()
+        for sha, value in self.connection.execute(query, params):
+            if sha is not None:
+                if sha in seen:
+                    continue
+                seen.add(sha)
+            values.append(value)
+            if len(values) >= window:
+                break
+        return (statistics.median(values) if values else None), len(values)
+
+    def close(self) -> None:
+        self.connection.close()
+
+def evaluate(project_dir: str, metrics: Dict[str, Optional[float]], config: Optional[Dict[str, Any]],
+             warm: bool, record_run: bool = True) -> Dict[str, Any]:
+    """
+    Record the run in the history (unless record_run is False) and compare each
+    metric with its budget and with the rolling baseline.
+    """
+    settings = regression_settings(config)
+    budgets = (config or {}).get('budgets', {})
+    commit = git_commit(project_dir)
+    history = History(os.path.join(project_dir, CACHE_DIR, HISTORY_NAME))
+    try:
+        if record_run:
+            run_id = history.record(metrics, commit, warm)
+        else:
+            run_id = history.connection.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM runs').fetchone()[0]
+        records = []
+        for name, (label, budget_key, scale) in METRICS.items():
+            value = metrics.get(name)
+            if value is None:
+                continue
+            # Only compare run time with runs that replayed the same way from the cache
+            baseline, runs = history.baseline(name, int(settings['window']), run_id, commit,
+                                              warm if name == 'check_runtime_ms' else None)
+            tolerance = settings['tolerance_pct_by_metric'].get(name, settings['tolerance_pct'])
+            entry: Dict[str, Any] = {
+                'metric': name,
+                'label': label,
+                'value': value,
+                'budget': budgets[budget_key] * scale if budget_key in budgets else None,
+                'baseline': baseline,
+                'baseline_runs': runs,
+                'change_pct': (value - baseline) / baseline * 100 if baseline else None,
+                'tolerance_pct': tolerance,
+                'problems': [],
+            }
+            if entry['budget'] is not None and value > entry['budget']:
+                entry['problems'].append(f"over the budget of {format_metric(name, entry['budget'])}")
+            if runs >= settings['min_runs'] and entry['change_pct'] is not None \
+                    and entry['change_pct'] > tolerance:
+                entry['problems'].append(
+                    f"{entry['change_pct']:+.1f}% against the median of {runs} earlier runs "
+                    f"({format_metric(name, baseline)}), beyond the {tolerance:g}% tolerance")
+            records.append(entry)
+    finally:
+        history.close()
+    return {'commit': commit, 'warm': warm, 'recorded': record_run, 'metrics': records,
+            'history': os.path.join(CACHE_DIR, HISTORY_NAME)}
+
+def format_metric(name: str, value: float) -> str:
+    """Format a metric value in its natural unit."""
+    if name.endswith('_bytes'):
+        return format_size(int(value))
+    if name.endswith('_ms'):
+        return f"{value:.0f} ms"
+    return f"{value:g}"
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Build Artifact Precompression
+
+Writes maximum-level compressed siblings next to every compressible file in
+dist/ (gzip level 9 as name.gz and, when the optional brotli package is
+installed, brotli quality 11 as name.br) so the hosting layer, or
+``python -m pyutils serve``, can send them instead of compressing on the fly.
+
+Files are compressed on a process pool. A manifest under .cache/pyutils/
+records the content hash of every source file, so files that did not change
+since the previous run (hashed chunks usually don't) are skipped. The run
+ends with the compression ratio per file type.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+from .result_cache import CACHE_DIR, hash_bytes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Text formats; images, fonts and media are already compressed. Lottie
+# animations imported with ?url end up in dist/assets as .json files.
+COMPRESSIBLE_EXTENSIONS = ('.js', '.mjs', '.css', '.html', '.svg', '.json', '.webmanifest',
+                           '.txt', '.xml', '.wasm')
+SIBLING_EXTENSIONS = {'gzip': '.gz', 'brotli': '.br'}
+
+# Below this, a compressed response saves less than a TCP packet
+DEFAULT_MIN_BYTES = 1024
+
+MANIFEST_NAME = 'precompress.json'
+MANIFEST_VERSION = 1
+
+def find_compressible(dist_dir: str, min_bytes: int) -> List[str]:
+    """Return dist-relative paths of the files worth precompressing."""
+    found = []
+    for root, dirs, files in os.walk(dist_dir):
+        # Vite's .vite/manifest.json is build metadata, never served
+        dirs[:] = sorted(d for d in dirs if d != '.vite')
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, file_name)
+            if os.path.getsize(path) >= min_bytes:
+                found.append(os.path.relpath(path, dist_dir).replace(os.sep, '/'))
+    return found
+
+def _write_atomic(target: str, data: bytes, mode: int) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        # mkstemp creates 0600 files, which a host serving as another user cannot read
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+def _siblings_present(path: str, entry: Dict[str, Any]) -> bool:
+    return all(os.path.isfile(path + SIBLING_EXTENSIONS[encoding])
+               for encoding in ('gzip', 'brotli') if entry.get(encoding) is not None)
+
+def compress_file(dist_dir: str, rel: str, previous: Optional[Dict[str, Any]],
+                  use_brotli: bool) -> Dict[str, Any]:
+    """
+    Write the .gz and .br siblings of one file unless the previous manifest
+    entry already covers its content; runs in a worker process.
+    """
+    start = time.perf_counter()
+    path = os.path.join(dist_dir, rel)
+    with open(path, 'rb') as file:
+        data = file.read()
+        mode = stat.S_IMODE(os.fstat(file.fileno()).st_mode)
+    digest = hash_bytes(data)
+    if previous and previous.get('hash') == digest and previous.get('brotli_enabled') == use_brotli \
+            and _siblings_present(path, previous):
+        return dict(previous, skipped=True, seconds=time.perf_counter() - start)
+
+    entry: Dict[str, Any] = {'hash': digest, 'raw': len(data), 'brotli_enabled': use_brotli,
+                             'gzip': None, 'brotli': None}
+    outputs = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if use_brotli:
+        outputs['brotli'] = brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+    for encoding, compressed in outputs.items():
+        target = path + SIBLING_EXTENSIONS[encoding]
+        # A sibling that is not smaller would only cost the client decode time
+        if len(compressed) < len(data):
+            _write_atomic(target, compressed, mode)
+            entry[encoding] = len(compressed)
+        elif os.path.isfile(target):
+            os.unlink(target)
+    entry['skipped'] = False
+    entry['seconds'] = time.perf_counter() - start
+    return entry
+
+def remove_orphans(dist_dir: str, entries: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Delete .gz/.br files this run did not produce: those whose source is gone,
+    fell below --min-bytes or failed, and those of an encoding that is off
+    (brotli not installed) or did not shrink the file. The preview server
+    would otherwise serve them in place of the current content.
+    """
+    encodings = {suffix: encoding for encoding, suffix in SIBLING_EXTENSIONS.items()}
+    removed = 0
+    for root, _dirs, files in os.walk(dist_dir):
+        for file_name in files:
+            stem, extension = os.path.splitext(file_name)
+            if extension not in encodings or not stem.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            rel = os.path.relpath(os.path.join(root, stem), dist_dir).replace(os.sep, '/')
+            entry = entries.get(rel)
+            if entry is None or entry.get(encodings[extension]) is None:
+                os.unlink(os.path.join(root, file_name))
+                removed += 1
+    return removed
+
+def load_manifest(manifest_path: str, dist: str) -> Dict[str, Any]:
+    """Load the previous run's manifest for this output directory, or an empty one."""
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+        if manifest.get('version') == MANIFEST_VERSION and manifest.get('dist') == dist:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'dist': dist, 'files': {}}
+
+def file_type(rel: str) -> str:
+    """Group key for the per-type summary: the extension, with .mjs counted as .js."""
+    extension = os.path.splitext(rel)[1].lower()
+    return '.js' if extension == '.mjs' else extension
+
+def ratios_by_type(files: Dict[str, Dict[str, Any]], use_brotli: bool) -> Dict[str, Dict[str, Any]]:
+    """Total raw and compressed bytes, and compressed/raw ratios, per file type."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for rel, entry in files.items():
+        row = totals.setdefault(file_type(rel), {'files': 0, 'raw': 0, 'gzip': 0, 'brotli': 0})
+        row['files'] += 1
+        row['raw'] += entry['raw']
+        # A file left without a sibling is served as-is
+        row['gzip'] += entry['gzip'] if entry['gzip'] is not None else entry['raw']
+        row['brotli'] += entry['brotli'] if entry['brotli'] is not None else entry['raw']
+    for row in totals.values():
+        row['gzip_ratio'] = row['gzip'] / row['raw'] if row['raw'] else 1.0
+        row['brotli_ratio'] = row['brotli'] / row['raw'] if row['raw'] else 1.0
+        if not use_brotli:
+            row['brotli'] = row['brotli_ratio'] = None
+    return dict(sorted(totals.items(), key=lambda item: item[1]['raw'], reverse=True))
+
+def print_ratios(totals: Dict[str, Dict[str, Any]], use_brotli: bool) -> None:
+    """Print the per-type table."""
+    print(f"  {'type':<13} {'files':>5}  {'raw':>10}  {'gzip':>10} {'ratio':>6}"
+          + (f"  {'brotli':>10} {'ratio':>6}" if use_brotli else ''))
+    for extension, row in totals.items():
+        line = (f"  {extension:<13} {row['files']:>5}  {format_size(row['raw']):>10}  "
+                f"{format_size(row['gzip']):>10} {row['gzip_ratio']:>6.1%}")
+        if use_brotli:
+            line += f"  {format_size(row['brotli']):>10} {row['brotli_ratio']:>6.1%}"
+        print(line)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Write gzip and brotli siblings for the compressible files in dist/.")
+    parser.add_argument('--dist', default='dist', help="Build output directory (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: %(default)s)")
+    parser.add_argument('--min-bytes', type=int, default=DEFAULT_MIN_BYTES,
+                        help="Leave files smaller than this uncompressed (default: %(default)s)")
+    parser.add_argument('--force', action='store_true',
+                        help="Recompress every file, ignoring the previous run's manifest")
+    parser.add_argument('--verbose', '-v', action='store_true', help="List every file")
+    parser.add_argument('--json', action='store_true', help="Print the per-type report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+    project_dir = os.getcwd()
+    dist_dir = os.path.join(project_dir, args.dist)
+    manifest_path = os.path.join(project_dir, CACHE_DIR, MANIFEST_NAME)
+    use_brotli = brotli is not None
+
+    if not os.path.isdir(dist_dir):
+        print_error(f"No {args.dist}/ found; run 'npm run build' first")
+        sys.exit(1)
+    if not args.json:
+        print_header("Precompressing Build Output")
+        if not use_brotli:
+            print_warning("brotli package not installed (pip install brotli); writing .gz only")
+
+    previous = {} if args.force else load_manifest(manifest_path, args.dist)['files']
+    manifest: Dict[str, Any] = {'version': MANIFEST_VERSION, 'dist': args.dist, 'files': {}}
+    start = time.perf_counter()
+    compressed = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        pending = {executor.submit(compress_file, dist_dir, rel, previous.get(rel), use_brotli): rel
+                   for rel in find_compressible(dist_dir, args.min_bytes)}
+        for future in as_completed(pending):
+            rel = pending[future]
+            try:
+                entry = future.result()
+            except OSError as e:
+                print_error(f"{rel}: {e.strerror or e}")
+                continue
+            compressed += not entry['skipped']
+            manifest['files'][rel] = {key: value for key, value in entry.items()
+                                      if key not in ('skipped', 'seconds')}
+            if args.verbose and not args.json:
+                sizes = ', '.join(f"{encoding} {format_size(entry[encoding])}"
+                                  for encoding in ('gzip', 'brotli') if entry[encoding] is not None)
+                state = 'unchanged' if entry['skipped'] else f"{entry['seconds'] * 1000:.0f} ms"
+                print_info(f"{rel}: {format_size(entry['raw'])} -> {sizes or 'not smaller, left as is'}"
+                           f" ({state})")
+    removed = remove_orphans(dist_dir, manifest['files'])
+
+    manifest['files'] = dict(sorted(manifest['files'].items()))
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w') as file:
+        json.dump(manifest, file, indent=2)
+
+    totals = ratios_by_type(manifest['files'], use_brotli)
+    if args.json:
+        print(json.dumps({'brotli': use_brotli, 'compressed': compressed,
+                          'unchanged': len(manifest['files']) - compressed,
+                          'orphans_removed': removed, 'types': totals}, indent=2))
+        return
+
+    print_header("Compression Ratio by Type")
+    if not totals:
+        print_info(f"No compressible files of {format_size(args.min_bytes)} or more in {args.dist}/")
+        return
+    print_ratios(totals, use_brotli)
+    print_header("Summary")
+    print_info(f"{compressed} files compressed, {len(manifest['files']) - compressed} unchanged, "
+               f"{removed} stale siblings removed in {time.perf_counter() - start:.1f}s")
+    print_success(f"Manifest written to {os.path.relpath(manifest_path, project_dir)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Production Preview Server
+
+Serves the built dist/ tree the way Vercel serves it according to
+vercel.json, so the production build can be tried and measured locally
+without network access:
+
+- ``redirects`` are applied first, then the file system is checked, then
+  ``rewrites`` (the SPA fallback to /index.html included), in Vercel's
+  order, and ``trailingSlash: false`` redirects '/path/' to '/path'
+- every matching ``headers`` rule is applied, later rules overriding earlier
+  ones, so responses carry the configured Cache-Control
+- precompressed ``.br`` and ``.gz`` siblings are served when the client's
+  Accept-Encoding allows them, with Vary and per-encoding ETags, and
+  If-None-Match is answered with 304
+- bodies are written with loop.sendfile(), which uses os.sendfile() on plain
+  sockets, so file contents never pass through Python
+
+The server is a single asyncio event loop with HTTP/1.1 keep-alive.
+"""
+
+import argparse
+import asyncio
+import email.utils
+import mimetypes
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .cache_policy import HOSTING_CONFIG, load_hosting_config, source_to_regex
+from .console import print_error, print_header, print_info
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 4173
+
+# Precompressed siblings, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_SECONDS = 5.0
+
+REASONS = {200: 'OK', 301: 'Moved Permanently', 302: 'Found', 304: 'Not Modified',
+           307: 'Temporary Redirect', 308: 'Permanent Redirect', 400: 'Bad Request',
+           404: 'Not Found', 405: 'Method Not Allowed', 431: 'Request Header Fields Too Large'}
+
+# mimetypes reads the platform tables, which may lack these
+EXTRA_TYPES = {'.js': 'text/javascript', '.mjs': 'text/javascript', '.webp': 'image/webp',
+               '.avif': 'image/avif', '.woff2': 'font/woff2', '.woff': 'font/woff',
+               '.json': 'application/json', '.webmanifest': 'application/manifest+json',
+               '.svg': 'image/svg+xml', '.map': 'application/json', '.wasm': 'application/wasm'}
+
+_SUBSTITUTION = re.compile(r'\$(\d+)|:([A-Za-z_]\w*)[*+]?')
+
+def content_type(path: str) -> str:
+    """Return the Content-Type of a file, with a charset for text."""
+    extension = os.path.splitext(path)[1].lower()
+    mime = EXTRA_TYPES.get(extension) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if mime.startswith('text/') or mime in ('application/json', 'image/svg+xml',
+                                             'application/manifest+json'):
+        mime += '; charset=utf-8'
+    return mime
+
+def accepted_encodings(header: Optional[str]) -> List[str]:
+    """Return the content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = []
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.append(name.strip().lower())
+    return accepted
+
+class Route:
+    """A compiled vercel.json source pattern with its destination or headers."""
+
+    def __init__(self, source: str, destination: Optional[str] = None,
+                 headers: Optional[List[Tuple[str, str]]] = None, status: int = 308) -> None:
+        self.source = source
+        self.regex = source_to_regex(source)
+        self.destination = destination
+        self.headers = headers or []
+        self.status = status
+
+    def match(self, path: str) -> Optional[str]:
+        """Return the destination for a path, with $1 and :name filled in, or None."""
+        match = self.regex.match(path)
+        if match is None:
+            return None
+        if self.destination is None:
+            return ''
+        groups = match.groups()
+        params = match.groupdict()
+
+        def substitute(found: 're.Match[str]') -> str:
+            if found.group(1):
+                index = int(found.group(1)) - 1
+                return groups[index] or '' if 0 <= index < len(groups) else ''
+            return params.get(found.group(2)) or ''
+        return _SUBSTITUTION.sub(substitute, self.destination)
+
+class HostingRules:
+    """The rewrites, redirects and headers of vercel.json."""
+
+    def __init__(self, config: Optional[Dict[str, Any]]) -> None:
+        config = config or {}
+        self.trailing_slash = config.get('trailingSlash')
+        self.redirects: List[Route] = []
+        self.rewrites: List[Route] = []
+        self.headers: List[Route] = []
+        for entry in config.get('redirects', []):
+            if isinstance(entry, dict) and 'source' in entry and 'destination' in entry:
+                status = entry.get('statusCode') or (308 if entry.get('permanent', True) else 307)
+                self._add(self.redirects, entry['source'], entry['destination'], status=status)
+        for entry in config.get('rewrites', []):
+            if isinstance(entry, dict) and 'source' in entry and 'destination' in entry:
+                self._add(self.rewrites, entry['source'], entry['destination'])
+        for entry in config.get('headers', []):
+            if isinstance(entry, dict) and 'source' in entry:
+                pairs = [(str(header['key']), str(header['value'])) for header in entry.get('headers', [])
+                         if isinstance(header, dict) and 'key' in header and 'value' in header]
+                self._add(self.headers, entry['source'], headers=pairs)
+
+    @staticmethod
+    def _add(routes: List[Route], source: str, destination: Optional[str] = None,
+             **kwargs: Any) -> None:
+        """Compile a rule into routes, reporting and skipping an invalid source."""
+        try:
+            routes.append(Route(source, destination, **kwargs))
+        except re.error as e:
+            print_error(f"Invalid source {source!r} in {HOSTING_CONFIG}: {e}", file=HOSTING_CONFIG)
+
+    def headers_for(self, path: str) -> Dict[str, str]:
+        """Return the configured headers of a request path; later rules win."""
+        headers: Dict[str, Tuple[str, str]] = {}
+        for route in self.headers:
+            if route.regex.match(path):
+                for key, value in route.headers:
+                    headers[key.lower()] = (key, value)
+        return dict(headers.values())
+
+class PreviewServer:
+    """Serves one dist/ directory over HTTP/1.1."""
+
+    def __init__(self, dist_dir: str, rules: HostingRules, quiet: bool = False) -> None:
+        self.dist_dir = os.path.abspath(dist_dir)
+        self.rules = rules
+        self.quiet = quiet
+        self.requests = 0
+
+    def _file(self, url_path: str) -> Optional[str]:
+        """Map a URL path to a regular file under dist/, or None."""
+        rel = os.path.normpath(unquote(url_path).lstrip('/'))
+        if rel.startswith('..') or os.path.isabs(rel):
+            return None
+        path = os.path.join(self.dist_dir, rel) if rel != '.' else self.dist_dir
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        return path if os.path.isfile(path) else None
+
+    def resolve(self, path: str) -> Tuple[int, Optional[str], Optional[str]]:
+        """
+        Return (status, file, location) for a request path: redirects first,
+        then the file system, then rewrites, then 404.html, as Vercel routes.
+        """
+        if self.rules.trailing_slash is False and path != '/' and path.endswith('/'):
+            return 308, None, path.rstrip('/')
+        if self.rules.trailing_slash is True and path != '/' and not path.endswith('/') \
+                and '.' not in path.rsplit('/', 1)[-1]:
+            return 308, None, path + '/'
+        for route in self.rules.redirects:
+            location = route.match(path)
+            if location is not None:
+                return route.status, None, location
+        found = self._file(path)
+        if found is not None:
+            return 200, found, None
+        for route in self.rules.rewrites:
+            destination = route.match(path)
+            if destination is not None:
+                found = self._file(urlsplit(destination).path)
+                if found is not None:
+                    return 200, found, None
+        return 404, self._file('/404.html'), None
+
+    def _variant(self, path: str, accept_encoding: Optional[str]) -> Tuple[str, Optional[str]]:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return path + suffix, encoding
+        return path, None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, {}, keep_alive=False)
+                    return
+                if not await self._serve(head, writer):
+                    return
+        finally:
+            writer.close()
+
+    async def _serve(self, head: bytes, writer: asyncio.StreamWriter) -> bool:
+        started = time.perf_counter()
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            await self._respond(writer, 400, {}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        self.requests += 1
+
+        path = urlsplit(target).path or '/'
+        if method not in ('GET', 'HEAD'):
+            await self._respond(writer, 405, {'Allow': 'GET, HEAD'}, keep_alive=keep_alive)
+            self._log(method, target, 405, started)
+            return keep_alive
+
+        status, file_path, location = self.resolve(path)
+        response_headers = self.rules.headers_for(path)
+        if location is not None:
+            response_headers['Location'] = location
+            await self._respond(writer, status, response_headers, keep_alive=keep_alive)
+        elif file_path is None:
+            await self._respond(writer, 404, response_headers, body=b'Not Found',
+                                keep_alive=keep_alive)
+        else:
+            status = await self._send_file(writer, status, file_path, headers, response_headers,
+                                           head_only=method == 'HEAD', keep_alive=keep_alive)
+        self._log(method, target, status, started)
+        return keep_alive
+
+    async def _send_file(self, writer: asyncio.StreamWriter, status: int, path: str,
+                         request_headers: Dict[str, str], headers: Dict[str, str],
+                         head_only: bool, keep_alive: bool) -> int:
+        body_path, encoding = self._variant(path, request_headers.get('accept-encoding'))
+        with open(body_path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{"-" + encoding if encoding else ""}"'
+            headers['Content-Type'] = content_type(path)
+            headers['ETag'] = etag
+            headers['Last-Modified'] = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            if any(os.path.isfile(path + suffix) for _encoding, suffix in ENCODINGS):
+                headers['Vary'] = 'Accept-Encoding'
+            if encoding:
+                headers['Content-Encoding'] = encoding
+            if status == 200 and etag in request_headers.get('if-none-match', ''):
+                await self._respond(writer, 304, headers, keep_alive=keep_alive)
+                return 304
+            headers['Content-Length'] = str(stat.st_size)
+            writer.write(self._head(status, headers, keep_alive))
+            if not head_only and stat.st_size:
+                await writer.drain()
+                # Zero-copy on plain sockets; asyncio falls back to read/write elsewhere
+                await asyncio.get_running_loop().sendfile(writer.transport, file, 0, stat.st_size)
+            else:
+                await writer.drain()
+        return status
+
+    @staticmethod
+    def _head(status: int, headers: Dict[str, str], keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+                 f"Date: {email.utils.formatdate(usegmt=True)}",
+                 'Server: pyutils-preview',
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                       body: bytes = b'', keep_alive: bool = True) -> None:
+        headers = dict(headers)
+        headers['Content-Length'] = str(len(body))
+        if body:
+            headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+        writer.write(self._head(status, headers, keep_alive) + body)
+        await writer.drain()
+
+    def _log(self, method: str, target: str, status: int, started: float) -> None:
+        if not self.quiet:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{method} {target} {status} {elapsed:.1f} ms", flush=True)
+
+async def start_server(dist_dir: str, project_dir: str, host: str = DEFAULT_HOST,
+                       port: int = DEFAULT_PORT, quiet: bool = False,
+                       rules: Optional[HostingRules] = None
+                       ) -> Tuple[asyncio.AbstractServer, PreviewServer]:
+    """
+    Start serving dist_dir with the project's vercel.json rules, or the given
+    ones; port 0 picks a free port. Raises ValueError on an invalid vercel.json.
+    """
+    if rules is None:
+        rules = HostingRules(load_hosting_config(project_dir))
+    preview = PreviewServer(dist_dir, rules, quiet=quiet)
+    server = await asyncio.start_server(preview.handle, host, port, limit=MAX_HEADER_BYTES)
+    return server, preview
+
+async def serve(args: argparse.Namespace, rules: HostingRules) -> None:
+    """Run the server until interrupted."""
+    project_dir = os.getcwd()
+    server, _preview = await start_server(os.path.join(project_dir, args.dist), project_dir,
+                                          args.host, args.port, quiet=args.quiet, rules=rules)
+    port = server.sockets[0].getsockname()[1]
+    # Machine-readable first line, so the load tester can start the server on port 0
+    print(f"Serving {args.dist}/ at http://{args.host}:{port}/", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve the production build with the rewrites and headers of vercel.json.")
+    parser.add_argument('--dist', default='dist',
+                        help="Build output directory, relative to the project (default: %(default)s)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Address to bind (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help="Port to listen on; 0 picks a free one (default: %(default)s)")
+    parser.add_argument('--quiet', action='store_true', help="Do not log requests")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+
+    if not os.path.isdir(os.path.join(os.getcwd(), args.dist)):
+        print_error(f"No {args.dist}/ found; run 'npm run build' first")
+        sys.exit(1)
+    if not args.quiet:
+        print_header("Production Preview")
+        print_info("Press Ctrl+C to stop", record=False)
+    try:
+        rules = HostingRules(load_hosting_config(os.getcwd()))
+    except ValueError as e:
+        print_error(f"Invalid JSON in {HOSTING_CONFIG}: {e}", file=HOSTING_CONFIG)
+        sys.exit(1)
+    try:
+        asyncio.run(serve(args, rules))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print_error(f"Could not listen on {args.host}:{args.port}: {e.strerror or e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
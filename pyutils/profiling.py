@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Profiling Spans
+
+Lightweight timing instrumentation shared by the pyutils scripts. Code marks
+interesting regions with ``span(name, category)``; while no profiler is active
+this costs a single global lookup. An active Profiler records wall and thread
+CPU time for each span, so a check's time can be split into file I/O, parsing
+and everything else, and writes the spans as Chrome trace-event JSON (open it
+in chrome://tracing or https://ui.perfetto.dev). The whole run can also be
+placed under cProfile, with the statistics dumped in pstats format.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Next to the result cache (result_cache.CACHE_DIR); spelled out so that
+# importing profiling does not load the cache and hashing machinery
+PROFILE_DIR = os.path.join('.cache', 'pyutils', 'profile')
+
+# Categories of nested spans broken out in the per-check summary
+DETAIL_CATEGORIES = ('io', 'parse')
+
+class Span:
+    """One finished timing span."""
+
+    __slots__ = ('name', 'category', 'owner', 'thread', 'start', 'wall', 'cpu')
+
+    def __init__(self, name: str, category: str, owner: Optional[str], thread: int,
+                 start: float, wall: float, cpu: float) -> None:
+        self.name = name
+        self.category = category
+        self.owner = owner
+        self.thread = thread
+        self.start = start
+        self.wall = wall
+        self.cpu = cpu
+
+class Profiler:
+    """Collects spans from every thread, optionally alongside cProfile."""
+
+    def __init__(self, use_cprofile: bool = False) -> None:
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.cprofile = None
+        if use_cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self, category: str = 'check') -> List[Dict[str, Any]]:
+        """
+        Summarize the spans of one category, slowest first, with the time
+        spent in the io and parse spans they own (including spans run on
+        helper threads through carry()).
+        """
+        details: Dict[Any, float] = {}
+        for span in self.spans:
+            if span.category in DETAIL_CATEGORIES:
+                key = (span.owner, span.category)
+                details[key] = details.get(key, 0.0) + span.wall
+        rows = []
+        for outer in (span for span in self.spans if span.category == category):
+            row = {'name': outer.name, 'wall': outer.wall, 'cpu': outer.cpu}
+            for detail in DETAIL_CATEGORIES:
+                row[detail] = details.get((outer.name, detail), 0.0)
+            rows.append(row)
+        rows.sort(key=lambda row: row['wall'], reverse=True)
+        return rows
+
+    def trace_events(self) -> Dict[str, Any]:
+        """Return the spans in Chrome trace-event format."""
+        events = [{
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': round((span.start - self.origin) * 1e6, 1),
+            'dur': round(span.wall * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': span.thread,
+            'args': {'cpu_ms': round(span.cpu * 1000, 3), 'check': span.owner},
+        } for span in sorted(self.spans, key=lambda span: span.start)]
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread in {span.thread for span in self.spans}:
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread,
+                           'args': {'name': names.get(thread, f"worker-{thread}")}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, directory: str) -> List[str]:
+        """Write trace.json (and profile.pstats under cProfile); return the paths."""
+        os.makedirs(directory, exist_ok=True)
+        trace_path = os.path.join(directory, 'trace.json')
+        with open(trace_path, 'w') as file:
+            json.dump(self.trace_events(), file)
+        paths = [trace_path]
+        if self.cprofile is not None:
+            stats_path = os.path.join(directory, 'profile.pstats')
+            self.cprofile.dump_stats(stats_path)
+            paths.append(stats_path)
+        return paths
+
+_active: Optional[Profiler] = None
+
+# The check a thread is currently working for, so nested spans can be charged to it
+_context = threading.local()
+
+def active_profiler() -> Optional[Profiler]:
+    """Return the running profiler, if any."""
+    return _active
+
+@contextmanager
+def profiling(use_cprofile: bool = False) -> Iterator[Profiler]:
+    """Activate a profiler for the duration of the block."""
+    global _active
+    profiler = Profiler(use_cprofile)
+    previous, _active = _active, profiler
+    if profiler.cprofile is not None:
+        profiler.cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if profiler.cprofile is not None:
+            profiler.cprofile.disable()
+        _active = previous
+
+class _NullSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NULL_SPAN = _NullSpan()
+
+class _TimedSpan:
+    __slots__ = ('profiler', 'name', 'category', 'owner', 'previous', 'start', 'cpu')
+
+    def __init__(self, profiler: Profiler, name: str, category: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self) -> None:
+        self.previous = getattr(_context, 'owner', None)
+        self.owner = self.name if self.category == 'check' else self.previous
+        _context.owner = self.owner
+        self.cpu = time.thread_time()
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu
+        _context.owner = self.previous
+        self.profiler.record(Span(self.name, self.category, self.owner, threading.get_ident(),
+                                  self.start, wall, cpu))
+
+def span(name: str, category: str = 'check'):
+    """Time a block when a profiler is active; a shared no-op otherwise."""
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return _TimedSpan(profiler, name, category)
+
+def carry(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Bind func to the calling thread's check so spans it opens on a pool
+    thread are charged to that check. Returns func unchanged when inactive.
+    """
+    owner = getattr(_context, 'owner', None)
+    if _active is None or owner is None:
+        return func
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        previous = getattr(_context, 'owner', None)
+        _context.owner = owner
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _context.owner = previous
+    return run
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Validation Result Cache
+
+Persists the output and return value of each check under .cache/pyutils/ so
+that checks whose input files have not changed can be replayed instead of
+re-run. Input files are fingerprinted by mtime and size first; the content
+hash is only recomputed when either of those has moved, and a check is
+considered fresh when the content hashes of all of its inputs, the results it
+depends on and the validator version match the stored entry. Directories are
+fingerprinted from the mtime and size of every file below them.
+"""
+
+import hashlib
+import json
+import os
+import stat as stat_module
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import file_snapshot
+
+CACHE_DIR = os.path.join('.cache', 'pyutils')
+CACHE_FORMAT = 2
+
+# Directories left out of directory fingerprints
+TREE_SKIP_DIRS = {'node_modules', '.git', '.cache', 'dist'}
+
+# Files modified this recently are re-hashed on the next run even if their
+# mtime and size look unchanged, since a same-tick edit would be invisible
+RACY_WINDOW_SECONDS = 2.0
+
+def hash_bytes(data: bytes) -> str:
+    """Return the content hash used throughout the cache."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def hash_file(file_path: str) -> str:
+    """Hash a file's contents in fixed-size blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ResultCache:
+    """On-disk cache of check results keyed on input content hashes."""
+
+    def __init__(self, root: str, version: str, file_name: str = 'results.json',
+                 max_age_days: float = 30.0) -> None:
+        self.root = root
+        self.version = version
+        self.path = os.path.join(root, CACHE_DIR, file_name)
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._files: Dict[str, List[Any]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._trees: Dict[str, str] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file, discarding it if it was written by another version."""
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get('format') != CACHE_FORMAT or data.get('version') != self.version:
+            self._dirty = True
+            return
+        self._files = data.get('files', {})
+        self._entries = data.get('entries', {})
+
+    def fingerprint(self, rel_path: str) -> Optional[str]:
+        """Return the content fingerprint of a project file or directory."""
+        full_path = os.path.join(self.root, rel_path)
+        stat = file_snapshot.stat(full_path)
+        if stat is None:
+            return None
+        if stat_module.S_ISDIR(stat.st_mode):
+            return self.tree_fingerprint(rel_path)
+
+        with self._lock:
+            known = self._files.get(rel_path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        try:
+            # Read through the snapshot so the check itself reuses the contents
+            digest = hash_bytes(file_snapshot.read_bytes(full_path))
+        except OSError:
+            return None
+        racy = time.time() - stat.st_mtime < RACY_WINDOW_SECONDS
+        with self._lock:
+            self._files[rel_path] = [-1 if racy else stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+        return digest
+
+    def tree_fingerprint(self, rel_path: str) -> str:
+        """
+        Fingerprint a directory tree from the path, mtime and size of every
+        file below it. Computed once per run and shared by all checks.
+        """
+        with self._lock:
+            if rel_path in self._trees:
+                return self._trees[rel_path]
+        digest = hashlib.blake2b(digest_size=16)
+        stack = [os.path.join(self.root, rel_path)]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in TREE_SKIP_DIRS:
+                            stack.append(entry.path)
+                    else:
+                        stat = entry.stat(follow_symlinks=False)
+                        digest.update(f"{entry.path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+                except OSError:
+                    continue
+        fingerprint = f"tree:{digest.hexdigest()}"
+        with self._lock:
+            self._trees[rel_path] = fingerprint
+        return fingerprint
+
+    def forget_trees(self) -> None:
+        """Drop the per-run directory fingerprints, e.g. between --watch runs."""
+        with self._lock:
+            self._trees.clear()
+
+    def key(self, name: str, reads: Sequence[str], inputs: Any = None,
+            params: Any = None) -> str:
+        """Build the cache key for a check from its inputs and parameters."""
+        material = {
+            'version': self.version,
+            'name': name,
+            'files': [[path, self.fingerprint(path)] for path in sorted(reads)],
+            'inputs': inputs,
+            'params': params,
+        }
+        return hash_bytes(json.dumps(material, sort_keys=True, default=str).encode())
+
+    def lookup(self, name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for a check if its key still matches."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.get('key') != key:
+                return None
+            # Refresh the eviction clock at most hourly so no-op runs stay read-only
+            if time.time() - entry.get('used', 0) > 3600:
+                entry['used'] = time.time()
+                self._dirty = True
+            return entry
+
+    def store(self, name: str, key: str, output: str, value: Any,
+              findings: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Record a check result; values that cannot be serialized are skipped."""
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            return False
+        with self._lock:
+            self._entries[name] = {'key': key, 'output': output, 'value': value,
+                                   'findings': findings or [], 'used': time.time()}
+            self._dirty = True
+        return True
+
+    def evict(self) -> None:
+        """Drop entries unused for longer than the maximum age."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for name in [n for n, e in self._entries.items() if e.get('used', 0) < cutoff]:
+                del self._entries[name]
+                self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache back to disk if anything changed."""
+        self.evict()
+        if not self._dirty:
+            return
+        data = {
+            'format': CACHE_FORMAT,
+            'version': self.version,
+            'files': self._files,
+            'entries': self._entries,
+        }
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except BaseException as e:
+            # A value json cannot encode must not leave a stray .tmp behind either
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
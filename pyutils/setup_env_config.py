@@ -6,42 +6,17 @@ This script checks for environment configuration files (.env) and creates them i
 It also generates a template .env.example file with common environment variables for frontend projects.
 """
 
+import argparse
 import os
 import sys
-from typing import Dict, List, Set
-
-# ANSI color codes for terminal output
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
-
-def print_header(message: str) -> None:
-    """Print a formatted header message."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(80)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}\n")
-
-def print_success(message: str) -> None:
-    """Print a success message."""
-    print(f"{Colors.GREEN}✓ {message}{Colors.ENDC}")
-
-def print_warning(message: str) -> None:
-    """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠ {message}{Colors.ENDC}")
-
-def print_error(message: str) -> None:
-    """Print an error message."""
-    print(f"{Colors.RED}✗ {message}{Colors.ENDC}")
-
-def print_info(message: str) -> None:
-    """Print an info message."""
-    print(f"{Colors.BLUE}ℹ {message}{Colors.ENDC}")
+from typing import Dict, List, Optional, Set
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .console import print_error, print_header, print_info, print_success, print_warning
 
 def check_env_files(project_dir: str) -> Dict[str, bool]:
     """Check if environment files exist."""
@@ -416,8 +391,17 @@ When adding new environment variables:
     except Exception as e:
         print_error(f"Error creating environment variables documentation: {str(e)}")
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create the .env files, .env.example and ENV_VARIABLES.md for a "
+                    "frontend project in the current directory.")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main function to run the script."""
+    parse_args(argv)
+    
     print_header("Environment Configuration Setup")
     
     # Get project directory (default to current directory)
@@ -6,124 +6,111 @@ This script runs the check_frontend_project.py and setup_env_config.py scripts
 to ensure the frontend project has all required libraries and configuration files.
 """
 
+import argparse
 import os
 import sys
-import subprocess
-import importlib.util
+import importlib
+from typing import List, Optional
 
-# ANSI color codes for terminal output
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
 
-def print_header(message: str) -> None:
-    """Print a formatted header message."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(80)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.ENDC}\n")
+from .check_scheduler import Check, default_jobs, run_checks
+from .console import print_error, print_header, print_info, print_success, print_warning
+from .profiling import PROFILE_DIR, profiling, span
 
-def print_success(message: str) -> None:
-    """Print a success message."""
-    print(f"{Colors.GREEN}✓ {message}{Colors.ENDC}")
-
-def print_warning(message: str) -> None:
-    """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠ {message}{Colors.ENDC}")
-
-def print_error(message: str) -> None:
-    """Print an error message."""
-    print(f"{Colors.RED}✗ {message}{Colors.ENDC}")
-
-def print_info(message: str) -> None:
-    """Print an info message."""
-    print(f"{Colors.BLUE}ℹ {message}{Colors.ENDC}")
-
-def check_script_exists(script_path: str) -> bool:
-    """Check if a script exists."""
-    if os.path.isfile(script_path):
-        return True
-    print_error(f"Script not found: {script_path}")
-    return False
-
-def run_script(script_path: str) -> int:
-    """Run a Python script and return the exit code."""
+def import_and_run(module_name: str, argv: List[str]) -> bool:
+    """Import a pyutils module on first use and run its main() with argv."""
     try:
-        # Make the script executable
-        os.chmod(script_path, 0o755)
-        
-        # Run the script
-        print_info(f"Running {os.path.basename(script_path)}...")
-        result = subprocess.run([sys.executable, script_path], check=False)
-        return result.returncode
+        with span(f"import {module_name}", 'import'):
+            module = importlib.import_module(f".{module_name}", __package__)
+        module.main(argv)
+        return True
+    except SystemExit as e:
+        # Commands report failures (e.g. a failed budget) through sys.exit();
+        # the remaining steps and the summary must still run
+        if isinstance(e.code, str):
+            print_error(e.code)
+        return e.code in (None, 0)
     except Exception as e:
-        print_error(f"Error running {script_path}: {str(e)}")
-        return 1
+        print_error(f"Error running {module_name}: {str(e)}")
+        return False
 
-def import_and_run_script(script_path: str, script_name: str) -> bool:
-    """Import and run a Python script as a module."""
+def run_check_step(jobs: int, profile: bool = False) -> bool:
+    """Step 1: validate the frontend project."""
+    print_header("Step 1: Checking Frontend Project")
+    argv = ['--jobs', str(jobs)]
+    if profile:
+        # Replayed cache entries would hide the real cost of each check
+        argv.append('--no-cache')
+    return import_and_run('check_frontend_project', argv)
+
+def run_env_step() -> bool:
+    """Step 2: create the environment configuration files."""
+    print_header("Step 2: Setting Up Environment Configuration")
+    return import_and_run('setup_env_config', [])
+
+def run_verify_step() -> bool:
+    """Step 3: type-check, lint and build with the project's own tools."""
+    from .toolchain import TOOLS, print_results, run_toolchain
+    
+    print_header("Step 3: Type-Checking, Linting and Building")
     try:
-        # Import the script as a module
-        spec = importlib.util.spec_from_file_location(script_name, script_path)
-        if spec is None:
-            print_error(f"Could not load {script_path} as a module")
-            return False
-        
-        module = importlib.util.module_from_spec(spec)
-        if spec.loader is None:
-            print_error(f"Could not load {script_path} as a module (loader is None)")
-            return False
-        
-        spec.loader.exec_module(module)
-        
-        # Run the main function
-        if hasattr(module, 'main'):
-            module.main()
-            return True
-        else:
-            print_error(f"Script {script_path} does not have a main() function")
-            return False
+        run = run_toolchain(os.getcwd(), list(TOOLS))
     except Exception as e:
-        print_error(f"Error importing and running {script_path}: {str(e)}")
+        print_error(f"Error running the toolchain: {str(e)}")
         return False
+    print_results(run['tools'], run['wall_time'], show_tail=False)
+    return all(result['status'] == 'passed' for result in run['tools'])
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Check and set up a frontend project.")
+    parser.add_argument('--jobs', '-j', type=int, default=default_jobs(),
+                        help="Number of checks to run in parallel (default: %(default)s)")
+    parser.add_argument('--verify', action='store_true',
+                        help="Afterwards run tsc -b, eslint . and vite build concurrently "
+                             "(see 'python -m pyutils verify')")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time both steps and every check and write a Chrome trace to "
+                             f"{PROFILE_DIR}/trace.json")
+    return parser.parse_args(argv)
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Main function to run the script."""
-    print_header("Frontend Project Setup")
+    args = parse_args(argv)
     
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Define paths to the scripts
-    check_script_path = os.path.join(script_dir, 'check_frontend_project.py')
-    env_script_path = os.path.join(script_dir, 'setup_env_config.py')
-    
-    # Check if the scripts exist
-    check_script_exists = os.path.isfile(check_script_path)
-    env_script_exists = os.path.isfile(env_script_path)
-    
-    if not check_script_exists:
-        print_error(f"Script not found: {check_script_path}")
-    
-    if not env_script_exists:
-        print_error(f"Script not found: {env_script_path}")
-    
-    if not check_script_exists or not env_script_exists:
-        print_error("One or more required scripts are missing. Please ensure both scripts are in the same directory as this script.")
-        sys.exit(1)
-    
-    # Run the check_frontend_project.py script
-    print_header("Step 1: Checking Frontend Project")
-    check_result = import_and_run_script(check_script_path, 'check_frontend_project')
+    print_header("Frontend Project Setup")
     
-    # Run the setup_env_config.py script
-    print_header("Step 2: Setting Up Environment Configuration")
-    env_result = import_and_run_script(env_script_path, 'setup_env_config')
+    # The validator only reads project files and the environment setup only
+    # writes .env*, .gitignore and ENV_VARIABLES.md, so both steps can overlap
+    steps = [
+        Check('check_frontend_project',
+              lambda results: run_check_step(args.jobs, args.profile),
+              reads=['package.json', 'package-lock.json', 'pnpm-lock.yaml',
+                     'vite.config.ts', 'vite.config.js', 'tsconfig.json',
+                     'tailwind.config.js', 'postcss.config.js', 'eslint.config.js',
+                     'components.json', 'src/', 'public/']),
+        Check('setup_env_config',
+              lambda results: run_env_step(),
+              reads=['.env', '.env.example', '.env.development', '.env.production',
+                     '.env.test', '.gitignore', 'ENV_VARIABLES.md'],
+              writes=['.env', '.env.example', '.env.development', '.env.production',
+                      '.env.test', '.gitignore', 'ENV_VARIABLES.md']),
+    ]
+    if args.profile:
+        with profiling() as profiler:
+            schedule = run_checks(steps, jobs=args.jobs)
+        trace_paths = profiler.write(os.path.join(os.getcwd(), PROFILE_DIR))
+    else:
+        schedule = run_checks(steps, jobs=args.jobs)
+        trace_paths = []
+    check_result = bool(schedule.results['check_frontend_project'])
+    env_result = bool(schedule.results['setup_env_config'])
+    # vite build reads the .env files, so this waits for both steps
+    verify_result = run_verify_step() if args.verify else None
     
     # Print summary
     print_header("Setup Summary")
@@ -138,6 +125,17 @@ def main() -> None:
     else:
         print_warning("Environment configuration setup encountered issues")
     
+    if verify_result:
+        print_success("Type-check, lint and build passed")
+    elif verify_result is not None:
+        print_warning("Type-check, lint or build failed")
+    
+    for name, elapsed in schedule.timings:
+        print_info(f"{name:<28} {elapsed * 1000:9.1f} ms")
+    print_info(f"{'total (wall)':<28} {schedule.wall_time * 1000:9.1f} ms")
+    for path in trace_paths:
+        print_success(f"Profile trace written to {os.path.relpath(path)}")
+    
     # Print next steps
     print_header("Next Steps")
     
@@ -153,6 +151,12 @@ def main() -> None:
    or
    
    yarn dev
+   
+6. Try the production build locally with:
+   
+   npm run build
+   python -m pyutils serve
+   python -m pyutils loadtest
     """)
 
 if __name__ == "__main__":
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Source Map Byte Attribution
+
+This script attributes every byte of the JavaScript chunks in dist/assets to
+the source file and package it was generated from, using the chunks' source
+maps. Maps are streamed rather than loaded: sourcesContent and other large
+values are skipped without being materialized, and the VLQ mappings are
+decoded line by line alongside the generated file, so memory stays bounded
+by the longest generated line however large the map is. Chunks are processed
+on a process pool and the result is written as treemap-ready JSON.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .build_analyzer import package_from_path
+from .console import format_size, print_error, print_header, print_info, print_success
+
+DEFAULT_OUTPUT = 'sourcemap-treemap.json'
+READ_SIZE = 1 << 16
+UNMAPPED = '(unmapped)'
+
+_BASE64 = {char: index for index, char in
+           enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+_STRING_END = re.compile(r'["\\]')
+_SEPARATORS = re.compile(r'([,;])')
+
+class MapReader:
+    """
+    Pull reader over the top-level object of a source map. Values the caller
+    does not need are skipped in place; only the current read window and the
+    values asked for are ever held in memory.
+    """
+
+    def __init__(self, file) -> None:
+        self.file = file
+        self.buffer = ''
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next block to the buffer; False at end of file."""
+        block = self.file.read(READ_SIZE)
+        if not block:
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume one structural character."""
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def chunks(self) -> Iterator[str]:
+        """Consume a string value, yielding its raw (still escaped) contents in pieces."""
+        self.expect('"')
+        while True:
+            match = _STRING_END.search(self.buffer, self.pos)
+            if match is None:
+                piece = self.buffer[self.pos:]
+                self.pos = len(self.buffer)
+                if piece:
+                    yield piece
+                if not self._fill():
+                    raise ValueError("unterminated string")
+                continue
+            end = match.start()
+            if match.group() == '"':
+                yield self.buffer[self.pos:end]
+                self.pos = end + 1
+                return
+            # Keep an escape and the character it escapes in the same piece
+            if end > self.pos:
+                yield self.buffer[self.pos:end]
+                self.pos = end
+            while self.pos + 2 > len(self.buffer):
+                if not self._fill():
+                    raise ValueError("unterminated string")
+            yield self.buffer[self.pos:self.pos + 2]
+            self.pos += 2
+
+    def string(self) -> str:
+        """Consume and decode a string value."""
+        return json.loads('"' + ''.join(self.chunks()) + '"')
+
+    def skip(self) -> None:
+        """Consume any JSON value without keeping it."""
+        char = self.peek()
+        if char == '"':
+            for _piece in self.chunks():
+                pass
+        elif char in '[{':
+            close = ']' if char == '[' else '}'
+            self.pos += 1
+            if self.peek() == close:
+                self.pos += 1
+                return
+            while True:
+                if char == '{':
+                    self.skip()
+                    self.expect(':')
+                self.skip()
+                if self.peek() == ',':
+                    self.pos += 1
+                    continue
+                self.expect(close)
+                return
+        else:
+            while True:
+                while self.pos < len(self.buffer) and self.buffer[self.pos] not in ',]} \t\r\n':
+                    self.pos += 1
+                if self.pos < len(self.buffer) or not self._fill():
+                    return
+
+    def string_array(self) -> List[Optional[str]]:
+        """Consume an array of strings (nulls allowed)."""
+        items: List[Optional[str]] = []
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return items
+        while True:
+            if self.peek() == '"':
+                items.append(self.string())
+            else:
+                self.skip()
+                items.append(None)
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return items
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the top-level object; the caller consumes each value."""
+        self.expect('{')
+        if self.peek() == '}':
+            return
+        while True:
+            key = self.string()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+def decode_vlq(segment: str) -> List[int]:
+    """Decode one comma-separated mappings segment into its fields."""
+    values = []
+    value = shift = 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+def iter_segments(pieces: Iterator[str]) -> Iterator[Optional[str]]:
+    """
+    Split a streamed mappings string into segments, yielding None at each
+    generated line break. Only a partial segment is carried between pieces.
+    """
+    tail = ''
+    for piece in pieces:
+        tokens = _SEPARATORS.split(tail + piece)
+        tail = tokens.pop()
+        for token in tokens:
+            if token == ';':
+                yield None
+            elif token and token != ',':
+                yield token
+    if tail:
+        yield tail
+
+def byte_offsets(line: bytes) -> Optional[List[int]]:
+    """
+    Map UTF-16 columns (what source maps count) to byte offsets for a
+    generated line, or return None when the line is ASCII and they coincide.
+    """
+    text = line.decode('utf-8', errors='replace')
+    if len(text) == len(line):
+        return None
+    offsets = []
+    position = 0
+    for char in text:
+        offsets.append(position)
+        if ord(char) > 0xFFFF:
+            offsets.append(position)
+        position += len(char.encode('utf-8', errors='replace'))
+    offsets.append(position)
+    return offsets
+
+class LineCursor:
+    """
+    Walks one generated line segment by segment, charging the bytes between
+    consecutive segment columns to the source active before each boundary.
+    Line terminators and bytes before the first segment count as unmapped (-1).
+    """
+
+    def __init__(self, line: bytes, counts: Dict[int, int]) -> None:
+        content = line.rstrip(b'\r\n')
+        self.counts = counts
+        self.length = len(content)
+        self.terminator = len(line) - len(content)
+        self.offsets = byte_offsets(content)
+        self.column = 0
+        self.position = 0
+        self.source = -1
+
+    def _charge(self, end: int) -> None:
+        if end > self.position:
+            self.counts[self.source] = self.counts.get(self.source, 0) + end - self.position
+            self.position = end
+
+    def segment(self, fields: List[int], state: List[int]) -> None:
+        """Apply a decoded segment; state[0] carries the source index across lines."""
+        self.column += fields[0]
+        if self.offsets is None:
+            self._charge(min(self.column, self.length))
+        else:
+            self._charge(self.offsets[min(self.column, len(self.offsets) - 1)])
+        if len(fields) >= 4:
+            state[0] += fields[1]
+            self.source = state[0]
+        else:
+            self.source = -1
+
+    def finish(self) -> None:
+        """Charge the rest of the line and its terminator."""
+        self._charge(self.length)
+        if self.terminator:
+            self.counts[-1] = self.counts.get(-1, 0) + self.terminator
+
+def attribute_chunk(project_dir: str, chunk_path: str) -> Dict[str, Any]:
+    """
+    Attribute the generated bytes of one chunk to its sources. Runs in a worker
+    process and returns per-source and per-package byte totals.
+    """
+    start = time.perf_counter()
+    map_path = chunk_path + '.map'
+    map_dir = os.path.dirname(map_path)
+    counts: Dict[int, int] = {}
+    sources: List[Optional[str]] = []
+    source_root = ''
+    state = [0]
+
+    with open(map_path, 'r', encoding='utf-8') as map_file, open(chunk_path, 'rb') as chunk:
+        reader = MapReader(map_file)
+        for key in reader.members():
+            if key == 'sources':
+                sources = reader.string_array()
+            elif key == 'sourceRoot':
+                if reader.peek() == '"':
+                    source_root = reader.string()
+                else:
+                    reader.skip()
+            elif key == 'mappings':
+                cursor = LineCursor(chunk.readline(), counts)
+                for segment in iter_segments(reader.chunks()):
+                    if segment is None:
+                        cursor.finish()
+                        cursor = LineCursor(chunk.readline(), counts)
+                    else:
+                        cursor.segment(decode_vlq(segment), state)
+                cursor.finish()
+            else:
+                reader.skip()
+        # Generated lines past the last mapping are unmapped
+        for line in chunk:
+            counts[-1] = counts.get(-1, 0) + len(line)
+
+    by_source: Dict[str, int] = {}
+    by_package: Dict[str, int] = {}
+    for index, size in counts.items():
+        source = sources[index] if 0 <= index < len(sources) else None
+        if source is None:
+            name = UNMAPPED
+        else:
+            full = os.path.normpath(os.path.join(map_dir, source_root, source.split('?', 1)[0]))
+            name = os.path.relpath(full, project_dir).replace(os.sep, '/')
+            package = package_from_path(source)
+            if package is not None:
+                by_package[package] = by_package.get(package, 0) + size
+        by_source[name] = by_source.get(name, 0) + size
+
+    return {
+        'chunk': os.path.relpath(chunk_path, project_dir).replace(os.sep, '/'),
+        'bytes': os.path.getsize(chunk_path),
+        'sources': dict(sorted(by_source.items(), key=lambda item: item[1], reverse=True)),
+        'packages': dict(sorted(by_package.items(), key=lambda item: item[1], reverse=True)),
+        'seconds': time.perf_counter() - start,
+    }
+
+def treemap_node(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold a chunk's per-source totals into a nested {name, children|value} tree."""
+    root: Dict[str, Any] = {'name': chunk['chunk'], 'children': {}}
+    for source, size in chunk['sources'].items():
+        package = package_from_path(source)
+        if package is not None:
+            parts = ['node_modules', package] + source.rsplit(package + '/', 1)[-1].split('/')
+        else:
+            parts = source.split('/')
+        node = root
+        for part in parts[:-1]:
+            node = node['children'].setdefault(part, {'name': part, 'children': {}})
+        leaf = node['children'].setdefault(parts[-1], {'name': parts[-1], 'value': 0})
+        leaf['value'] = leaf.get('value', 0) + size
+
+    def finish(node: Dict[str, Any]) -> Dict[str, Any]:
+        if 'children' in node:
+            node['children'] = [finish(child) for child in node['children'].values()]
+        return node
+    return finish(root)
+
+def find_mapped_chunks(dist_dir: str) -> List[str]:
+    """Return the JavaScript chunks in dist/assets that have a source map."""
+    assets_dir = os.path.join(dist_dir, 'assets')
+    try:
+        names = sorted(os.listdir(assets_dir))
+    except OSError:
+        return []
+    return [os.path.join(assets_dir, name) for name in names
+            if name.endswith(('.js', '.mjs')) and name + '.map' in names]
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Attribute the bytes of built chunks to source files and packages.")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: %(default)s)")
+    parser.add_argument('--dist', default='dist',
+                        help="Build output directory, relative to the project (default: %(default)s)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help="Treemap JSON report path (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Sources and packages to list per chunk (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+
+    print_header("Source Map Attribution")
+
+    project_dir = os.getcwd()
+    chunks = find_mapped_chunks(os.path.join(project_dir, args.dist))
+    if not chunks:
+        print_error(f"No JavaScript chunks with source maps in {args.dist}/assets/. "
+                    "Build with build.sourcemap: true (or 'hidden') to generate them.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        pending = {executor.submit(attribute_chunk, project_dir, path): path for path in chunks}
+        for future in as_completed(pending):
+            name = os.path.basename(pending[future])
+            try:
+                results.append(future.result())
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                print_error(f"{name}: could not read source map ({e})")
+    results.sort(key=lambda result: result['bytes'], reverse=True)
+
+    for result in results:
+        print_header(f"{os.path.basename(result['chunk'])} ({format_size(result['bytes'])})")
+        for source, size in list(result['sources'].items())[:args.top]:
+            share = size / result['bytes'] * 100 if result['bytes'] else 0
+            print_info(f"{format_size(size):>10} {share:5.1f}%  {source}")
+        if result['packages']:
+            top = [f"{name} ({format_size(size)})"
+                   for name, size in list(result['packages'].items())[:args.top]]
+            print(f"    packages: {', '.join(top)}")
+
+    report = {
+        'name': args.dist,
+        'children': [treemap_node(result) for result in results],
+        'chunks': [{key: value for key, value in result.items() if key != 'seconds'}
+                   for result in results],
+    }
+    output_path = os.path.join(project_dir, args.output)
+    with open(output_path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print_header("Summary")
+    total = sum(result['bytes'] for result in results)
+    print_info(f"{len(results)} chunks, {format_size(total)} attributed "
+               f"in {time.perf_counter() - start:.1f}s")
+    print_success(f"Treemap written to {os.path.relpath(output_path, project_dir)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Toolchain Runner
+
+Runs the project's own verification tools - ``tsc -b``, ``eslint .`` and
+``vite build`` from node_modules/.bin - as asyncio subprocesses instead of
+one after the other the way ``npm run build && npm run lint`` does. Each tool
+declares the files it reads and writes, and the same rule the check
+scheduler uses decides what may overlap: two tools only run at the same time
+when neither writes something the other touches (eslint waits for vite when
+the ESLint config does not ignore dist/, for example).
+
+Output is streamed live with a per-tool prefix. Every tool has a timeout,
+after which its whole process group is terminated. The wall time and peak
+RSS of each tool (from wait4(), so per tool even while they overlap) are
+written to .cache/pyutils/toolchain.json, which the validator includes in
+its report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .check_scheduler import Check, build_dependencies
+from .console import Colors, format_size, print_error, print_header, print_info, print_success, print_warning
+from .result_cache import CACHE_DIR
+
+RESULTS_NAME = 'toolchain.json'
+
+# tool -> (arguments, default timeout in seconds)
+TOOLS = {
+    'tsc': (['-b'], 600),
+    'eslint': (['.'], 300),
+    'vite': (['build'], 600),
+}
+
+PREFIX_COLORS = (Colors.BLUE, Colors.HEADER, Colors.GREEN, Colors.YELLOW)
+
+# Lines of output kept per tool for the report
+TAIL_LINES = 20
+
+# Seconds between SIGTERM and SIGKILL when a tool times out
+KILL_GRACE_SECONDS = 5.0
+
+# Seconds to keep reading output after a tool has exited
+DRAIN_SECONDS = 2.0
+
+MAX_LINE_BYTES = 1 << 20
+
+_ESLINT_IGNORES_DIST = re.compile(r'''ignores\s*:\s*\[[^\]]*['"](?:\*\*/)?/?dist\b''')
+
+class ToolTask(Check):
+    """An external tool run, scheduled like a check by the files it reads and writes."""
+
+    def __init__(self, name: str, argv: List[str], reads: Sequence[str] = (),
+                 writes: Sequence[str] = (), timeout: float = 600) -> None:
+        super().__init__(name, func=lambda results: None, reads=reads, writes=writes)
+        self.argv = argv
+        self.timeout = timeout
+
+def tool_binary(project_dir: str, name: str) -> Optional[str]:
+    """Return the project-local executable of a tool, or None if it is not installed."""
+    bin_dir = os.path.join(project_dir, 'node_modules', '.bin')
+    for candidate in ([f"{name}.cmd", name] if os.name == 'nt' else [name]):
+        path = os.path.join(bin_dir, candidate)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def tsc_outputs(project_dir: str) -> List[str]:
+    """Return what ``tsc -b`` writes: each project's .tsbuildinfo and, unless noEmit, its outDir."""
+    from .tsconfig_resolver import resolve_tsconfig
+
+    # The resolver has already made path options absolute
+    outputs = []
+    for project in resolve_tsconfig(project_dir):
+        info = project.options.get('tsBuildInfoFile') or os.path.splitext(project.path)[0] + '.tsbuildinfo'
+        outputs.append(os.path.relpath(info, project_dir).replace(os.sep, '/'))
+        out_dir = project.options.get('outDir')
+        if out_dir and not project.options.get('noEmit'):
+            outputs.append(os.path.relpath(out_dir, project_dir).replace(os.sep, '/') + '/')
+    return outputs
+
+def eslint_ignores_dist(project_dir: str) -> bool:
+    """True if the ESLint flat config (or .eslintignore) leaves dist/ out."""
+    for name in ('eslint.config.js', 'eslint.config.mjs', 'eslint.config.ts', '.eslintignore'):
+        try:
+            with open(os.path.join(project_dir, name), 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError:
+            continue
+        if name == '.eslintignore':
+            if any(line.strip().strip('/') in ('dist', 'dist/**') for line in text.splitlines()):
+                return True
+        elif _ESLINT_IGNORES_DIST.search(text):
+            return True
+    return False
+
+def build_tasks(project_dir: str, names: Sequence[str],
+                timeout: Optional[float] = None) -> List[ToolTask]:
+    """Declare the selected tools with their inputs and outputs."""
+    sources = ['src/', 'package.json']
+    declared = {
+        'tsc': (sources + ['tsconfig.json', 'tsconfig.app.json', 'tsconfig.node.json', 'vite.config.ts'],
+                tsc_outputs(project_dir)),
+        'eslint': (sources + ['eslint.config.js', 'vite.config.ts', 'tailwind.config.js']
+                   + ([] if eslint_ignores_dist(project_dir) else ['dist/']), []),
+        'vite': (sources + ['public/', 'index.html', 'vite.config.ts', 'vite.config.js',
+                            'tailwind.config.js', 'postcss.config.js'], ['dist/']),
+    }
+    tasks = []
+    for name in names:
+        arguments, default_timeout = TOOLS[name]
+        reads, writes = declared[name]
+        binary = tool_binary(project_dir, name)
+        tasks.append(ToolTask(name, [binary] + arguments if binary else [], reads, writes,
+                              timeout if timeout is not None else default_timeout))
+    return tasks
+
+def _peak_rss(rusage: Any) -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+
+def _signal_group(process: subprocess.Popen, sig: int) -> None:
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, sig)
+        else:
+            process.terminate()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+async def run_tool(task: ToolTask, project_dir: str, prefix: Optional[str]) -> Dict[str, Any]:
+    """
+    Run one tool, printing its output with `prefix` (None keeps it quiet),
+    and return its status, wall time, peak RSS and last lines of output.
+    """
+    result: Dict[str, Any] = {'tool': task.name, 'command': ' '.join([task.name] + TOOLS[task.name][0]),
+                              'status': 'missing', 'exit_code': None, 'seconds': 0.0,
+                              'peak_rss': None, 'timeout': task.timeout, 'tail': []}
+    if not task.argv:
+        return result
+    loop = asyncio.get_running_loop()
+    env = dict(os.environ)
+    if 'NO_COLOR' not in env:
+        env.setdefault('FORCE_COLOR', '1')
+    start = time.perf_counter()
+    # Popen rather than asyncio's subprocess support, so the process can be
+    # reaped with wait4() and its own resource usage read back
+    process = subprocess.Popen(task.argv, cwd=project_dir, env=env, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               start_new_session=os.name == 'posix')
+    if hasattr(os, 'wait4'):
+        waiter = loop.run_in_executor(None, os.wait4, process.pid, 0)
+    else:
+        waiter = loop.run_in_executor(None, process.wait)
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    transport, _protocol = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), process.stdout)
+    tail: List[str] = []
+
+    async def pump() -> None:
+        while True:
+            try:
+                raw = await reader.readline()
+            except ValueError:
+                # A line longer than the limit; take what is buffered
+                raw = await reader.read(MAX_LINE_BYTES)
+            if not raw:
+                return
+            line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            tail.append(line)
+            del tail[:-TAIL_LINES]
+            if prefix is not None:
+                print(f"{prefix} {line}", flush=True)
+
+    pumping = loop.create_task(pump())
+    try:
+        await asyncio.wait_for(asyncio.shield(waiter), task.timeout)
+        result['status'] = 'passed'
+    except asyncio.TimeoutError:
+        result['status'] = 'timeout'
+        _signal_group(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            _signal_group(process, signal.SIGKILL if hasattr(signal, 'SIGKILL') else signal.SIGTERM)
+    except asyncio.CancelledError:
+        # Ctrl+C: the tool runs in its own session and would not see SIGINT
+        _signal_group(process, signal.SIGTERM)
+        pumping.cancel()
+        transport.close()
+        raise
+    outcome = await waiter
+    result['seconds'] = time.perf_counter() - start
+    try:
+        await asyncio.wait_for(pumping, DRAIN_SECONDS)
+    except asyncio.TimeoutError:
+        # A leftover grandchild (a stray esbuild service, say) holds the pipe open
+        _signal_group(process, signal.SIGTERM)
+    transport.close()
+    if isinstance(outcome, tuple):
+        _pid, status, rusage = outcome
+        process.returncode = os.waitstatus_to_exitcode(status)
+        result['peak_rss'] = _peak_rss(rusage)
+    result['exit_code'] = process.returncode
+    if result['status'] == 'passed' and process.returncode != 0:
+        result['status'] = 'failed'
+    result['tail'] = tail
+    return result
+
+async def orchestrate(tasks: Sequence[ToolTask], project_dir: str, jobs: int,
+                      quiet: bool = False) -> List[Dict[str, Any]]:
+    """Run the tasks, starting each as soon as the tasks it conflicts with are done."""
+    dependencies = build_dependencies(tasks)
+    width = max(len(task.name) for task in tasks)
+    slots = asyncio.Semaphore(max(1, jobs))
+    finished: Dict[str, asyncio.Event] = {task.name: asyncio.Event() for task in tasks}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    async def run(index: int, task: ToolTask) -> None:
+        try:
+            for name in dependencies[task.name]:
+                await finished[name].wait()
+            async with slots:
+                color = PREFIX_COLORS[index % len(PREFIX_COLORS)]
+                prefix = None if quiet else f"{color}{task.name:<{width}} |{Colors.ENDC}"
+                results[task.name] = await run_tool(task, project_dir, prefix)
+        finally:
+            finished[task.name].set()
+
+    await asyncio.gather(*(run(index, task) for index, task in enumerate(tasks)))
+    return [results[task.name] for task in tasks]
+
+def run_toolchain(project_dir: str, names: Sequence[str], timeout: Optional[float] = None,
+                  serial: bool = False, quiet: bool = False) -> Dict[str, Any]:
+    """Run the named tools, record the run for the validator and return it."""
+    tasks = build_tasks(project_dir, names, timeout)
+    if not quiet:
+        dependencies = build_dependencies(tasks)
+        for task in tasks:
+            after = f" after {', '.join(dependencies[task.name])}" if dependencies[task.name] else ""
+            print_info(f"{' '.join([task.name] + TOOLS[task.name][0])}{after}", record=False)
+    start = time.perf_counter()
+    results = asyncio.run(orchestrate(tasks, project_dir, 1 if serial else len(tasks), quiet=quiet))
+    run = {'recorded_at': time.time(), 'wall_time': time.perf_counter() - start, 'tools': results}
+    run['path'] = save_results(project_dir, run)
+    return run
+
+def results_path(project_dir: str) -> str:
+    return os.path.join(project_dir, CACHE_DIR, RESULTS_NAME)
+
+def save_results(project_dir: str, run: Dict[str, Any]) -> str:
+    """Write the run for the validator report; return the path."""
+    path = results_path(project_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(run, file, indent=2)
+    return path
+
+def load_results(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Load the last recorded run, if any."""
+    try:
+        with open(results_path(project_dir), 'r') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and isinstance(data.get('tools'), list) else None
+
+def describe(result: Dict[str, Any]) -> str:
+    """One summary line for a tool result."""
+    if result['status'] == 'missing':
+        return f"{result['command']}: not installed in node_modules/.bin (run npm install)"
+    rss = f", peak RSS {format_size(result['peak_rss'])}" if result['peak_rss'] is not None else ""
+    if result['status'] == 'timeout':
+        return f"{result['command']}: timed out after {result['timeout']:g}s{rss}"
+    outcome = 'passed' if result['status'] == 'passed' else f"failed with exit code {result['exit_code']}"
+    return f"{result['command']}: {outcome} in {result['seconds']:.1f}s{rss}"
+
+def print_results(results: List[Dict[str, Any]], wall_time: float, show_tail: bool) -> None:
+    """Print one line per tool, the output tail of failures and the overlap gained."""
+    for result in results:
+        if result['status'] == 'passed':
+            print_success(describe(result))
+        elif result['status'] == 'missing':
+            print_warning(describe(result))
+        else:
+            print_error(describe(result))
+            if show_tail:
+                for line in result['tail'][-5:]:
+                    print(f"    {line}")
+    sequential = sum(result['seconds'] for result in results)
+    if sequential:
+        print_info(f"Wall time {wall_time:.1f}s for {sequential:.1f}s of tool time "
+                   f"({sequential / wall_time if wall_time else 1:.1f}x overlap)", record=False)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run tsc -b, eslint . and vite build concurrently where that is safe.")
+    parser.add_argument('--only', help=f"Comma-separated tools to run (default: {','.join(TOOLS)})")
+    parser.add_argument('--timeout', type=float,
+                        help="Timeout per tool in seconds (default: tsc 600, eslint 300, vite 600)")
+    parser.add_argument('--serial', action='store_true',
+                        help="Run the tools one after another, for comparison")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help="Do not stream tool output; show the end of it for failures")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    args = parse_args(argv)
+    project_dir = os.getcwd()
+
+    names = [name.strip() for name in args.only.split(',')] if args.only else list(TOOLS)
+    unknown = [name for name in names if name not in TOOLS]
+    if unknown:
+        print_error(f"Unknown tools: {', '.join(unknown)} (choose from {', '.join(TOOLS)})")
+        sys.exit(2)
+
+    quiet = args.quiet or args.json
+    if not args.json:
+        print_header("Toolchain")
+    try:
+        run = run_toolchain(project_dir, names, args.timeout, serial=args.serial, quiet=quiet)
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    if args.json:
+        print(json.dumps({'wall_time': run['wall_time'], 'tools': run['tools']}, indent=2))
+    else:
+        print_header("Toolchain Summary")
+        print_results(run['tools'], run['wall_time'], show_tail=quiet)
+        print_info(f"Results written to {os.path.relpath(run['path'], project_dir)}", record=False)
+    if any(result['status'] in ('failed', 'timeout') for result in run['tools']):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+TypeScript Compile Diagnostics
+
+Runs the project's tsc with --extendedDiagnostics and --generateTrace and
+reports where type-checking time goes:
+
+- the counters and timings tsc prints (files, types, instantiations,
+  memory used, check time, ...), read line by line while tsc runs
+- the slowest files to check and the slowest individual expressions and
+  declarations, from the checker spans in trace.json
+- the generic types instantiated most often, from types.json, grouped by
+  declaration and package, which is where heavy generic props such as
+  recharts' or echarts' option types show up
+
+trace.json and types.json easily reach hundreds of megabytes on a large
+program, so both are decoded one array element at a time and never held in
+memory whole. Check time, memory and instantiation counts are appended to a
+SQLite history under .cache/pyutils/ and each run is compared with the
+median of earlier commits. --from-trace analyzes an existing trace
+directory without running tsc.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: make the rest of pyutils importable as a package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'pyutils'
+
+from .console import format_size, print_error, print_header, print_info, print_success, print_warning
+from .result_cache import CACHE_DIR
+
+TRACE_DIR = os.path.join(CACHE_DIR, 'tsc-trace')
+HISTORY_NAME = 'tsc-history.sqlite3'
+
+CHUNK_SIZE = 1 << 20
+
+# "Check time:    8.12s", "Memory used:  523412K", "Instantiations:  1234567"
+_DIAGNOSTIC = re.compile(r'^([A-Za-z][\w ./()-]*?):\s+([\d.]+)([sK]?)\s*$')
+_ERROR = re.compile(r'error TS\d+:')
+
+# Diagnostics kept in the history, as (diagnostic name, metric)
+TRACKED = (('Check time', 'check_ms'), ('Total time', 'total_ms'), ('Memory used', 'memory_bytes'),
+           ('Types', 'types'), ('Instantiations', 'instantiations'))
+
+# Checker spans that cover a whole file rather than one node
+FILE_SPANS = {'checkSourceFile'}
+
+_WHITESPACE = re.compile(r'\s*')
+
+def parse_diagnostic(line: str) -> Optional[Tuple[str, float]]:
+    """Parse one --extendedDiagnostics line into (name, value); times in ms, memory in bytes."""
+    match = _DIAGNOSTIC.match(line.strip())
+    if match is None:
+        return None
+    name, number, unit = match.groups()
+    value = float(number)
+    if unit == 's':
+        value *= 1000
+    elif unit == 'K':
+        value *= 1024
+    return name, value
+
+def iter_json_array(path: str) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array, decoding one element at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        buffer = ''
+        position = 0
+        started = False
+        eof = False
+        while True:
+            # Skip whitespace and the separators between elements
+            while position < len(buffer) and buffer[position] in ' \t\r\n,[]':
+                if buffer[position] == '[':
+                    started = True
+                position += 1
+            if position >= len(buffer):
+                if eof:
+                    return
+                buffer, position = file.read(CHUNK_SIZE), 0
+                eof = not buffer
+                continue
+            if not started:
+                raise ValueError(f"{path} is not a JSON array")
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                more = file.read(CHUNK_SIZE)
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+            yield element
+            position = end
+
+class Span:
+    """A checker span from trace.json."""
+
+    def __init__(self, name: str, duration_ms: float, args: Dict[str, Any]) -> None:
+        self.name = name
+        self.duration_ms = duration_ms
+        self.path = args.get('path')
+        self.pos = args.get('pos')
+        self.end = args.get('end')
+
+def iter_spans(trace_path: str) -> Iterator[Span]:
+    """Yield the complete ('X') and begin/end ('B'/'E') checker spans of a trace."""
+    open_spans: Dict[Any, List[Dict[str, Any]]] = {}
+    for event in iter_json_array(trace_path):
+        if not isinstance(event, dict) or not str(event.get('cat', '')).startswith('check'):
+            continue
+        phase = event.get('ph')
+        if phase == 'X':
+            yield Span(event.get('name', ''), event.get('dur', 0) / 1000, event.get('args') or {})
+        elif phase == 'B':
+            open_spans.setdefault(event.get('tid'), []).append(event)
+        elif phase == 'E':
+            stack = open_spans.get(event.get('tid'))
+            if stack:
+                begin = stack.pop()
+                yield Span(begin.get('name', ''), (event.get('ts', 0) - begin.get('ts', 0)) / 1000,
+                           begin.get('args') or {})
+
+def analyze_trace(trace_path: str, top: int) -> Dict[str, Any]:
+    """Rank files by check time and the slowest node spans, without nesting duplicates."""
+    files: Dict[str, float] = {}
+    nodes: List[Span] = []
+    for span in iter_spans(trace_path):
+        if span.path is None:
+            continue
+        if span.name in FILE_SPANS:
+            files[span.path] = files.get(span.path, 0.0) + span.duration_ms
+        elif span.pos is not None and span.end is not None:
+            nodes.append(span)
+            # Keep the candidate list bounded on huge traces
+            if len(nodes) > top * 200:
+                nodes.sort(key=lambda item: item.duration_ms, reverse=True)
+                del nodes[top * 50:]
+
+    # An expression inside a slow declaration is slow because of it, so only
+    # the outermost span of each nested group is reported
+    hotspots: List[Span] = []
+    for span in sorted(nodes, key=lambda item: item.duration_ms, reverse=True):
+        if any(other.path == span.path and other.pos <= span.pos and span.end <= other.end
+               for other in hotspots):
+            continue
+        hotspots.append(span)
+        if len(hotspots) >= top:
+            break
+    slowest = sorted(files.items(), key=lambda item: item[1], reverse=True)
+    return {
+        'files': [{'path': path, 'check_ms': ms} for path, ms in slowest[:top]],
+        'files_checked': len(files),
+        'hotspots': [{'path': span.path, 'kind': span.name, 'pos': span.pos, 'end': span.end,
+                      'line': line_of(span.path, span.pos), 'duration_ms': span.duration_ms}
+                     for span in hotspots],
+    }
+
+def analyze_types(types_path: str, top: int) -> Dict[str, Any]:
+    """Count instantiated types per generic declaration and per package."""
+    from .build_analyzer import package_from_path
+
+    by_declaration: Dict[Tuple[str, str], int] = {}
+    by_package: Dict[str, int] = {}
+    total = 0
+    for entry in iter_json_array(types_path):
+        if not isinstance(entry, dict) or 'instantiatedType' not in entry:
+            continue
+        declaration = entry.get('firstDeclaration') or {}
+        path = declaration.get('path') or '(anonymous)'
+        key = (entry.get('symbolName') or '(anonymous)', path)
+        by_declaration[key] = by_declaration.get(key, 0) + 1
+        package = package_from_path(path) or '(project)'
+        by_package[package] = by_package.get(package, 0) + 1
+        total += 1
+    ranked = sorted(by_declaration.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'instantiated_types': total,
+        'declarations': [{'symbol': symbol, 'path': path, 'package': package_from_path(path),
+                          'count': count} for (symbol, path), count in ranked],
+        'packages': dict(sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]),
+    }
+
+_sources: Dict[str, Optional[Tuple[str, List[int]]]] = {}
+
+def line_of(path: str, pos: int) -> Optional[int]:
+    """1-based line of a node position, skipping the leading trivia tsc includes in pos."""
+    if path not in _sources:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError:
+            text = None
+        _sources[path] = (text, [0] + [match.end() for match in re.finditer('\n', text)]) \
+            if text is not None else None
+    source = _sources[path]
+    if source is None:
+        return None
+    text, starts = source
+    if pos < len(text):
+        pos = _WHITESPACE.match(text, pos).end()
+    return bisect.bisect_right(starts, pos)
+
+def tsc_projects(project_dir: str) -> List[str]:
+    """The tsconfig files that have sources of their own, e.g. tsconfig.app.json behind references."""
+    from .tsconfig_resolver import resolve_tsconfig
+
+    return [project.path for project in resolve_tsconfig(project_dir) if project.error is None and project.has_sources()]
+
+def run_tsc(binary: str, config: str, trace_dir: str, project_dir: str,
+            echo_errors: int = 5) -> Dict[str, Any]:
+    """Run tsc on one tsconfig, reading its diagnostics as they are printed."""
+    from .tsconfig_resolver import resolve_project
+
+    os.makedirs(trace_dir, exist_ok=True)
+    # A run that fails before writing its trace must not report the previous one
+    for path, types_path in trace_files(trace_dir):
+        for stale in (path, types_path):
+            if stale is not None:
+                os.unlink(stale)
+    argv = [binary, '-p', config, '--extendedDiagnostics', '--generateTrace', trace_dir]
+    options = resolve_project(config).options
+    # Whatever tsc writes goes under the trace directory, never next to the
+    # sources: an emitted vite.config.js would shadow vite.config.ts. The
+    # directory is cleared so a stale .tsbuildinfo cannot skip the check.
+    emit_dir = os.path.join(trace_dir, 'emit')
+    shutil.rmtree(emit_dir, ignore_errors=True)
+    if options.get('composite'):
+        # tsc refuses noEmit together with composite before TypeScript 5.6
+        argv += ['--outDir', emit_dir, '--declarationDir', emit_dir]
+    else:
+        argv.append('--noEmit')
+    if options.get('composite') or options.get('incremental'):
+        argv += ['--tsBuildInfoFile', os.path.join(emit_dir, 'tsconfig.tsbuildinfo')]
+    diagnostics: Dict[str, float] = {}
+    errors = 0
+    start = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=project_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               stdin=subprocess.DEVNULL, text=True, errors='replace')
+    for line in process.stdout:
+        parsed = parse_diagnostic(line)
+        if parsed is not None:
+            diagnostics[parsed[0]] = parsed[1]
+        elif _ERROR.search(line):
+            errors += 1
+            if errors <= echo_errors:
+                print(f"    {line.rstrip()}")
+    process.wait()
+    return {'config': config, 'exit_code': process.returncode, 'errors': errors,
+            'seconds': time.perf_counter() - start, 'diagnostics': diagnostics}
+
+def trace_files(trace_dir: str) -> List[Tuple[str, Optional[str]]]:
+    """Pair each trace*.json in a --generateTrace directory with its types*.json."""
+    pairs = []
+    for name in sorted(os.listdir(trace_dir)):
+        match = re.fullmatch(r'trace(\.[\w.-]+)?\.json', name)
+        if match:
+            types = os.path.join(trace_dir, f"types{match.group(1) or ''}.json")
+            pairs.append((os.path.join(trace_dir, name), types if os.path.isfile(types) else None))
+    return pairs
+
+def record_history(project_dir: str, diagnostics: Dict[str, float]) -> List[Dict[str, Any]]:
+    """Append the tracked diagnostics to the history and compare them with earlier commits."""
+    from .perf_budgets import History, git_commit
+
+    metrics = {metric: diagnostics.get(name) for name, metric in TRACKED}
+    commit = git_commit(project_dir)
+    history = History(os.path.join(project_dir, CACHE_DIR, HISTORY_NAME))
+    try:
+        run_id = history.record(metrics, commit, warm=False)
+        trend = []
+        for name, metric in TRACKED:
+            if metrics[metric] is None:
+                continue
+            baseline, runs = history.baseline(metric, 10, run_id, commit)
+            trend.append({'name': name, 'metric': metric, 'value': metrics[metric],
+                          'baseline': baseline, 'runs': runs,
+                          'change_pct': (metrics[metric] - baseline) / baseline * 100 if baseline else None})
+    finally:
+        history.close()
+    return trend
+
+def format_diagnostic(name: str, value: float) -> str:
+    if name.endswith('time'):
+        return f"{value / 1000:.2f}s"
+    if name.startswith('Memory'):
+        return format_size(int(value))
+    return f"{value:,.0f}"
+
+def print_report(report: Dict[str, Any], project_dir: str) -> None:
+    """Print the slow files, hotspots, instantiation counts and trend."""
+    def rel(path: str) -> str:
+        return os.path.relpath(path, project_dir) if os.path.isabs(path) else path
+
+    for run in report['runs']:
+        print_header(f"Diagnostics: {rel(run['config'])}")
+        for name, value in run['diagnostics'].items():
+            if name.endswith('time') or name in ('Files', 'Types', 'Instantiations', 'Memory used'):
+                print(f"    {name + ':':<24} {format_diagnostic(name, value):>14}")
+        if run['errors']:
+            print_warning(f"tsc reported {run['errors']} type errors")
+
+    for analysis in report['traces']:
+        print_header(f"Slowest Files to Check ({rel(analysis['trace'])})")
+        if not analysis['files']:
+            print_info("No checkSourceFile spans in the trace")
+        for entry in analysis['files']:
+            print(f"    {entry['check_ms']:9.1f} ms  {rel(entry['path'])}")
+        print_info(f"{analysis['files_checked']} files checked", record=False)
+
+        print_header("Slowest Expressions and Declarations")
+        for entry in analysis['hotspots']:
+            location = f"{rel(entry['path'])}:{entry['line']}" if entry['line'] else rel(entry['path'])
+            print(f"    {entry['duration_ms']:9.1f} ms  {location} ({entry['kind']})")
+
+        if analysis.get('types'):
+            types = analysis['types']
+            print_header("Type Instantiation Hotspots")
+            print_info(f"{types['instantiated_types']:,} instantiated types", record=False)
+            for entry in types['declarations']:
+                origin = entry['package'] or rel(entry['path'])
+                print(f"    {entry['count']:9,}  {entry['symbol']} ({origin})")
+            packages = ', '.join(f"{name} {count:,}" for name, count in types['packages'].items())
+            print(f"    by package: {packages}")
+            heavy = [name for name in types['packages'] if name in ('echarts', 'recharts', '@tremor/react')]
+            if heavy:
+                print_info(f"Instantiations from {', '.join(heavy)}: type chart options and props "
+                           "explicitly (e.g. const option: EChartsOption = ...) instead of passing "
+                           "inferred object literals through generic components")
+
+    if report['trend']:
+        print_header("Compile Trend")
+        for entry in report['trend']:
+            line = f"{entry['name']}: {format_diagnostic(entry['name'], entry['value'])}"
+            if entry['change_pct'] is None:
+                print_info(line, record=False)
+                continue
+            line += (f" ({entry['change_pct']:+.1f}% vs median of {entry['runs']} earlier commits, "
+                     f"{format_diagnostic(entry['name'], entry['baseline'])})")
+            if entry['change_pct'] > 10:
+                print_warning(line)
+            else:
+                print_success(line)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Profile type-checking with tsc --extendedDiagnostics --generateTrace.")
+    parser.add_argument('--project', '-p', action='append',
+                        help="tsconfig to check (repeatable; default: every resolved project "
+                             "with sources)")
+    parser.add_argument('--trace-dir', default=TRACE_DIR,
+                        help="Where tsc writes the trace (default: %(default)s)")
+    parser.add_argument('--from-trace', metavar='DIR',
+                        help="Analyze an existing --generateTrace directory instead of running tsc")
+    parser.add_argument('--top', type=int, default=15, help="Entries per ranking (default: %(default)s)")
+    parser.add_argument('--no-history', action='store_true',
+                        help=f"Do not record the run in {os.path.join(CACHE_DIR, HISTORY_NAME)}")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function to run the script."""
+    from .toolchain import tool_binary
+
+    args = parse_args(argv)
+    project_dir = os.getcwd()
+    report: Dict[str, Any] = {'runs': [], 'traces': [], 'trend': []}
+
+    if not args.json:
+        print_header("TypeScript Compile Diagnostics")
+    if args.from_trace:
+        trace_dirs = [args.from_trace]
+    else:
+        binary = tool_binary(project_dir, 'tsc')
+        if binary is None:
+            print_error("tsc not found in node_modules/.bin; run npm install")
+            sys.exit(1)
+        configs = [os.path.abspath(path) for path in args.project] if args.project \
+            else tsc_projects(project_dir)
+        if not configs:
+            print_error("No tsconfig with source files found")
+            sys.exit(1)
+        trace_dirs = []
+        for index, config in enumerate(configs):
+            trace_dir = os.path.join(project_dir, args.trace_dir, str(index)) if len(configs) > 1 \
+                else os.path.join(project_dir, args.trace_dir)
+            if not args.json:
+                print_info(f"Running tsc -p {os.path.relpath(config, project_dir)}", record=False)
+            try:
+                report['runs'].append(run_tsc(binary, config, trace_dir, project_dir))
+            except OSError as e:
+                print_error(f"Could not run tsc: {e.strerror or e}")
+                sys.exit(1)
+            trace_dirs.append(trace_dir)
+
+    for trace_dir in trace_dirs:
+        if not os.path.isdir(trace_dir):
+            print_error(f"No trace directory at {trace_dir}")
+            sys.exit(1)
+        for trace_path, types_path in trace_files(trace_dir):
+            try:
+                analysis = analyze_trace(trace_path, args.top)
+                analysis['types'] = analyze_types(types_path, args.top) if types_path else None
+            except (OSError, ValueError) as e:
+                print_error(f"Could not read {trace_path}: {e}")
+                continue
+            analysis['trace'] = trace_path
+            report['traces'].append(analysis)
+
+    # Sum the counters over the projects for the history
+    totals: Dict[str, float] = {}
+    for run in report['runs']:
+        for name, _metric in TRACKED:
+            if name in run['diagnostics']:
+                totals[name] = totals.get(name, 0.0) + run['diagnostics'][name]
+    if 'Memory used' in totals:
+        totals['Memory used'] = max(run['diagnostics'].get('Memory used', 0) for run in report['runs'])
+    if totals and not args.no_history:
+        report['trend'] = record_history(project_dir, totals)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, project_dir)
+        if report['runs']:
+            print_success(f"Trace written to {args.trace_dir}/ (open trace.json in https://ui.perfetto.dev)")
+    if any(run['exit_code'] not in (0, None) and not run['errors'] for run in report['runs']):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+tsconfig Resolver
+
+Resolves the TypeScript projects behind a project's tsconfig.json the way
+``tsc -b`` sees them: ``references`` are followed to the referenced
+projects, and each project's ``extends`` chain (relative paths, packages in
+node_modules, and TS 5 extends arrays) is merged into its effective compiler
+options, include/exclude/files lists and path-valued options resolved
+against the config that set them. Files are parsed as JSONC (comments and
+trailing commas allowed, as tsc accepts them).
+
+Parsed files and resolved projects are memoized per process and validated by
+mtime and size, so a base config shared by many projects in --scan mode is
+read once per worker, and edits are still picked up in --watch mode.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import file_snapshot
+
+# Compiler options whose values are paths relative to the config that sets them
+PATH_OPTIONS = ('baseUrl', 'outDir', 'rootDir', 'declarationDir', 'tsBuildInfoFile', 'outFile')
+PATH_LIST_OPTIONS = ('typeRoots', 'rootDirs')
+
+_JSONC_COMMENT = re.compile(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*(?:[^*]|\*(?!/))*\*/', re.DOTALL)
+_TRAILING_COMMA = re.compile(r'("(?:[^"\\]|\\.)*")|,(?=\s*[\]}])', re.DOTALL)
+
+def parse_jsonc(text: str) -> Any:
+    """Parse JSON with comments and trailing commas; raises ValueError."""
+    text = _JSONC_COMMENT.sub(lambda match: match.group(1) or ' ', text.lstrip('\ufeff'))
+    text = _TRAILING_COMMA.sub(lambda match: match.group(1) or '', text)
+    return json.loads(text)
+
+class TsProject:
+    """The effective configuration of one tsconfig file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.options: Dict[str, Any] = {}
+        # Absolute glob patterns and file paths; None when neither the file nor its bases set them
+        self.include: Optional[List[str]] = None
+        self.exclude: Optional[List[str]] = None
+        self.files: Optional[List[str]] = None
+        # Absolute paths of the referenced tsconfig files (not inherited through extends)
+        self.references: List[str] = []
+        # This file followed by every file it extends, directly or indirectly
+        self.chain: List[str] = [path]
+        self.error: Optional[str] = None
+        # extends entries that could not be followed
+        self.problems: List[str] = []
+
+    def has_sources(self) -> bool:
+        """Return False for solution-style configs that only hold references."""
+        if self.files is None and self.include is None:
+            return True
+        return bool(self.files or self.include)
+
+# Most recently used tsconfig files and resolved projects; bounded so a --scan
+# over many projects does not keep every configuration alive
+RAW_MEMO_SIZE = 64
+PROJECT_MEMO_SIZE = 32
+_memo_lock = threading.Lock()
+_raw_memo: OrderedDict[str, Tuple[Tuple[int, int], Any]] = OrderedDict()
+_project_memo: OrderedDict[str, Tuple[Tuple[Optional[Tuple[int, int]], ...], TsProject]] = OrderedDict()
+
+def _remember(memo: OrderedDict, key: str, value: Any, size: int) -> None:
+    """Store a memo entry as the most recent one, evicting the oldest; hold _memo_lock."""
+    memo[key] = value
+    memo.move_to_end(key)
+    while len(memo) > size:
+        memo.popitem(last=False)
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    stat = file_snapshot.stat(path)
+    return None if stat is None else (stat.st_mtime_ns, stat.st_size)
+
+def load_tsconfig(path: str) -> Dict[str, Any]:
+    """Return the parsed contents of one tsconfig file; raises OSError or ValueError."""
+    stamp = _stamp(path)
+    with _memo_lock:
+        memo = _raw_memo.get(path)
+        if memo is not None and memo[0] == stamp:
+            _raw_memo.move_to_end(path)
+            return memo[1]
+    config = parse_jsonc(file_snapshot.read_text(path))
+    if not isinstance(config, dict):
+        raise ValueError("expected a JSON object")
+    if stamp is not None:
+        with _memo_lock:
+            _remember(_raw_memo, path, (stamp, config), RAW_MEMO_SIZE)
+    return config
+
+def _config_in(directory: str) -> Optional[str]:
+    path = os.path.join(directory, 'tsconfig.json')
+    return path if file_snapshot.is_file(path) else None
+
+def resolve_extends(spec: str, config_dir: str) -> Optional[str]:
+    """Return the file an ``extends`` entry points at, or None if it cannot be found."""
+    if spec.startswith(('./', '../', '/')) or spec in ('.', '..') or os.path.isabs(spec):
+        candidate = os.path.normpath(os.path.join(config_dir, spec))
+        for path in (candidate, candidate + '.json'):
+            if file_snapshot.is_file(path):
+                return path
+        return _config_in(candidate) if file_snapshot.is_dir(candidate) else None
+
+    # Package specifier: walk up looking for node_modules/<spec>
+    directory = config_dir
+    while True:
+        base = os.path.join(directory, 'node_modules', spec)
+        for path in (base, base + '.json'):
+            if file_snapshot.is_file(path):
+                return path
+        if file_snapshot.is_dir(base):
+            try:
+                package = json.loads(file_snapshot.read_text(os.path.join(base, 'package.json')))
+            except (OSError, ValueError):
+                package = {}
+            entry = package.get('tsconfig') if isinstance(package, dict) else None
+            if isinstance(entry, str) and file_snapshot.is_file(os.path.join(base, entry)):
+                return os.path.normpath(os.path.join(base, entry))
+            found = _config_in(base)
+            if found is not None:
+                return found
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def _absolute(value: Any, config_dir: str) -> Any:
+    if isinstance(value, str):
+        return os.path.normpath(os.path.join(config_dir, value))
+    return value
+
+def _absolute_list(values: Any, config_dir: str) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [_absolute(value, config_dir) for value in values if isinstance(value, str)]
+
+def _reference_path(entry: Any, config_dir: str) -> Optional[str]:
+    if not isinstance(entry, dict) or not isinstance(entry.get('path'), str):
+        return None
+    path = os.path.normpath(os.path.join(config_dir, entry['path']))
+    if file_snapshot.is_dir(path):
+        return os.path.join(path, 'tsconfig.json')
+    return path
+
+def _build(path: str, stack: Tuple[str, ...]) -> TsProject:
+    project = TsProject(path)
+    try:
+        raw = load_tsconfig(path)
+    except OSError as error:
+        project.error = error.strerror or str(error)
+        return project
+    except ValueError as error:
+        project.error = f"invalid JSON ({error})"
+        return project
+    config_dir = os.path.dirname(path)
+
+    extends = raw.get('extends')
+    for spec in extends if isinstance(extends, list) else [extends] if extends else []:
+        if not isinstance(spec, str):
+            continue
+        base_path = resolve_extends(spec, config_dir)
+        if base_path is None:
+            project.problems.append(f"extends '{spec}' could not be resolved")
+            continue
+        if base_path in stack or base_path == path:
+            project.problems.append(f"extends '{spec}' forms a cycle")
+            continue
+        base = resolve_project(base_path, stack + (path,))
+        if base.error:
+            project.problems.append(f"extends '{spec}': {base.error}")
+            continue
+        project.options.update(base.options)
+        for name in ('include', 'exclude', 'files'):
+            if getattr(base, name) is not None:
+                setattr(project, name, getattr(base, name))
+        project.chain.extend(base.chain)
+
+    options = raw.get('compilerOptions')
+    for name, value in (options.items() if isinstance(options, dict) else ()):
+        if name in PATH_OPTIONS:
+            value = _absolute(value, config_dir)
+        elif name in PATH_LIST_OPTIONS:
+            value = _absolute_list(value, config_dir)
+        project.options[name] = value
+    for name in ('include', 'exclude', 'files'):
+        if name in raw:
+            setattr(project, name, _absolute_list(raw[name], config_dir))
+    references = raw.get('references')
+    for entry in references if isinstance(references, list) else []:
+        reference = _reference_path(entry, config_dir)
+        if reference is not None:
+            project.references.append(reference)
+    return project
+
+def resolve_project(path: str, stack: Tuple[str, ...] = ()) -> TsProject:
+    """Return the effective configuration of one tsconfig file, memoized per process."""
+    path = os.path.abspath(path)
+    with _memo_lock:
+        memo = _project_memo.get(path)
+        if memo is not None:
+            _project_memo.move_to_end(path)
+    if memo is not None:
+        stamps, project = memo
+        if stamps == tuple(_stamp(chained) for chained in project.chain):
+            return project
+    project = _build(path, stack)
+    if project.error is None:
+        stamps = tuple(_stamp(chained) for chained in project.chain)
+        with _memo_lock:
+            _remember(_project_memo, path, (stamps, project), PROJECT_MEMO_SIZE)
+    return project
+
+def resolve_tsconfig(project_dir: str) -> List[TsProject]:
+    """
+    Return the project's tsconfig.json followed by every project it
+    references, directly or transitively.
+    """
+    root = os.path.join(os.path.abspath(project_dir), 'tsconfig.json')
+    projects: List[TsProject] = []
+    seen = {root}
+    queue = [root]
+    while queue:
+        project = resolve_project(queue.pop(0))
+        projects.append(project)
+        for reference in project.references:
+            if reference not in seen:
+                seen.add(reference)
+                queue.append(reference)
+    return projects
+
+def tsconfig_files(project_dir: str) -> List[str]:
+    """Return the project-relative paths of every tsconfig file the resolver reads."""
+    project_dir = os.path.abspath(project_dir)
+    files = ['tsconfig.json']
+    for project in resolve_tsconfig(project_dir):
+        for path in project.chain:
+            rel = os.path.relpath(path, project_dir).replace(os.sep, '/')
+            if rel not in files:
+                files.append(rel)
+    return files
+
+def build_problems(project: TsProject, project_dir: str) -> List[str]:
+    """Return the settings of a project that slow down type-checking."""
+    if project.error or not project.has_sources():
+        return []
+    options = project.options
+    problems = []
+    incremental = options.get('incremental') or options.get('composite')
+    if not incremental:
+        problems.append("incremental is off, so tsc re-checks every file on each run "
+                        "(set \"incremental\": true)")
+    elif not options.get('tsBuildInfoFile') and not options.get('outDir'):
+        problems.append("tsBuildInfoFile is not set, so build info lands next to the config; "
+                        "point it at a cache directory such as node_modules/.tmp/")
+    if not options.get('skipLibCheck'):
+        problems.append("skipLibCheck is off, so every .d.ts under node_modules is "
+                        "type-checked on each run")
+
+    # tsc never expands wildcards into node_modules on its own; only patterns
+    # that name it (or files listed from it) pull packages into the program
+    for pattern in (project.include or []) + (project.files or []):
+        rel = os.path.relpath(pattern, project_dir).replace(os.sep, '/')
+        if 'node_modules' in rel.split('/'):
+            problems.append(f"include '{rel}' pulls node_modules sources into the program")
+        elif rel == '..' or rel.startswith('../'):
+            problems.append(f"include '{rel}' reaches outside the project directory")
+    return problems
@@ -0,0 +1,34 @@
+"""Regression tests for the JS/TS config tokenizer."""
+
+import time
+import unittest
+
+from pyutils.js_config import parse_config, tokenize
+
+# Generous enough for a slow CI machine; the backtracking regex took minutes
+TIME_LIMIT_SECONDS = 2.0
+
+class RegexLiteralTest(unittest.TestCase):
+    def assert_fast(self, source: str) -> None:
+        start = time.perf_counter()
+        parse_config(source)
+        self.assertLess(time.perf_counter() - start, TIME_LIMIT_SECONDS)
+
+    def test_unclosed_class_does_not_backtrack(self) -> None:
+        # n=18 took about a minute with the previous regex
+        self.assert_fast("export default { a: (/" + "[" * 18)
+        self.assert_fast("export default { a: (/" + "[" * 20000)
+
+    def test_repeated_unclosed_literals_stay_linear(self) -> None:
+        self.assert_fast("export default { a: (" + "/[" * 20000)
+        self.assert_fast("export default { a: (" + "(/[a" * 20000)
+
+    def test_regex_literals(self) -> None:
+        kinds = [(token.kind, token.value) for token in tokenize("x = [/a[/]b\\/c/gi, y / 2]")]
+        self.assertIn(('regex', '/a[/]b\\/c/gi'), kinds)
+        self.assertIn(('other', '/'), kinds)
+        # A class must be closed for the literal to end
+        self.assertNotIn('regex', [token.kind for token in tokenize("x = (/[a/)")])
+
+if __name__ == '__main__':
+    unittest.main()